@@ -1,18 +1,108 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.database import get_db
-from app.infrastructure.repositories import SQLAlchemyHomeRepository
+from app.infrastructure.repositories import SQLAlchemyHomeRepository, SQLAlchemyAdviceRepository
+from app.infrastructure.llm.base import LLMProvider
 from app.infrastructure.llm.factory import LLMProviderFactory
+from app.infrastructure.llm.warm_up import ModelWarmer
+from app.infrastructure.cache.base import AdviceCache
+from app.infrastructure.cache.factory import AdviceCacheFactory
+from app.config import settings
 from app.application.advice_service import EnergyAdviceService
+from app.application.prompt_templates import get_energy_advice_prompt_template
+from app.application.rule_based_advisor import RuleBasedAdvisor
+from app.application.single_flight import SingleFlight
+from app.domain.value_objects import EnergyAdvice
 from fastapi import Depends
 
+# App-lifetime provider so all requests share one keep-alive connection pool
+_llm_provider: Optional[LLMProvider] = None
+_model_warmer: Optional[ModelWarmer] = None
+_advice_cache: Optional[AdviceCache] = None
+_advice_cache_initialized = False
+# Shared by all requests so concurrent generations for the same profile are coalesced
+_advice_single_flight: SingleFlight[EnergyAdvice] = SingleFlight()
+# Stateless, so one instance serves every request
+_rule_based_advisor = RuleBasedAdvisor()
 
-def get_llm_provider():
-    return LLMProviderFactory.create_provider()
+
+def get_llm_provider() -> LLMProvider:
+    global _llm_provider
+    if _llm_provider is None:
+        _llm_provider = LLMProviderFactory.create_provider()
+    return _llm_provider
+
+
+async def close_llm_provider() -> None:
+    global _llm_provider
+    if _llm_provider is not None:
+        await _llm_provider.aclose()
+        _llm_provider = None
+
+
+def get_model_warmer() -> ModelWarmer:
+    global _model_warmer
+    if _model_warmer is None:
+        _model_warmer = ModelWarmer(
+            get_llm_provider(),
+            messages=get_energy_advice_prompt_template().prefix_messages,
+            keep_alive=LLMProviderFactory.create_keep_alive_policy(),
+            check_interval=settings.LLM_WARMUP_CHECK_INTERVAL_SECONDS
+        )
+    return _model_warmer
+
+
+async def start_model_warmer() -> None:
+    if settings.LLM_WARMUP_ENABLED:
+        await get_model_warmer().start()
+
+
+async def stop_model_warmer() -> None:
+    global _model_warmer
+    if _model_warmer is not None:
+        await _model_warmer.stop()
+        _model_warmer = None
+
+
+def get_advice_cache() -> Optional[AdviceCache]:
+    global _advice_cache, _advice_cache_initialized
+    if not _advice_cache_initialized:
+        _advice_cache = AdviceCacheFactory.create_cache()
+        _advice_cache_initialized = True
+    return _advice_cache
+
+
+async def close_advice_cache() -> None:
+    global _advice_cache, _advice_cache_initialized
+    if _advice_cache is not None:
+        await _advice_cache.aclose()
+    _advice_cache = None
+    _advice_cache_initialized = False
+
+
+def get_advice_single_flight() -> SingleFlight[EnergyAdvice]:
+    return _advice_single_flight
 
 
 def get_advice_service(
-    db: Session = Depends(get_db),
-    llm_provider = Depends(get_llm_provider)
+    db: AsyncSession = Depends(get_db),
+    llm_provider: LLMProvider = Depends(get_llm_provider),
+    advice_cache: Optional[AdviceCache] = Depends(get_advice_cache),
+    single_flight: SingleFlight[EnergyAdvice] = Depends(get_advice_single_flight)
 ) -> EnergyAdviceService:
     repository = SQLAlchemyHomeRepository(db)
-    return EnergyAdviceService(repository, llm_provider)
+    advice_repository = SQLAlchemyAdviceRepository(db)
+    return EnergyAdviceService(
+        repository,
+        llm_provider,
+        advice_cache,
+        single_flight,
+        advice_repository,
+        rule_based_advisor=_rule_based_advisor,
+        rule_based_fallback=settings.ADVICE_RULE_BASED_FALLBACK
+    )
+
+
+def build_advice_service(db: AsyncSession) -> EnergyAdviceService:
+    """Advice service for code running outside a request (e.g. batch workers)."""
+    return get_advice_service(db, get_llm_provider(), get_advice_cache(), get_advice_single_flight())
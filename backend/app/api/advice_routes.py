@@ -1,16 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import Response, StreamingResponse
+from typing import AsyncIterator, Dict, Literal, Optional, Union
+import json
 import logging
-from app.application.advice_service import EnergyAdviceService
-from app.application.advice_dtos import EnergyAdviceResponse
+from pydantic import BaseModel
+from app.application.advice_service import EnergyAdviceService, ProvisionalAdvice
+from app.application.advice_dtos import EnergyAdviceResponse, AdviceHistoryResponse
+from app.domain.value_objects import EnergyAdvice, Recommendation
 from app.api.advice_dependencies import get_advice_service
+from app.api.conditional_requests import if_none_match, not_modified, validator_headers, version_etag
 from app.application.home_dtos import ErrorResponse
 from app.domain.exceptions import (
     HomeNotFoundError,
     LLMConnectionError,
     LLMTimeoutError,
     LLMServiceUnavailableError,
-    LLMValidationError
+    LLMValidationError,
+    LLMRequestError
 )
+from app.constants import ADVICE_HISTORY_PAGE_SIZE, ADVICE_HISTORY_MAX_PAGE_SIZE
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -35,6 +43,10 @@ router = APIRouter(prefix="/homes", tags=["energy-advice"])
             "description": "LLM response validation failed",
             "model": ErrorResponse
         },
+        502: {
+            "description": "LLM service rejected the request",
+            "model": ErrorResponse
+        },
         503: {
             "description": "LLM service unavailable or connection error",
             "model": ErrorResponse
@@ -48,66 +60,289 @@ router = APIRouter(prefix="/homes", tags=["energy-advice"])
             "model": ErrorResponse
         }
     },
-    summary="Generate energy-saving recommendations"
+    summary="Generate energy-saving recommendations",
+    description=(
+        "mode=llm (default) generates tailored advice with the LLM, falling back to rule-based advice "
+        "(llm_provider \"rule-based\") when the LLM is unavailable. mode=instant returns rule-based "
+        "advice computed from the home profile in milliseconds."
+    )
 )
 async def generate_energy_advice(
     home_id: str,
+    mode: Literal["llm", "instant"] = Query(default="llm", description="llm or instant (rule-based)"),
+    service: EnergyAdviceService = Depends(get_advice_service)
+) -> Response:
+    try:
+        if mode == "instant":
+            advice = await service.generate_instant_advice(home_id)
+        else:
+            advice = await service.generate_advice(home_id)
+        return _json_response(advice)
+    except Exception as e:
+        raise _to_http_exception(e, home_id)
+
+
+@router.post(
+    "/{home_id}/advice/refresh",
+    response_model=EnergyAdviceResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "description": "Energy advice updated for the current home profile",
+            "model": EnergyAdviceResponse
+        },
+        404: {
+            "description": "Home profile not found",
+            "model": ErrorResponse
+        },
+        422: {
+            "description": "LLM response validation failed",
+            "model": ErrorResponse
+        },
+        502: {
+            "description": "LLM service rejected the request",
+            "model": ErrorResponse
+        },
+        503: {
+            "description": "LLM service unavailable or connection error",
+            "model": ErrorResponse
+        },
+        504: {
+            "description": "LLM request timeout",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    },
+    summary="Update recommendations after a home profile change",
+    description=(
+        "Compare the home with the profile its latest advice was generated for and regenerate only "
+        "the recommendation categories the changed fields affect (e.g. window_type: windows), keeping "
+        "the other stored recommendations. Changes that affect every category (size, age, location, "
+        "energy cost, budget) and homes without stored advice get a full generation."
+    )
+)
+async def refresh_energy_advice(
+    home_id: str,
+    service: EnergyAdviceService = Depends(get_advice_service)
+) -> Response:
+    try:
+        advice = await service.refresh_advice(home_id)
+        return _json_response(advice)
+    except Exception as e:
+        raise _to_http_exception(e, home_id)
+
+
+@router.post(
+    "/{home_id}/advice/stream",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "description": (
+                "NDJSON stream: with prefill=true, first a {\"event\": \"provisional\"} line with rule-based "
+                "advice; then one {\"event\": \"recommendation\"} line per recommendation as soon as it "
+                "is generated, then a final {\"event\": \"complete\"} line with the full advice, or "
+                "{\"event\": \"error\"} if generation fails mid-stream"
+            ),
+            "content": {"application/x-ndjson": {}}
+        },
+        404: {
+            "description": "Home profile not found",
+            "model": ErrorResponse
+        },
+        502: {
+            "description": "LLM service rejected the request",
+            "model": ErrorResponse
+        },
+        503: {
+            "description": "LLM service unavailable or connection error",
+            "model": ErrorResponse
+        },
+        504: {
+            "description": "LLM request timeout",
+            "model": ErrorResponse
+        }
+    },
+    summary="Stream energy-saving recommendations as they are generated"
+)
+async def stream_energy_advice(
+    home_id: str,
+    prefill: bool = Query(default=False, description="Send rule-based provisional advice before the LLM result"),
     service: EnergyAdviceService = Depends(get_advice_service)
-) -> EnergyAdviceResponse:
+) -> StreamingResponse:
+    events = service.stream_advice(home_id, prefill=prefill)
     try:
-        advice = await service.generate_advice(home_id)
-        return EnergyAdviceResponse(
-            home_id=advice.home_id,
-            recommendations=[
-                {
-                    "title": rec.title,
-                    "description": rec.description,
-                    "priority": rec.priority,
-                    "category": rec.category,
-                    "estimated_savings_annual": rec.estimated_savings_annual,
-                    "estimated_cost": rec.estimated_cost,
-                    "payback_period_years": rec.payback_period_years,
-                    "implementation_difficulty": rec.implementation_difficulty
-                }
-                for rec in advice.recommendations
-            ],
-            summary=advice.summary,
-            estimated_total_annual_savings=advice.estimated_total_annual_savings,
-            generated_at=advice.generated_at,
-            llm_provider=advice.llm_provider
+        # Fetch the first item before responding so lookup and connection errors still map to HTTP status codes
+        first_item = await events.__anext__()
+    except Exception as e:
+        raise _to_http_exception(e, home_id)
+
+    async def ndjson_lines() -> AsyncIterator[str]:
+        item = first_item
+        try:
+            while True:
+                yield _to_stream_event(item)
+                item = await events.__anext__()
+        except StopAsyncIteration:
+            pass
+        except Exception as e:
+            error = _to_http_exception(e, home_id)
+            yield json.dumps({"event": "error", "status": error.status_code, "detail": error.detail}) + "\n"
+
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get(
+    "/{home_id}/advice",
+    response_model=EnergyAdviceResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "description": "Latest stored energy advice",
+            "model": EnergyAdviceResponse
+        },
+        304: {
+            "description": "The advice identified by If-None-Match is still the latest"
+        },
+        404: {
+            "description": "No advice has been generated for this home",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    },
+    summary="Get the latest generated recommendations",
+    description=(
+        "Return the most recently generated advice from the database without calling the LLM. "
+        "Send the ETag back as If-None-Match to get 304 Not Modified until new advice is stored."
+    )
+)
+async def get_latest_energy_advice(
+    home_id: str,
+    if_none_match_header: Optional[str] = Header(default=None, alias="If-None-Match"),
+    service: EnergyAdviceService = Depends(get_advice_service)
+) -> Response:
+    try:
+        stored = await service.get_latest_stored_advice(home_id)
+    except Exception as e:
+        raise _to_http_exception(e, home_id)
+
+    if not stored:
+        logger.warning(f"No stored advice for home: {home_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No energy advice has been generated for this home yet."
         )
-    except HomeNotFoundError as e:
+    # A cache hit stored again keeps its generated_at, so the version is when the row was stored
+    etag = version_etag(stored.stored_at)
+    if if_none_match(if_none_match_header, etag):
+        return not_modified(etag)
+    return _json_response(stored.advice, headers=validator_headers(etag))
+
+
+@router.get(
+    "/{home_id}/advice/history",
+    response_model=AdviceHistoryResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    },
+    summary="Get the history of generated recommendations",
+    description="Return stored advice reports for a home, newest first."
+)
+async def get_energy_advice_history(
+    home_id: str,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=ADVICE_HISTORY_PAGE_SIZE, ge=1, le=ADVICE_HISTORY_MAX_PAGE_SIZE),
+    service: EnergyAdviceService = Depends(get_advice_service)
+) -> Response:
+    try:
+        advice, total = await service.get_advice_history(home_id, offset=offset, limit=limit)
+    except Exception as e:
+        raise _to_http_exception(e, home_id)
+
+    # items are the domain EnergyAdvice objects themselves, serialized as they are (see AdviceHistoryResponse)
+    return _json_response(AdviceHistoryResponse.model_construct(
+        home_id=home_id,
+        total=total,
+        offset=offset,
+        limit=limit,
+        items=advice
+    ))
+
+
+def _json_response(model: BaseModel, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Serialize a validated model straight to JSON.
+
+    The domain models carry the same fields as the response DTOs, so there is
+    no point in copying them into DTOs for FastAPI to validate and dump again;
+    response_model is kept on the routes for the OpenAPI docs.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json", headers=headers)
+
+
+def _to_stream_event(item: Union[ProvisionalAdvice, Recommendation, EnergyAdvice]) -> str:
+    if isinstance(item, ProvisionalAdvice):
+        event, data = "provisional", item.advice
+    elif isinstance(item, EnergyAdvice):
+        event, data = "complete", item
+    else:
+        event, data = "recommendation", item
+    return f'{{"event": "{event}", "data": {data.model_dump_json()}}}\n'
+
+
+def _to_http_exception(e: Exception, home_id: str) -> HTTPException:
+    """Map service errors to user-friendly HTTP errors, logging the technical details."""
+    if isinstance(e, HomeNotFoundError):
         # Home not found - log and return user-friendly message
         logger.warning(f"Home not found: {e.resource_id}")
-        raise HTTPException(
+        return HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Home profile not found. Please create a home profile first."
         )
-    except LLMTimeoutError as e:
+    if isinstance(e, LLMTimeoutError):
         # Timeout - log technical details, return user-friendly message
-        logger.error(f"LLM timeout for home {home_id}: {str(e)}", exc_info=True)
-        raise HTTPException(
+        logger.error(f"LLM timeout for home {home_id}: {str(e)}", exc_info=e)
+        return HTTPException(
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             detail="The AI service took too long to respond. Please try again."
         )
-    except (LLMConnectionError, LLMServiceUnavailableError) as e:
+    if isinstance(e, (LLMConnectionError, LLMServiceUnavailableError)):
         # Connection issues - log technical details
-        logger.error(f"LLM service unavailable for home {home_id}: {str(e)}", exc_info=True)
-        raise HTTPException(
+        logger.error(f"LLM service unavailable for home {home_id}: {str(e)}", exc_info=e)
+        return HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="The AI service is temporarily unavailable. Please try again in a few moments."
         )
-    except LLMValidationError as e:
+    if isinstance(e, LLMRequestError):
+        # The AI service rejected our request; retrying the same request will not help
+        logger.error(f"LLM rejected the request for home {home_id}: {str(e)}", exc_info=e)
+        return HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="The AI service could not process this request."
+        )
+    if isinstance(e, LLMValidationError):
         # Validation errors - already logged in service, just return user-friendly message
         logger.error(f"LLM validation error for home {home_id}: {str(e)}")
-        raise HTTPException(
+        return HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Unable to generate recommendations at this time. Please try again."
         )
-    except Exception as e:
-        # Unexpected errors - log full details, return generic message
-        logger.error(f"Unexpected error generating advice for home {home_id}: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred. Our team has been notified. Please try again later."
-        )
\ No newline at end of file
+    # Unexpected errors - log full details, return generic message
+    logger.error(f"Unexpected error generating advice for home {home_id}: {str(e)}", exc_info=e)
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail="An unexpected error occurred. Our team has been notified. Please try again later."
+    )
@@ -0,0 +1,12 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.infrastructure.database import get_db
+from app.infrastructure.repositories import SQLAlchemyFleetRepository
+from app.application.fleet_analytics import FleetAnalyticsService, FleetSnapshotCache
+from fastapi import Depends
+
+# Shared across requests so the snapshot is rebuilt once per data change, not per request
+_fleet_snapshot_cache = FleetSnapshotCache()
+
+
+def get_fleet_analytics_service(db: AsyncSession = Depends(get_db)) -> FleetAnalyticsService:
+    return FleetAnalyticsService(SQLAlchemyFleetRepository(db), _fleet_snapshot_cache)
@@ -0,0 +1,122 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Literal, Optional
+import logging
+from app.application.fleet_analytics import FleetAnalyticsService
+from app.application.analytics_dtos import FleetSavingsResponse, PaybackDistributionResponse, PriceScenarioResponse
+from app.application.home_dtos import ErrorResponse
+from app.api.analytics_dependencies import get_fleet_analytics_service
+from app.domain.entities import HomeFilter, HeatingType, InsulationType, ClimateZone, BudgetRange
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/analytics/fleet", tags=["fleet-analytics"])
+
+GroupDimension = Literal["climate_zone", "heating_type", "insulation_type", "budget_range", "country"]
+
+ERROR_RESPONSES = {
+    500: {
+        "description": "Internal Server Error",
+        "model": ErrorResponse
+    }
+}
+
+
+def get_fleet_filters(
+    heating_type: Optional[HeatingType] = Query(default=None),
+    insulation_type: Optional[InsulationType] = Query(default=None),
+    climate_zone: Optional[ClimateZone] = Query(default=None),
+    country: Optional[str] = Query(default=None, max_length=100),
+    budget_range: Optional[BudgetRange] = Query(default=None),
+    min_size_sqft: Optional[int] = Query(default=None, ge=0),
+    max_size_sqft: Optional[int] = Query(default=None, ge=0),
+    min_age_years: Optional[int] = Query(default=None, ge=0),
+    max_age_years: Optional[int] = Query(default=None, ge=0)
+) -> HomeFilter:
+    return HomeFilter(
+        heating_type=heating_type,
+        insulation_type=insulation_type,
+        climate_zone=climate_zone,
+        country=country,
+        budget_range=budget_range,
+        min_size_sqft=min_size_sqft,
+        max_size_sqft=max_size_sqft,
+        min_age_years=min_age_years,
+        max_age_years=max_age_years
+    )
+
+
+@router.get(
+    "/savings",
+    response_model=FleetSavingsResponse,
+    status_code=status.HTTP_200_OK,
+    responses=ERROR_RESPONSES,
+    summary="Estimated savings grouped by home characteristics",
+    description=(
+        "Aggregate the latest advice of every matching home, grouped by any combination of "
+        "dimensions (e.g. group_by=climate_zone&group_by=heating_type)."
+    )
+)
+async def get_fleet_savings(
+    group_by: List[GroupDimension] = Query(default=[]),
+    filters: HomeFilter = Depends(get_fleet_filters),
+    service: FleetAnalyticsService = Depends(get_fleet_analytics_service)
+) -> FleetSavingsResponse:
+    try:
+        return await service.savings_by_group(filters, _unique(group_by))
+    except Exception as e:
+        raise _to_http_exception(e)
+
+
+@router.get(
+    "/payback",
+    response_model=PaybackDistributionResponse,
+    status_code=status.HTTP_200_OK,
+    responses=ERROR_RESPONSES,
+    summary="Payback period distribution",
+    description="Percentiles and a histogram of payback periods (investment / annual savings) for matching homes."
+)
+async def get_fleet_payback_distribution(
+    filters: HomeFilter = Depends(get_fleet_filters),
+    service: FleetAnalyticsService = Depends(get_fleet_analytics_service)
+) -> PaybackDistributionResponse:
+    try:
+        return await service.payback_distribution(filters)
+    except Exception as e:
+        raise _to_http_exception(e)
+
+
+@router.get(
+    "/scenarios/energy-price",
+    response_model=PriceScenarioResponse,
+    status_code=status.HTTP_200_OK,
+    responses=ERROR_RESPONSES,
+    summary="What-if: energy price change",
+    description=(
+        "Recompute bills, savings and paybacks as if energy prices changed by price_change_pct percent "
+        "(e.g. 10 for a 10% rise)."
+    )
+)
+async def get_energy_price_scenario(
+    price_change_pct: float = Query(default=10.0, gt=-100, le=1000),
+    payback_threshold_years: float = Query(default=10.0, gt=0),
+    group_by: List[GroupDimension] = Query(default=[]),
+    filters: HomeFilter = Depends(get_fleet_filters),
+    service: FleetAnalyticsService = Depends(get_fleet_analytics_service)
+) -> PriceScenarioResponse:
+    try:
+        return await service.price_scenario(filters, _unique(group_by), price_change_pct, payback_threshold_years)
+    except Exception as e:
+        raise _to_http_exception(e)
+
+
+def _unique(group_by: List[str]) -> List[str]:
+    return list(dict.fromkeys(group_by))
+
+
+def _to_http_exception(e: Exception) -> HTTPException:
+    logger.error(f"Unexpected error computing fleet analytics: {str(e)}", exc_info=e)
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail="Unable to compute fleet analytics. Please try again later."
+    )
@@ -0,0 +1,42 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.infrastructure.database import SessionLocal, get_db
+from app.infrastructure.repositories import SQLAlchemyBatchJobRepository
+from app.application.batch_scheduler import BatchAdviceScheduler, BatchScope
+from app.api.advice_dependencies import build_advice_service
+from fastapi import Depends
+
+_batch_scheduler: Optional[BatchAdviceScheduler] = None
+
+
+@asynccontextmanager
+async def batch_scope() -> AsyncIterator[BatchScope]:
+    async with SessionLocal() as db:
+        yield BatchScope(
+            job_repository=SQLAlchemyBatchJobRepository(db),
+            advice_service=build_advice_service(db)
+        )
+
+
+def get_batch_scheduler() -> BatchAdviceScheduler:
+    global _batch_scheduler
+    if _batch_scheduler is None:
+        _batch_scheduler = BatchAdviceScheduler(batch_scope, settings.BATCH_MAX_CONCURRENCY)
+    return _batch_scheduler
+
+
+async def start_batch_scheduler() -> None:
+    await get_batch_scheduler().start()
+
+
+async def stop_batch_scheduler() -> None:
+    global _batch_scheduler
+    if _batch_scheduler is not None:
+        await _batch_scheduler.stop()
+        _batch_scheduler = None
+
+
+def get_batch_job_repository(db: AsyncSession = Depends(get_db)) -> SQLAlchemyBatchJobRepository:
+    return SQLAlchemyBatchJobRepository(db)
@@ -0,0 +1,215 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator
+import asyncio
+import json
+import logging
+from app.application.batch_scheduler import BatchAdviceScheduler
+from app.application.batch_dtos import (
+    CreateBatchRequest,
+    BatchJobResponse,
+    BatchItemResponse,
+    BatchResultsResponse
+)
+from app.application.advice_dtos import EnergyAdviceResponse
+from app.application.home_dtos import ErrorResponse
+from app.api.batch_dependencies import get_batch_scheduler, get_batch_job_repository, batch_scope
+from app.domain.entities import BatchJob, BatchJobItem
+from app.domain.repositories import BatchJobRepository
+from app.constants import BATCH_RESULTS_PAGE_SIZE, BATCH_RESULTS_MAX_PAGE_SIZE
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/advice/batches", tags=["batch-advice"])
+
+# Seconds between progress events while a streamed job has no finished items
+STREAM_HEARTBEAT_SECONDS = 15
+
+
+@router.post(
+    "",
+    response_model=BatchJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        202: {
+            "description": "Batch job accepted and queued",
+            "model": BatchJobResponse
+        },
+        422: {
+            "description": "Validation error",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal Server Error",
+            "model": ErrorResponse
+        }
+    },
+    summary="Submit a batch advice job",
+    description="Queue advice generation for a list of homes. Poll the job or stream its results."
+)
+async def create_batch_job(
+    request: CreateBatchRequest,
+    scheduler: BatchAdviceScheduler = Depends(get_batch_scheduler)
+) -> BatchJobResponse:
+    try:
+        job = await scheduler.submit(request.home_ids)
+        return _to_job_response(job)
+    except Exception as e:
+        logger.error(f"Unexpected error creating batch job: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to create batch job. Please try again later."
+        )
+
+
+@router.get(
+    "/{job_id}",
+    response_model=BatchJobResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        404: {
+            "description": "Batch job not found",
+            "model": ErrorResponse
+        }
+    },
+    summary="Get batch job progress"
+)
+async def get_batch_job(
+    job_id: str,
+    repository: BatchJobRepository = Depends(get_batch_job_repository)
+) -> BatchJobResponse:
+    return _to_job_response(await _get_job_or_404(repository, job_id))
+
+
+@router.get(
+    "/{job_id}/results",
+    response_model=BatchResultsResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        404: {
+            "description": "Batch job not found",
+            "model": ErrorResponse
+        }
+    },
+    summary="Get a page of batch job results"
+)
+async def get_batch_results(
+    job_id: str,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=BATCH_RESULTS_PAGE_SIZE, ge=1, le=BATCH_RESULTS_MAX_PAGE_SIZE),
+    finished_only: bool = Query(default=False, description="Skip items that are still pending"),
+    repository: BatchJobRepository = Depends(get_batch_job_repository)
+) -> BatchResultsResponse:
+    await _get_job_or_404(repository, job_id)
+    items = await repository.get_items(job_id, offset=offset, limit=limit, finished_only=finished_only)
+    return BatchResultsResponse(
+        job_id=job_id,
+        offset=offset,
+        limit=limit,
+        items=[_to_item_response(item) for item in items]
+    )
+
+
+@router.get(
+    "/{job_id}/stream",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "description": (
+                "NDJSON stream of {\"event\": \"item\"} lines as items finish (already finished items first), "
+                "periodic {\"event\": \"progress\"} lines, and a final {\"event\": \"complete\"} line"
+            ),
+            "content": {"application/x-ndjson": {}}
+        },
+        404: {
+            "description": "Batch job not found",
+            "model": ErrorResponse
+        }
+    },
+    summary="Stream batch job results as they finish"
+)
+async def stream_batch_results(
+    job_id: str,
+    scheduler: BatchAdviceScheduler = Depends(get_batch_scheduler),
+    repository: BatchJobRepository = Depends(get_batch_job_repository)
+) -> StreamingResponse:
+    job = await _get_job_or_404(repository, job_id)
+
+    async def ndjson_lines() -> AsyncIterator[str]:
+        # Subscribe before reading stored results so no item can slip between the two
+        queue = scheduler.subscribe(job_id)
+        try:
+            sent_positions = set()
+            async with batch_scope() as scope:
+                offset = 0
+                while True:
+                    items = await scope.job_repository.get_items(
+                        job_id, offset=offset, limit=BATCH_RESULTS_MAX_PAGE_SIZE, finished_only=True
+                    )
+                    for item in items:
+                        sent_positions.add(item.position)
+                        yield _to_event("item", _to_item_response(item))
+                    if len(items) < BATCH_RESULTS_MAX_PAGE_SIZE:
+                        break
+                    offset += len(items)
+
+                while len(sent_positions) < job.total_items:
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+                    except asyncio.TimeoutError:
+                        yield _to_event("progress", _to_job_response(await scope.job_repository.get_by_id(job_id)))
+                        continue
+                    if item.position not in sent_positions:
+                        sent_positions.add(item.position)
+                        yield _to_event("item", _to_item_response(item))
+
+                yield _to_event("complete", _to_job_response(await scope.job_repository.get_by_id(job_id)))
+        finally:
+            scheduler.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _get_job_or_404(repository: BatchJobRepository, job_id: str) -> BatchJob:
+    job = await repository.get_by_id(job_id)
+    if not job:
+        logger.warning(f"Batch job not found: {job_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch job not found."
+        )
+    return job
+
+
+def _to_job_response(job: BatchJob) -> BatchJobResponse:
+    finished = job.completed_items + job.failed_items
+    return BatchJobResponse(
+        id=job.id,
+        status=job.status,
+        total_items=job.total_items,
+        completed_items=job.completed_items,
+        failed_items=job.failed_items,
+        progress=finished / job.total_items if job.total_items else 1.0,
+        created_at=job.created_at,
+        updated_at=job.updated_at
+    )
+
+
+def _to_item_response(item: BatchJobItem) -> BatchItemResponse:
+    return BatchItemResponse(
+        position=item.position,
+        home_id=item.home_id,
+        status=item.status,
+        advice=EnergyAdviceResponse.model_validate(item.advice.model_dump()) if item.advice else None,
+        error=item.error,
+        completed_at=item.completed_at
+    )
+
+
+def _to_event(event: str, data) -> str:
+    return json.dumps({"event": event, "data": data.model_dump(mode="json")}) + "\n"
@@ -0,0 +1,59 @@
+"""
+ETags and conditional request headers (If-Match, If-None-Match).
+
+A resource's ETag is its version timestamp (HomeProfile.updated_at, and for a
+home's latest advice StoredAdvice.stored_at), which changes whenever its
+representation does.
+Clients revalidate a GET with If-None-Match and get 304 Not Modified without a
+body when nothing changed, and make updates and deletes conditional with
+If-Match so they fail with 412 instead of overwriting someone else's change.
+"""
+from datetime import datetime
+from typing import FrozenSet, List, Optional
+from fastapi import Response, status
+
+ETAG_TIME_FORMAT = "%Y%m%d%H%M%S%f"
+
+# Clients must revalidate before reusing a stored response
+CACHE_CONTROL = "no-cache"
+
+
+def version_etag(version: datetime) -> str:
+    return f'"{version.strftime(ETAG_TIME_FORMAT)}"'
+
+
+def _parse_etags(header: str) -> List[str]:
+    return [etag.strip() for etag in header.split(",") if etag.strip()]
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """Whether If-None-Match matches etag, i.e. the client's copy is current (weak comparison)."""
+    if not header:
+        return False
+    etags = _parse_etags(header)
+    return "*" in etags or etag in (candidate.removeprefix("W/") for candidate in etags)
+
+
+def if_match_versions(header: Optional[str]) -> Optional[FrozenSet[datetime]]:
+    """
+    Versions an If-Match header accepts; None without the header or for "*" (any version).
+
+    If-Match uses strong comparison, so weak and unparseable ETags match no version.
+    """
+    if not header or "*" in _parse_etags(header):
+        return None
+    versions = set()
+    for etag in _parse_etags(header):
+        try:
+            versions.add(datetime.strptime(etag.strip('"'), ETAG_TIME_FORMAT))
+        except ValueError:
+            continue
+    return frozenset(versions)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag))
+
+
+def validator_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
@@ -0,0 +1,43 @@
+from typing import Optional
+from app.config import settings
+from app.infrastructure.database import check_db
+from app.infrastructure.health import HealthMonitor
+from app.api.advice_dependencies import get_llm_provider, get_model_warmer
+
+_health_monitor: Optional[HealthMonitor] = None
+
+
+def get_health_monitor() -> HealthMonitor:
+    global _health_monitor
+    if _health_monitor is None:
+        llm_provider = get_llm_provider()
+        probes = {
+            "database": check_db,
+            # Reachable and the configured model is pulled
+            "llm": llm_provider.health_check,
+            # Informational: Ollama loads the model on demand, so an unloaded model only costs latency
+            "model_loaded": llm_provider.model_loaded
+        }
+        required = {"database", "llm"}
+        if settings.LLM_WARMUP_ENABLED:
+            # Only the first request after startup would pay the load time, but traffic waits for it anyway
+            probes["model_warm"] = get_model_warmer().is_warm
+            required.add("model_warm")
+        _health_monitor = HealthMonitor(
+            probes=probes,
+            required=required,
+            interval=settings.HEALTH_PROBE_INTERVAL_SECONDS,
+            timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS
+        )
+    return _health_monitor
+
+
+async def start_health_monitor() -> None:
+    await get_health_monitor().start()
+
+
+async def stop_health_monitor() -> None:
+    global _health_monitor
+    if _health_monitor is not None:
+        await _health_monitor.stop()
+        _health_monitor = None
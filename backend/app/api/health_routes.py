@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from app.infrastructure.health import HealthMonitor
+from app.api.health_dependencies import get_health_monitor
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get(
+    "/live",
+    summary="Liveness probe",
+    description="The process is up and serving requests. Does not touch any dependency."
+)
+async def liveness():
+    return {"status": "alive"}
+
+
+@router.get(
+    "/ready",
+    summary="Readiness probe",
+    description=(
+        "Whether this instance should receive traffic: the database answers, Ollama is reachable "
+        "with the configured model pulled and the model has been warmed up. Returns the cached result of background probes "
+        "(503 when not ready), so it is cheap to poll."
+    ),
+    responses={503: {"description": "A required dependency is failing or has not been checked yet"}}
+)
+async def readiness(monitor: HealthMonitor = Depends(get_health_monitor)):
+    return JSONResponse(status_code=200 if monitor.is_ready() else 503, content=monitor.report())
@@ -1,11 +1,11 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.database import get_db
 from app.infrastructure.repositories import SQLAlchemyHomeRepository
 from app.application.home_service import HomeService
 from fastapi import Depends
 
 
-def get_home_repository(db: Session = Depends(get_db)) -> SQLAlchemyHomeRepository:
+def get_home_repository(db: AsyncSession = Depends(get_db)) -> SQLAlchemyHomeRepository:
     return SQLAlchemyHomeRepository(db)
 
 
@@ -1,8 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, Literal, Optional
 import logging
+from pydantic import ValidationError
 from app.application.home_service import HomeService
-from app.application.home_dtos import CreateHomeRequest, HomeResponse, ErrorResponse
+from app.application.home_dtos import (
+    CreateHomeRequest,
+    UpdateHomeRequest,
+    HomeResponse,
+    HomeListResponse,
+    HomeImportResponse,
+    ErrorResponse
+)
+from app.domain.entities import HomeFilter, HeatingType, InsulationType, ClimateZone, BudgetRange
+from app.domain.exceptions import HomeNotFoundError, HomeVersionConflictError
+from app.application import home_bulk_io
 from app.api.home_dependencies import get_home_service
+from app.api.conditional_requests import (
+    if_match_versions,
+    if_none_match,
+    not_modified,
+    validator_headers,
+    version_etag
+)
+from app.constants import HOME_LIST_PAGE_SIZE, HOME_LIST_MAX_PAGE_SIZE
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -37,10 +58,13 @@ router = APIRouter(prefix="/homes", tags=["homes"])
 )
 async def create_home(
     request: CreateHomeRequest,
+    response: Response,
     service: HomeService = Depends(get_home_service)
 ) -> HomeResponse:
     try:
-        return await service.create_home(request)
+        home = await service.create_home(request)
+        response.headers.update(validator_headers(version_etag(home.updated_at)))
+        return home
     except ValueError as e:
         logger.warning(f"Invalid home data: {str(e)}")
         raise HTTPException(
@@ -55,6 +79,155 @@ async def create_home(
         )
 
 
+@router.get(
+    "",
+    response_model=HomeListResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {
+            "description": "Invalid cursor",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal Server Error",
+            "model": ErrorResponse
+        }
+    },
+    summary="List home profiles",
+    description=(
+        "List homes oldest first with cursor pagination. Pass next_cursor from the previous page "
+        "as cursor (with the same filters) to continue."
+    )
+)
+async def list_homes(
+    cursor: Optional[str] = Query(default=None, description="Opaque cursor from a previous page"),
+    limit: int = Query(default=HOME_LIST_PAGE_SIZE, ge=1, le=HOME_LIST_MAX_PAGE_SIZE),
+    heating_type: Optional[HeatingType] = Query(default=None),
+    insulation_type: Optional[InsulationType] = Query(default=None),
+    climate_zone: Optional[ClimateZone] = Query(default=None),
+    country: Optional[str] = Query(default=None, max_length=100),
+    budget_range: Optional[BudgetRange] = Query(default=None),
+    min_size_sqft: Optional[int] = Query(default=None, ge=0),
+    max_size_sqft: Optional[int] = Query(default=None, ge=0),
+    min_age_years: Optional[int] = Query(default=None, ge=0),
+    max_age_years: Optional[int] = Query(default=None, ge=0),
+    service: HomeService = Depends(get_home_service)
+) -> HomeListResponse:
+    filters = HomeFilter(
+        heating_type=heating_type,
+        insulation_type=insulation_type,
+        climate_zone=climate_zone,
+        country=country,
+        budget_range=budget_range,
+        min_size_sqft=min_size_sqft,
+        max_size_sqft=max_size_sqft,
+        min_age_years=min_age_years,
+        max_age_years=max_age_years
+    )
+    try:
+        return await service.list_homes(filters, cursor=cursor, limit=limit)
+    except ValueError as e:
+        logger.warning(f"Invalid home list cursor: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor. Use next_cursor from a previous page."
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error listing homes: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to list home profiles. Please try again later."
+        )
+
+
+@router.post(
+    "/import",
+    response_model=HomeImportResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "description": "Import finished; rejected rows are listed in errors",
+            "model": HomeImportResponse
+        },
+        415: {
+            "description": "Unsupported content type",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal Server Error",
+            "model": ErrorResponse
+        }
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string", "description": "One CreateHomeRequest JSON object per line"}},
+                "text/csv": {"schema": {"type": "string", "description": "Header row with CreateHomeRequest field names"}}
+            }
+        }
+    },
+    summary="Bulk import home profiles",
+    description=(
+        "Stream NDJSON (application/x-ndjson) or CSV (text/csv) home profiles. Rows are validated like "
+        "POST /homes and inserted in batches; invalid rows are reported without aborting the import."
+    )
+)
+async def import_homes(
+    request: Request,
+    service: HomeService = Depends(get_home_service)
+) -> HomeImportResponse:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "text/csv":
+        rows = home_bulk_io.iter_csv_rows(request.stream())
+    elif content_type in ("application/x-ndjson", "application/jsonl", "application/json-lines"):
+        rows = home_bulk_io.iter_ndjson_rows(request.stream())
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload home profiles as application/x-ndjson or text/csv."
+        )
+
+    try:
+        return await service.import_homes(rows)
+    except Exception as e:
+        logger.error(f"Unexpected error importing homes: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to import home profiles. Please try again later."
+        )
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {
+            "description": "All home profiles as NDJSON or CSV",
+            "content": {"application/x-ndjson": {}, "text/csv": {}}
+        }
+    },
+    summary="Bulk export home profiles",
+    description="Stream every home profile, oldest first, without loading the table into memory."
+)
+async def export_homes(
+    format: Literal["ndjson", "csv"] = Query(default="ndjson", description="Output format"),
+    service: HomeService = Depends(get_home_service)
+) -> StreamingResponse:
+    async def lines() -> AsyncIterator[str]:
+        if format == "csv":
+            yield home_bulk_io.csv_header()
+        async for home in service.export_homes():
+            yield home_bulk_io.to_csv_line(home) if format == "csv" else home_bulk_io.to_ndjson_line(home)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        lines(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="homes.{format}"'}
+    )
+
+
 @router.get(
     "/{home_id}",
     response_model=HomeResponse,
@@ -64,6 +237,9 @@ async def create_home(
             "description": "Home profile retrieved successfully",
             "model": HomeResponse
         },
+        304: {
+            "description": "The profile is unchanged since the ETag in If-None-Match"
+        },
         404: {
             "description": "Home profile not found",
             "model": ErrorResponse
@@ -74,12 +250,17 @@ async def create_home(
         }
     },
     summary="Get a home profile by ID",
-    description="Retrieve a specific home profile using its unique identifier."
+    description=(
+        "Retrieve a specific home profile using its unique identifier. The ETag header identifies the "
+        "profile's version: send it back as If-None-Match to get 304 Not Modified while it is unchanged, "
+        "or as If-Match on PUT, PATCH and DELETE."
+    )
 )
 async def get_home(
     home_id: str,
+    if_none_match_header: Optional[str] = Header(default=None, alias="If-None-Match"),
     service: HomeService = Depends(get_home_service)
-) -> HomeResponse:
+) -> Response:
     try:
         home = await service.get_home(home_id)
         if not home:
@@ -88,7 +269,10 @@ async def get_home(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Home profile not found."
             )
-        return home
+        etag = version_etag(home.updated_at)
+        if if_none_match(if_none_match_header, etag):
+            return not_modified(etag)
+        return _home_response(home)
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
@@ -98,3 +282,154 @@ async def get_home(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Unable to retrieve home profile. Please try again later."
         )
+
+
+UPDATE_RESPONSES: Dict[int, Dict[str, Any]] = {
+    200: {
+        "description": "Home profile updated; ETag is its new version",
+        "model": HomeResponse
+    },
+    404: {
+        "description": "Home profile not found",
+        "model": ErrorResponse
+    },
+    412: {
+        "description": "If-Match does not match the current version; ETag is the current version",
+        "model": ErrorResponse
+    },
+    422: {
+        "description": "Validation error",
+        "model": ErrorResponse
+    },
+    500: {
+        "description": "Internal Server Error",
+        "model": ErrorResponse
+    }
+}
+
+
+@router.put(
+    "/{home_id}",
+    response_model=HomeResponse,
+    status_code=status.HTTP_200_OK,
+    responses=UPDATE_RESPONSES,
+    summary="Replace a home profile",
+    description=(
+        "Replace all fields of a home profile; optional fields missing from the body are cleared. "
+        "With If-Match, the update only happens if the profile is still at that ETag (412 otherwise)."
+    )
+)
+async def replace_home(
+    home_id: str,
+    request: CreateHomeRequest,
+    if_match: Optional[str] = Header(default=None, alias="If-Match"),
+    service: HomeService = Depends(get_home_service)
+) -> Response:
+    return await _update_home(service, home_id, request.model_dump(), if_match)
+
+
+@router.patch(
+    "/{home_id}",
+    response_model=HomeResponse,
+    status_code=status.HTTP_200_OK,
+    responses=UPDATE_RESPONSES,
+    summary="Update fields of a home profile",
+    description=(
+        "Change only the fields present in the body. With If-Match, the update only happens if the "
+        "profile is still at that ETag (412 otherwise). Refresh its advice afterwards with "
+        "POST /homes/{home_id}/advice/refresh."
+    )
+)
+async def update_home(
+    home_id: str,
+    request: UpdateHomeRequest,
+    if_match: Optional[str] = Header(default=None, alias="If-Match"),
+    service: HomeService = Depends(get_home_service)
+) -> Response:
+    return await _update_home(service, home_id, request.model_dump(exclude_unset=True), if_match)
+
+
+@router.delete(
+    "/{home_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        404: {
+            "description": "Home profile not found",
+            "model": ErrorResponse
+        },
+        412: {
+            "description": "If-Match does not match the current version; ETag is the current version",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal Server Error",
+            "model": ErrorResponse
+        }
+    },
+    summary="Delete a home profile",
+    description=(
+        "Delete a home profile together with its stored advice. With If-Match, only if the profile "
+        "is still at that ETag (412 otherwise)."
+    )
+)
+async def delete_home(
+    home_id: str,
+    if_match: Optional[str] = Header(default=None, alias="If-Match"),
+    service: HomeService = Depends(get_home_service)
+) -> Response:
+    try:
+        await service.delete_home(home_id, if_match=if_match_versions(if_match))
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    except Exception as e:
+        raise _to_write_http_exception(e, home_id, "delete")
+
+
+async def _update_home(
+    service: HomeService,
+    home_id: str,
+    changes: Dict[str, Any],
+    if_match: Optional[str]
+) -> Response:
+    try:
+        home = await service.update_home(home_id, changes, if_match=if_match_versions(if_match))
+        return _home_response(home)
+    except Exception as e:
+        raise _to_write_http_exception(e, home_id, "update")
+
+
+def _home_response(home: HomeResponse) -> Response:
+    return Response(
+        content=home.model_dump_json(),
+        media_type="application/json",
+        headers=validator_headers(version_etag(home.updated_at))
+    )
+
+
+def _to_write_http_exception(e: Exception, home_id: str, action: str) -> HTTPException:
+    """Map update/delete errors to HTTP errors, logging unexpected ones."""
+    if isinstance(e, HomeNotFoundError):
+        logger.warning(f"Home not found: {home_id}")
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Home profile not found."
+        )
+    if isinstance(e, HomeVersionConflictError):
+        logger.info(f"Conditional {action} of home {home_id} rejected, it was modified at {e.current_version}")
+        return HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="The home profile was modified by someone else. Reload it and try again.",
+            headers={"ETag": version_etag(e.current_version)}
+        )
+    if isinstance(e, ValidationError):
+        logger.warning(f"Invalid update of home {home_id}: {str(e)}")
+        return HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="; ".join(
+                f"{' -> '.join(str(loc) for loc in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
+        )
+    logger.error(f"Unexpected error during {action} of home {home_id}: {str(e)}", exc_info=True)
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Unable to {action} home profile. Please try again later."
+    )
@@ -0,0 +1,52 @@
+from typing import Iterator
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from app.api.advice_dependencies import get_advice_cache, get_advice_single_flight
+from app.api.batch_dependencies import get_batch_scheduler
+
+router = APIRouter(tags=["health"])
+
+
+class AdviceRuntimeCollector(Collector):
+    """Reads the in-process cache, single-flight and batch counters at scrape time."""
+
+    def collect(self) -> Iterator:
+        cache = get_advice_cache()
+        if cache is not None:
+            labels = [cache.get_backend_name()]
+            for name, value in (("hits", cache.stats.hits), ("misses", cache.stats.misses), ("errors", cache.stats.errors)):
+                family = CounterMetricFamily(f"advice_cache_{name}", f"Advice cache {name}", labels=["backend"])
+                family.add_metric(labels, value)
+                yield family
+
+        single_flight = get_advice_single_flight()
+        yield CounterMetricFamily(
+            "advice_single_flight_leaders", "Generations started by single-flight", value=single_flight.stats.leaders
+        )
+        yield CounterMetricFamily(
+            "advice_single_flight_coalesced_waiters",
+            "Requests that joined an in-flight generation",
+            value=single_flight.stats.coalesced_waiters
+        )
+        yield CounterMetricFamily(
+            "advice_single_flight_cancelled_flights",
+            "Generations cancelled because every waiter left",
+            value=single_flight.stats.cancelled_flights
+        )
+        yield GaugeMetricFamily(
+            "advice_single_flight_in_flight", "Generations currently in flight", value=single_flight.in_flight
+        )
+
+        scheduler = get_batch_scheduler()
+        yield GaugeMetricFamily("batch_active_items", "Batch items being generated", value=scheduler.active_items)
+        yield GaugeMetricFamily("batch_queued_items", "Batch items waiting for a worker", value=scheduler.queued_items)
+
+
+REGISTRY.register(AdviceRuntimeCollector())
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
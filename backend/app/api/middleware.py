@@ -0,0 +1,50 @@
+import re
+import uuid
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.infrastructure.logging_config import correlation_id
+
+CORRELATION_ID_HEADER = "X-Request-ID"
+
+# Client-supplied IDs end up in every log line, so only accept short, plain tokens
+_VALID_CORRELATION_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+class CorrelationIdMiddleware:
+    """
+    Tags every log record written while handling a request with its X-Request-ID.
+
+    A valid incoming header is reused so IDs can be followed across services;
+    otherwise a new one is generated. The ID is echoed in the response headers.
+    Implemented as plain ASGI so the context variable also covers streaming bodies.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _incoming_request_id(scope) or uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[CORRELATION_ID_HEADER] = request_id
+            await send(message)
+
+        token = correlation_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            correlation_id.reset(token)
+
+
+def _incoming_request_id(scope: Scope) -> str:
+    header_name = CORRELATION_ID_HEADER.lower().encode("latin-1")
+    for name, value in scope["headers"]:
+        if name == header_name:
+            candidate = value.decode("latin-1")
+            return candidate if _VALID_CORRELATION_ID.match(candidate) else ""
+    return ""
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SerializeAsAny
 from app.domain.value_objects import Priority, RecommendationCategory
 
 
@@ -76,6 +76,15 @@ class EnergyAdviceResponse(BaseModel):
         }
 
 
+class AdviceHistoryResponse(BaseModel):
+    home_id: str = Field(description="Unique identifier of the home profile")
+    total: int = Field(description="Number of stored advice reports for the home")
+    offset: int
+    limit: int
+    # SerializeAsAny lets the route fill items with domain EnergyAdvice objects and dump them as they are
+    items: List[SerializeAsAny[EnergyAdviceResponse]] = Field(description="Advice reports, newest first")
+
+
 class LLMProviderInfo(BaseModel):
     provider_type: str = Field(description="Type of LLM provider (e.g., 'ollama', 'openai', 'anthropic')")
     provider_name: str = Field(description="Full provider name including model (e.g., 'ollama-llama3.2')")
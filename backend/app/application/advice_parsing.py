@@ -0,0 +1,226 @@
+"""
+Single-pass parsing of LLM advice output.
+
+The raw completion is parsed and validated by pydantic-core in one call
+(model_validate_json); the clean-up rules for LLM-written figures are
+validators on the output models rather than a second pass over dicts.
+Only output that fails that parse goes through repair_json.
+
+The same model defines what the LLM is asked to produce: generation_schema() is
+its JSON schema reduced to the keywords that shape constrained decoding.
+"""
+import copy
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Type
+from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
+from app.domain.value_objects import Recommendation, RecommendationCategory
+from app.constants import ZERO_VALUE_THRESHOLD
+
+FINANCIAL_FIELDS = ("estimated_savings_annual", "estimated_cost", "payback_period_years")
+
+# A cut-off document is rolled back to the last complete item at most this many containers deep:
+# members of the root object and items of arrays directly under it (i.e. whole recommendations)
+SALVAGE_DEPTH = 2
+
+CLOSING = {"{": "}", "[": "]"}
+
+# JSON Schema keywords kept in the generation schema; titles, descriptions and defaults only cost prompt
+# tokens and grammar size, and the numeric bounds are enforced by the validators below instead
+GENERATION_SCHEMA_KEYWORDS = frozenset({"type", "properties", "items", "enum", "anyOf"})
+
+
+def _non_positive_to_none(value: Any) -> Any:
+    # LLMs write 0 (or negative numbers) for "unknown"; gt=0 would otherwise reject the whole recommendation
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value <= ZERO_VALUE_THRESHOLD:
+        return None
+    return value
+
+
+class LLMRecommendation(Recommendation):
+    """A Recommendation as written by the LLM, normalized while it is validated."""
+
+    @field_validator(*FINANCIAL_FIELDS, mode="before")
+    @classmethod
+    def non_positive_to_none(cls, value: Any) -> Any:
+        return _non_positive_to_none(value)
+
+    @model_validator(mode="after")
+    def derive_annual_savings(self) -> "LLMRecommendation":
+        if self.estimated_savings_annual is None and self.estimated_cost and self.payback_period_years:
+            self.estimated_savings_annual = self.estimated_cost / self.payback_period_years
+        return self
+
+
+class LLMAdviceOutput(BaseModel):
+    """The part of the LLM's JSON the service uses; other keys (home_id, generated_at, ...) are ignored."""
+    recommendations: List[LLMRecommendation] = Field(default_factory=list)
+    summary: str = ""
+    estimated_total_annual_savings: Optional[float] = None
+
+    @field_validator("estimated_total_annual_savings", mode="before")
+    @classmethod
+    def non_positive_to_none(cls, value: Any) -> Any:
+        return _non_positive_to_none(value)
+
+    @model_validator(mode="after")
+    def derive_total_savings(self) -> "LLMAdviceOutput":
+        if self.estimated_total_annual_savings is None:
+            self.estimated_total_annual_savings = total_annual_savings(self.recommendations)
+        return self
+
+
+def total_annual_savings(recommendations: List[Recommendation]) -> Optional[float]:
+    total = sum(
+        rec.estimated_savings_annual
+        for rec in recommendations
+        if rec.estimated_savings_annual is not None
+    )
+    # None rather than 0: EnergyAdvice requires a positive total when one is given
+    return total if total > ZERO_VALUE_THRESHOLD else None
+
+
+class RepairedJSON(NamedTuple):
+    text: str
+    # The document was cut off and everything after its last complete item was dropped
+    truncated: bool
+
+
+class ParsedAdvice(NamedTuple):
+    output: LLMAdviceOutput
+    repaired: bool
+    truncated: bool
+
+
+def repair_json(text: str) -> Optional[RepairedJSON]:
+    """
+    Best-effort repair of the JSON object in an LLM response.
+
+    Skips prose and markdown fences around the object and drops trailing commas.
+    When the object is cut off (e.g. at the token limit), it is rolled back to its
+    last complete item within SALVAGE_DEPTH and everything still open is closed;
+    values nested deeper are kept whole or not at all, so a half-written
+    recommendation is dropped rather than kept with missing fields.
+    Returns None when there is no object in the text.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    out: List[str] = []
+    stack: List[str] = []
+    # Length of out and the containers open at the last point where the document can be cut
+    cut: Tuple[int, List[str]] = (0, [])
+    in_string = escaped = is_value = False
+    previous = ""
+
+    for char in text[start:]:
+        out.append(char)
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                previous = char
+                if is_value and len(stack) <= SALVAGE_DEPTH:
+                    cut = (len(out), stack.copy())
+            continue
+        if char.isspace():
+            continue
+
+        if char == '"':
+            in_string = True
+            # Keys are followed by ':'; only a complete value is a place to cut
+            is_value = previous == ":" or (bool(stack) and stack[-1] == "[")
+        elif char in CLOSING:
+            stack.append(char)
+            if len(stack) == 1:
+                cut = (len(out), stack.copy())
+        elif char in "}]" and stack:
+            out.pop()
+            _strip_trailing_comma(out)
+            out.append(char)
+            stack.pop()
+            if not stack:
+                return RepairedJSON("".join(out), truncated=False)
+            if len(stack) <= SALVAGE_DEPTH:
+                cut = (len(out), stack.copy())
+        elif char == "," and len(stack) <= SALVAGE_DEPTH:
+            cut = (len(out) - 1, stack.copy())
+        previous = char
+
+    length, still_open = cut
+    out = out[:length]
+    _strip_trailing_comma(out)
+    out.extend(CLOSING[container] for container in reversed(still_open))
+    return RepairedJSON("".join(out), truncated=True)
+
+
+def _strip_trailing_comma(out: List[str]) -> None:
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def parse_advice_output(text: str) -> ParsedAdvice:
+    """
+    Parse LLM output, repairing it only when the single-pass parse fails.
+
+    Raises pydantic.ValidationError when the output is not valid advice even after repair.
+    """
+    try:
+        return ParsedAdvice(LLMAdviceOutput.model_validate_json(text), repaired=False, truncated=False)
+    except ValidationError:
+        repaired = repair_json(text)
+        if repaired is None or repaired.text == text:
+            raise
+    return ParsedAdvice(
+        LLMAdviceOutput.model_validate_json(repaired.text),
+        repaired=True,
+        truncated=repaired.truncated
+    )
+
+
+def compact_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """model's JSON schema with $refs inlined, only GENERATION_SCHEMA_KEYWORDS kept and every property required."""
+    schema = model.model_json_schema()
+    definitions = schema.get("$defs", {})
+
+    def compact(node: Dict[str, Any]) -> Dict[str, Any]:
+        if "$ref" in node:
+            # Sibling keywords of a $ref (e.g. a default) apply on top of the referenced definition
+            node = {**definitions[node["$ref"].rsplit("/", 1)[-1]], **node}
+        result: Dict[str, Any] = {}
+        for key, value in node.items():
+            if key not in GENERATION_SCHEMA_KEYWORDS:
+                continue
+            if key == "properties":
+                value = {name: compact(prop) for name, prop in value.items()}
+            elif key == "items":
+                value = compact(value)
+            elif key == "anyOf":
+                value = [compact(option) for option in value]
+            result[key] = value
+        if "properties" in result:
+            # Required properties are generated in schema order, so recommendations come before the summary
+            result["required"] = list(result["properties"])
+        return result
+
+    return compact(schema)
+
+
+@lru_cache(maxsize=None)
+def generation_schema() -> Dict[str, Any]:
+    """The JSON schema the LLM generates advice against (Ollama's format); shared, treat as read-only."""
+    return compact_json_schema(LLMAdviceOutput)
+
+
+@lru_cache(maxsize=None)
+def category_generation_schema(categories: FrozenSet[RecommendationCategory]) -> Dict[str, Any]:
+    """generation_schema() allowing only recommendations in the given categories."""
+    schema = copy.deepcopy(generation_schema())
+    category = schema["properties"]["recommendations"]["items"]["properties"]["category"]
+    category["enum"] = [value for value in category["enum"] if value in categories]
+    return schema
@@ -0,0 +1,96 @@
+"""
+Which stored recommendations a home-profile change invalidates.
+
+Each prompt-relevant HomeProfile field maps to the recommendation categories it
+influences. When only narrowly scoped fields change (e.g. window_type), the
+advice service regenerates just those categories and keeps the rest of the
+stored advice; fields that shape every recommendation (size, climate, energy
+cost, budget, ...) require a full generation.
+"""
+from typing import Any, Dict, FrozenSet, List, NamedTuple
+from app.domain.entities import HomeProfile
+from app.domain.value_objects import PRIORITY_ORDER, Recommendation, RecommendationCategory
+
+ALL_CATEGORIES: FrozenSet[RecommendationCategory] = frozenset(RecommendationCategory)
+
+# HomeProfile fields that are not part of the prompt
+NON_PROFILE_FIELDS = frozenset({"id", "created_at", "updated_at"})
+
+_INSULATION = RecommendationCategory.INSULATION
+_HEATING_COOLING = RecommendationCategory.HEATING_COOLING
+_WINDOWS = RecommendationCategory.WINDOWS
+_APPLIANCES = RecommendationCategory.APPLIANCES
+_RENEWABLE_ENERGY = RecommendationCategory.RENEWABLE_ENERGY
+_BEHAVIORAL = RecommendationCategory.BEHAVIORAL
+
+# Categories a change of each field affects; fields not listed affect every category
+PROFILE_FIELD_CATEGORIES: Dict[str, FrozenSet[RecommendationCategory]] = {
+    "heating_type": frozenset({_HEATING_COOLING, _RENEWABLE_ENERGY}),
+    "insulation_type": frozenset({_INSULATION}),
+    "window_type": frozenset({_WINDOWS}),
+    "num_floors": frozenset({_INSULATION, _HEATING_COOLING}),
+    "num_occupants": frozenset({_APPLIANCES, _BEHAVIORAL}),
+    "has_basement": frozenset({_INSULATION}),
+    "has_attic": frozenset({_INSULATION}),
+    "has_solar_panels": frozenset({_RENEWABLE_ENERGY}),
+    "has_smart_thermostat": frozenset({_HEATING_COOLING, _BEHAVIORAL}),
+    "primary_energy_source": frozenset({_HEATING_COOLING, _RENEWABLE_ENERGY, _APPLIANCES}),
+    "avg_monthly_kwh": frozenset({_APPLIANCES, _RENEWABLE_ENERGY, _BEHAVIORAL}),
+    "hvac_age_years": frozenset({_HEATING_COOLING}),
+    "roof_type": frozenset({_INSULATION, _RENEWABLE_ENERGY}),
+    "roof_age_years": frozenset({_INSULATION, _RENEWABLE_ENERGY}),
+}
+
+
+class ProfileChange(NamedTuple):
+    field: str
+    old: Any
+    new: Any
+
+    def __str__(self) -> str:
+        return f"{self.field}: {_describe(self.old)} -> {_describe(self.new)}"
+
+
+def _describe(value: Any) -> str:
+    return "not set" if value is None else str(value)
+
+
+def diff_profiles(old: HomeProfile, new: HomeProfile) -> List[ProfileChange]:
+    """Prompt-relevant fields whose values differ, in HomeProfile field order."""
+    return [
+        ProfileChange(field, getattr(old, field), getattr(new, field))
+        for field in HomeProfile.model_fields
+        if field not in NON_PROFILE_FIELDS and getattr(old, field) != getattr(new, field)
+    ]
+
+
+def affected_categories(changes: List[ProfileChange]) -> FrozenSet[RecommendationCategory]:
+    categories: FrozenSet[RecommendationCategory] = frozenset()
+    for change in changes:
+        categories |= PROFILE_FIELD_CATEGORIES.get(change.field, ALL_CATEGORIES)
+    return categories
+
+
+def merge_recommendations(
+    kept: List[Recommendation],
+    regenerated: List[Recommendation],
+    categories: FrozenSet[RecommendationCategory]
+) -> List[Recommendation]:
+    """
+    The kept recommendations plus the regenerated ones in the affected categories, by priority.
+
+    The sort is stable, so recommendations of equal priority stay in the order they were written.
+    """
+    kept_titles = {rec.title for rec in kept}
+    merged = kept + [
+        rec for rec in regenerated if rec.category in categories and rec.title not in kept_titles
+    ]
+    return sorted(merged, key=lambda rec: PRIORITY_ORDER.index(rec.priority))
+
+
+def kept_recommendations(
+    recommendations: List[Recommendation],
+    categories: FrozenSet[RecommendationCategory]
+) -> List[Recommendation]:
+    """The recommendations outside the given categories, which a refresh keeps as they are."""
+    return [rec for rec in recommendations if rec.category not in categories]
@@ -1,144 +1,533 @@
-import json
 import logging
+import time
 from datetime import datetime
-from typing import Optional
-from app.domain.entities import HomeProfile
-from app.domain.value_objects import EnergyAdvice, Recommendation
-from app.domain.repositories import HomeRepository
-from app.domain.exceptions import HomeNotFoundError, LLMValidationError
+from typing import AsyncIterator, FrozenSet, List, NamedTuple, Optional, Union
+from pydantic import ValidationError
+from app.domain.entities import HomeProfile, StoredAdvice
+from app.domain.value_objects import EnergyAdvice, Recommendation, RecommendationCategory
+from app.domain.repositories import HomeRepository, AdviceRepository
+from app.domain.exceptions import (
+    HomeNotFoundError,
+    LLMProviderError,
+    LLMConnectionError,
+    LLMServiceUnavailableError,
+    LLMTimeoutError,
+    LLMValidationError
+)
 from app.infrastructure.llm.base import LLMProvider
-from app.application.prompt_builder import EnergyAdvicePromptBuilder
+from app.infrastructure.cache.base import AdviceCache
+from app.infrastructure.llm.types import ChatMessage
+from app.infrastructure.metrics import (
+    ADVICE_REQUESTS,
+    ADVICE_STAGE_SECONDS,
+    LLM_OUTPUT_SALVAGE,
+    observe_stage,
+    record_llm_error
+)
+from app.application.prompt_templates import get_energy_advice_prompt_template
+from app.application.cache_keys import build_advice_cache_key
+from app.application.single_flight import SingleFlight
+from app.application.streaming_parser import IncrementalRecommendationParser
+from app.application.rule_based_advisor import RuleBasedAdvisor
+from app.application.advice_parsing import (
+    LLMAdviceOutput,
+    LLMRecommendation,
+    ParsedAdvice,
+    category_generation_schema,
+    parse_advice_output,
+    total_annual_savings
+)
+from app.application.advice_refresh import (
+    ALL_CATEGORIES,
+    ProfileChange,
+    affected_categories,
+    diff_profiles,
+    kept_recommendations,
+    merge_recommendations
+)
 from app.constants import (
     LLM_TEMPERATURE,
     LLM_MAX_TOKENS,
-    LOG_RESPONSE_PREVIEW_LENGTH,
-    ZERO_VALUE_THRESHOLD
+    LOG_RESPONSE_PREVIEW_LENGTH
 )
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
-# Field names for recommendation processing
-FINANCIAL_FIELDS = ["estimated_savings_annual", "estimated_cost", "payback_period_years"]
+# LLM failures that rule-based advice can stand in for (the LLM is down or too slow, not wrong)
+FALLBACK_ERRORS = (LLMConnectionError, LLMServiceUnavailableError, LLMTimeoutError)
+
+
+class ProvisionalAdvice(NamedTuple):
+    """Rule-based advice streamed ahead of the LLM result, to be replaced by it."""
+    advice: EnergyAdvice
 
 
 class EnergyAdviceService:
     def __init__(
         self,
         home_repository: HomeRepository,
-        llm_provider: LLMProvider
+        llm_provider: LLMProvider,
+        advice_cache: Optional[AdviceCache] = None,
+        single_flight: Optional[SingleFlight[EnergyAdvice]] = None,
+        advice_repository: Optional[AdviceRepository] = None,
+        rule_based_advisor: Optional[RuleBasedAdvisor] = None,
+        rule_based_fallback: bool = False
     ):
         self.home_repository = home_repository
         self.llm_provider = llm_provider
-        self.prompt_builder = EnergyAdvicePromptBuilder()
+        self.advice_cache = advice_cache
+        self.single_flight = single_flight
+        self.advice_repository = advice_repository
+        self.rule_based_advisor = rule_based_advisor
+        self.rule_based_fallback = rule_based_fallback and rule_based_advisor is not None
+        self.prompt_template = get_energy_advice_prompt_template()
+
+    async def generate_advice(self, home_id: str, allow_fallback: bool = True) -> EnergyAdvice:
+        """
+        LLM advice for a home, from the cache when possible.
+
+        If the LLM is unavailable or times out and rule-based fallback is enabled,
+        rule-based advice is returned instead; it is neither cached nor stored.
+        """
+        with observe_stage("total"):
+            home, cache_key = await self._load_home(home_id)
+
+            advice = await self._get_cached_advice(home_id, cache_key)
+            if advice:
+                ADVICE_REQUESTS.labels(source="cache").inc()
+            else:
+                led = False
+
+                async def generate() -> EnergyAdvice:
+                    nonlocal led
+                    led = True
+                    return await self._generate_and_cache(home, cache_key)
+
+                try:
+                    if self.single_flight:
+                        # Concurrent requests for identical profiles share one LLM generation
+                        advice = await self.single_flight.do(cache_key, generate)
+                    else:
+                        advice = await generate()
+                except FALLBACK_ERRORS as e:
+                    if not (allow_fallback and self.rule_based_fallback):
+                        raise
+                    return self._fall_back(home, e)
+                ADVICE_REQUESTS.labels(source="llm" if led else "coalesced").inc()
+                advice = advice.model_copy(update={"home_id": home_id})
+
+            await self._save_advice(home, advice, cache_key)
+            return advice
+
+    async def refresh_advice(self, home_id: str, allow_fallback: bool = True) -> EnergyAdvice:
+        """
+        Advice for a home after its profile changed, regenerating only what the change affects.
+
+        The home is compared with the profile its latest stored advice was generated
+        for; only the recommendation categories affected by the changed fields are
+        generated again and merged with the stored recommendations of the other
+        categories. Without stored advice, when it was generated by another model or
+        prompt version, or when a change affects every category, this is
+        generate_advice. Unchanged homes get their stored advice back.
+        Falls back to rule-based advice like generate_advice.
+
+        Merged advice is added to the home's history but not cached: it depends on
+        this home's previous advice, not only on the profile the cache key describes.
+        """
+        home, cache_key = await self._load_home(home_id)
+        stored = await self.advice_repository.get_latest_stored(home_id) if self.advice_repository else None
+        if stored is None:
+            return await self.generate_advice(home_id, allow_fallback)
+        if stored.cache_key != self._cache_key(stored.profile):
+            # Same profile, different key: the model or prompt changed, so none of it is kept
+            logger.info(f"Latest advice of home {home_id} is from another model or prompt, generating advice from scratch")
+            return await self.generate_advice(home_id, allow_fallback)
+
+        previous = stored.advice
+        changes = diff_profiles(stored.profile, home)
+        if not changes:
+            logger.info(f"Home {home_id} is unchanged since its latest advice, serving the stored advice")
+            ADVICE_REQUESTS.labels(source="stored").inc()
+            return previous
+        categories = affected_categories(changes)
+        if categories >= ALL_CATEGORIES:
+            logger.info(f"Profile changes of home {home_id} affect every category, generating advice from scratch")
+            return await self.generate_advice(home_id, allow_fallback)
+
+        with observe_stage("total"):
+            advice = await self._get_cached_advice(home_id, cache_key)
+            if advice:
+                ADVICE_REQUESTS.labels(source="cache").inc()
+            else:
+                led = False
+
+                async def regenerate() -> EnergyAdvice:
+                    nonlocal led
+                    led = True
+                    return await self._regenerate_categories(home, previous, changes, categories)
+
+                try:
+                    if self.single_flight:
+                        # Only refreshes of the same profile from the same previous advice give the same result
+                        flight_key = f"{cache_key}:refresh:{previous.generated_at.isoformat()}"
+                        advice = await self.single_flight.do(flight_key, regenerate)
+                    else:
+                        advice = await regenerate()
+                except FALLBACK_ERRORS as e:
+                    if not (allow_fallback and self.rule_based_fallback):
+                        raise
+                    return self._fall_back(home, e)
+                ADVICE_REQUESTS.labels(source="llm_refresh" if led else "coalesced").inc()
+                advice = advice.model_copy(update={"home_id": home_id})
+
+            await self._save_advice(home, advice, cache_key)
+            return advice
+
+    async def generate_instant_advice(self, home_id: str) -> EnergyAdvice:
+        """Rule-based advice only; answers in milliseconds without calling the LLM."""
+        if not self.rule_based_advisor:
+            raise ValueError("Rule-based advice is not configured")
+        home = await self._get_home(home_id)
+        ADVICE_REQUESTS.labels(source="rules").inc()
+        with observe_stage("rules"):
+            return self.rule_based_advisor.advise(home)
 
-    async def generate_advice(self, home_id: str) -> EnergyAdvice:
-        home = await self.home_repository.get_by_id(home_id)
+    async def get_latest_stored_advice(self, home_id: str) -> Optional[StoredAdvice]:
+        """Most recently stored advice for a home, without calling the LLM."""
+        if not self.advice_repository:
+            return None
+        return await self.advice_repository.get_latest_stored(home_id)
+
+    async def get_advice_history(self, home_id: str, offset: int, limit: int) -> tuple[list[EnergyAdvice], int]:
+        """A page of previously generated advice for a home (newest first) and the total count."""
+        if not self.advice_repository:
+            return [], 0
+        advice = await self.advice_repository.list_by_home(home_id, offset=offset, limit=limit)
+        total = await self.advice_repository.count_by_home(home_id)
+        return advice, total
+
+    async def stream_advice(
+        self,
+        home_id: str,
+        prefill: bool = False
+    ) -> AsyncIterator[Union[ProvisionalAdvice, Recommendation, EnergyAdvice]]:
+        """
+        Stream advice generation: yields each Recommendation as soon as the LLM has
+        finished writing it, then the complete EnergyAdvice as the last item.
+
+        With prefill, rule-based ProvisionalAdvice is yielded first while the LLM runs.
+        If the LLM fails before its first recommendation and fallback is enabled, the
+        rule-based recommendations and advice are streamed instead.
+        """
+        home, cache_key = await self._load_home(home_id)
+
+        cached_advice = await self._get_cached_advice(home_id, cache_key)
+        if cached_advice:
+            ADVICE_REQUESTS.labels(source="cache").inc()
+            for recommendation in cached_advice.recommendations:
+                yield recommendation
+            await self._save_advice(home, cached_advice, cache_key)
+            yield cached_advice
+            return
+
+        if prefill and self.rule_based_advisor:
+            with observe_stage("rules"):
+                provisional = ProvisionalAdvice(self.rule_based_advisor.advise(home))
+            yield provisional
+
+        ADVICE_REQUESTS.labels(source="llm_stream").inc()
+        with observe_stage("prompt_build"):
+            messages = self.prompt_template.render(home)
+        parser = IncrementalRecommendationParser()
+
+        logger.info(f"Streaming energy advice for home: {home_id}")
+
+        # Includes time the client takes to consume each recommendation
+        stream_started = time.perf_counter()
+        streamed_titles = set()
+        try:
+            async for chunk in self.llm_provider.stream_completion(
+                messages=messages,
+                temperature=LLM_TEMPERATURE,
+                response_format=self.prompt_template.response_schema,
+                max_tokens=LLM_MAX_TOKENS
+            ):
+                for rec_data in parser.feed(chunk):
+                    try:
+                        recommendation = LLMRecommendation.model_validate(rec_data)
+                    except ValidationError as e:
+                        # The final parse reports invalid output; the stream just skips it
+                        logger.debug(f"Skipping invalid streamed recommendation for home {home_id}: {str(e)}")
+                        continue
+                    streamed_titles.add(recommendation.title)
+                    yield recommendation
+        except FALLBACK_ERRORS as e:
+            # Once LLM recommendations went out, mixing in rule-based ones would confuse the client
+            if streamed_titles or not self.rule_based_fallback:
+                raise
+            fallback = self._fall_back(home, e)
+            for recommendation in fallback.recommendations:
+                yield recommendation
+            yield fallback
+            return
+        ADVICE_STAGE_SECONDS.labels(stage="llm_stream").observe(time.perf_counter() - stream_started)
+
+        advice, complete = await self._complete_advice(home_id, messages, parser.text)
+        # Recommendations from a continuation of a cut-off response have not been streamed yet
+        for recommendation in advice.recommendations:
+            if recommendation.title not in streamed_titles:
+                yield recommendation
+        if complete:
+            await self._store_in_cache(cache_key, advice)
+        await self._save_advice(home, advice, cache_key)
+        yield advice
+
+    async def _get_home(self, home_id: str) -> HomeProfile:
+        with observe_stage("load_home"):
+            home = await self.home_repository.get_by_id(home_id)
         
         if not home:
             logger.warning(f"Home not found: {home_id}")
             raise HomeNotFoundError(home_id)
+        return home
+
+    async def _load_home(self, home_id: str) -> tuple[HomeProfile, str]:
+        home = await self._get_home(home_id)
+        return home, self._cache_key(home)
+
+    def _cache_key(self, home: HomeProfile) -> str:
+        return build_advice_cache_key(
+            home,
+            self.llm_provider.get_provider_name(),
+            prompt_version=self.prompt_template.version
+        )
+
+    def _fall_back(self, home: HomeProfile, error: Exception) -> EnergyAdvice:
+        logger.warning(f"LLM unavailable for home {home.id}, serving rule-based advice: {str(error)}")
+        ADVICE_REQUESTS.labels(source="rules_fallback").inc()
+        with observe_stage("rules"):
+            return self.rule_based_advisor.advise(home)
+
+    async def _get_cached_advice(self, home_id: str, cache_key: str) -> Optional[EnergyAdvice]:
+        if not self.advice_cache:
+            return None
+
+        with observe_stage("cache_lookup"):
+            cached_advice = await self.advice_cache.get(cache_key)
+        if not cached_advice:
+            return None
+
+        logger.info(f"Serving cached energy advice for home: {home_id}")
+        # Other homes with identical characteristics share the entry
+        return cached_advice.model_copy(update={"home_id": home_id})
+
+    async def _save_advice(self, home: HomeProfile, advice: EnergyAdvice, cache_key: str) -> None:
+        """Add the advice to the home's history unless it is already the latest entry."""
+        if not self.advice_repository:
+            return
+
+        with observe_stage("persist"):
+            latest = await self.advice_repository.get_latest_stored(home.id)
+            if latest and latest.cache_key == cache_key and latest.advice.generated_at == advice.generated_at:
+                # Repeated cache hit for an unchanged home: the report is already stored.
+                # A cache hit after the profile changed back is stored again, as the latest entry.
+                return
+
+            await self.advice_repository.create(advice, home, cache_key)
+
+    async def _generate_and_cache(self, home: HomeProfile, cache_key: str) -> EnergyAdvice:
+        """Run the LLM generation for a home and store the result in the cache."""
+        home_id = home.id
 
         # Build messages in chat format: [{"role": "system", "content": "..."}, {"role": "user", "content": "..."}]
-        messages = self.prompt_builder.build_prompt(home)
+        with observe_stage("prompt_build"):
+            messages = self.prompt_template.render(home)
         
         logger.info(f"Generating energy advice for home: {home_id}")
         
         try:
-            llm_response = await self.llm_provider.generate_completion(
-                messages=messages,
-                temperature=LLM_TEMPERATURE,
-                response_format=EnergyAdvice.model_json_schema(),
-                max_tokens=LLM_MAX_TOKENS
-            )
-            logger.debug(f"LLM Response received for home {home_id}: {llm_response[:LOG_RESPONSE_PREVIEW_LENGTH]}...")
-            
-            advice_data = self._parse_llm_response(llm_response, home_id)
-
-            # Process recommendations and build EnergyAdvice
-            recommendations = self._process_recommendations(advice_data.get("recommendations", []))
-            estimated_total_annual_savings = self._calculate_total_savings(
-                advice_data.get("estimated_total_annual_savings"),
-                recommendations
-            )
-        except LLMValidationError:
-            # LLM validation errors are already logged and user-friendly, just re-raise
+            with observe_stage("llm"):
+                llm_response = await self.llm_provider.generate_completion(
+                    messages=messages,
+                    temperature=LLM_TEMPERATURE,
+                    response_format=self.prompt_template.response_schema,
+                    max_tokens=LLM_MAX_TOKENS
+                )
+        except FALLBACK_ERRORS as e:
+            # Expected during an outage; the caller falls back or reports it
+            logger.warning(f"LLM unavailable generating advice for home {home_id}: {str(e)}")
             raise
         except Exception as e:
             logger.error(f"Unexpected error generating advice for home {home_id}: {str(e)}", exc_info=True)
             raise
+        logger.debug(f"LLM Response received for home {home_id}: {llm_response[:LOG_RESPONSE_PREVIEW_LENGTH]}...")
+
+        advice, complete = await self._complete_advice(home_id, messages, llm_response)
+        if complete:
+            await self._store_in_cache(cache_key, advice)
+        return advice
+
+    async def _regenerate_categories(
+        self,
+        home: HomeProfile,
+        previous: EnergyAdvice,
+        changes: List[ProfileChange],
+        categories: FrozenSet[RecommendationCategory]
+    ) -> EnergyAdvice:
+        """
+        Generate recommendations for the given categories and merge them into the previous advice.
+
+        A cut-off response keeps its complete recommendations without a continuation.
+        """
+        home_id = home.id
+        kept = kept_recommendations(previous.recommendations, categories)
+        with observe_stage("prompt_build"):
+            messages = self.prompt_template.render_refresh(home, changes, categories, [rec.title for rec in kept])
+
+        logger.info(
+            f"Regenerating {', '.join(sorted(category.value for category in categories))} advice for home: {home_id}"
+        )
+
+        try:
+            with observe_stage("llm_refresh"):
+                llm_response = await self.llm_provider.generate_completion(
+                    messages=messages,
+                    temperature=LLM_TEMPERATURE,
+                    response_format=category_generation_schema(categories),
+                    max_tokens=LLM_MAX_TOKENS
+                )
+        except FALLBACK_ERRORS as e:
+            logger.warning(f"LLM unavailable regenerating advice for home {home_id}: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error regenerating advice for home {home_id}: {str(e)}", exc_info=True)
+            raise
+        logger.debug(f"LLM Response received for home {home_id}: {llm_response[:LOG_RESPONSE_PREVIEW_LENGTH]}...")
+
+        parsed = self._parse_llm_response(home_id, llm_response)
+        if parsed.truncated:
+            LLM_OUTPUT_SALVAGE.labels(outcome="partial").inc()
+        elif parsed.repaired:
+            LLM_OUTPUT_SALVAGE.labels(outcome="repaired").inc()
 
-        return EnergyAdvice(
+        recommendations = merge_recommendations(kept, parsed.output.recommendations, categories)
+        # The LLM's total only covers what it wrote, so the total is summed over the merged recommendations
+        advice = EnergyAdvice.model_construct(
             home_id=home_id,
             recommendations=recommendations,
-            summary=advice_data.get("summary", ""),
-            estimated_total_annual_savings=estimated_total_annual_savings if estimated_total_annual_savings else 0,
+            summary=parsed.output.summary or previous.summary,
+            estimated_total_annual_savings=total_annual_savings(recommendations),
             generated_at=datetime.utcnow(),
             llm_provider=self.llm_provider.get_provider_name()
         )
+        return advice
 
-    def _process_recommendations(self, recommendations_data: list) -> list[Recommendation]:
-        """Process and validate recommendation data from LLM response."""
-        recommendations = []
-        
-        for rec_data in recommendations_data:
-            # Convert 0 or negative values to None for fields with gt=0 validation
-            for field in FINANCIAL_FIELDS:
-                if rec_data.get(field) is not None and rec_data.get(field) <= ZERO_VALUE_THRESHOLD:
-                    rec_data[field] = None
-            
-            # Calculate estimated_savings_annual if not provided
-            if rec_data.get("estimated_savings_annual") is None:
-                rec_data["estimated_savings_annual"] = self._calculate_annual_savings(
-                    rec_data.get("estimated_cost"),
-                    rec_data.get("payback_period_years")
+    async def _store_in_cache(self, cache_key: str, advice: EnergyAdvice) -> None:
+        if self.advice_cache:
+            with observe_stage("cache_store"):
+                await self.advice_cache.set(cache_key, advice)
+
+    async def _complete_advice(
+        self,
+        home_id: str,
+        messages: List[ChatMessage],
+        llm_response: str
+    ) -> tuple[EnergyAdvice, bool]:
+        """
+        Parse a finished LLM response into EnergyAdvice, and whether the advice is complete.
+
+        A response that was cut off (e.g. at LLM_MAX_TOKENS) keeps its complete
+        recommendations and is finished by a follow-up call instead of being
+        generated again from scratch. Incomplete advice should not be cached.
+        """
+        parsed = self._parse_llm_response(home_id, llm_response)
+        output, complete = parsed.output, True
+        if parsed.truncated:
+            output, complete = await self._continue_llm_response(home_id, messages, llm_response, parsed.output)
+        elif parsed.repaired:
+            LLM_OUTPUT_SALVAGE.labels(outcome="repaired").inc()
+
+        # Everything was validated while parsing; do not validate it again
+        advice = EnergyAdvice.model_construct(
+            home_id=home_id,
+            recommendations=output.recommendations,
+            summary=output.summary,
+            estimated_total_annual_savings=output.estimated_total_annual_savings,
+            generated_at=datetime.utcnow(),
+            llm_provider=self.llm_provider.get_provider_name()
+        )
+        return advice, complete
+
+    async def _continue_llm_response(
+        self,
+        home_id: str,
+        messages: List[ChatMessage],
+        partial_response: str,
+        salvaged: LLMAdviceOutput
+    ) -> tuple[LLMAdviceOutput, bool]:
+        """Ask the LLM for the rest of a cut-off response; falls back to what was salvaged."""
+        received = [rec.title for rec in salvaged.recommendations]
+        logger.warning(
+            f"LLM response for home {home_id} was cut off after {len(received)} complete recommendations, "
+            f"continuing generation"
+        )
+        try:
+            with observe_stage("llm_continuation"):
+                continuation_response = await self.llm_provider.generate_completion(
+                    messages=self.prompt_template.render_continuation(messages, partial_response, received),
+                    temperature=LLM_TEMPERATURE,
+                    response_format=self.prompt_template.response_schema,
+                    max_tokens=LLM_MAX_TOKENS
                 )
-            
-            recommendations.append(Recommendation(**rec_data))
-        
-        return recommendations
-
-    def _calculate_annual_savings(
-        self, 
-        estimated_cost: Optional[float], 
-        payback_period: Optional[float]
-    ) -> Optional[float]:
-        """Calculate annual savings from cost and payback period."""
-        if estimated_cost is not None and payback_period is not None and payback_period > ZERO_VALUE_THRESHOLD:
-            return estimated_cost / payback_period
-        return None
-
-    def _calculate_total_savings(
-        self, 
-        llm_provided_total: Optional[float],
-        recommendations: list[Recommendation]
-    ) -> Optional[float]:
-        """Calculate total annual savings from recommendations if not provided by LLM."""
-        if llm_provided_total is not None and llm_provided_total > ZERO_VALUE_THRESHOLD:
-            return llm_provided_total
-        
-        # Sum up all individual recommendation savings
-        total_savings = sum(
-            rec.estimated_savings_annual 
-            for rec in recommendations 
-            if rec.estimated_savings_annual is not None
+            with observe_stage("parse"):
+                continuation = parse_advice_output(continuation_response)
+        except (LLMProviderError, ValidationError) as e:
+            if not received:
+                LLM_OUTPUT_SALVAGE.labels(outcome="failed").inc()
+                if isinstance(e, LLMProviderError):
+                    raise
+                logger.error(
+                    f"Failed to continue cut-off LLM response for home {home_id}: {_describe_validation_error(e)}"
+                )
+                error = LLMValidationError("Unable to process AI response. Please try again.")
+                record_llm_error(error)
+                raise error
+            reason = _describe_validation_error(e) if isinstance(e, ValidationError) else str(e)
+            logger.warning(
+                f"Continuing cut-off LLM response for home {home_id} failed, "
+                f"serving {len(received)} salvaged recommendations: {reason}"
+            )
+            LLM_OUTPUT_SALVAGE.labels(outcome="partial").inc()
+            return salvaged, False
+
+        LLM_OUTPUT_SALVAGE.labels(outcome="continued").inc()
+        received_titles = set(received)
+        output = LLMAdviceOutput(
+            recommendations=salvaged.recommendations + [
+                rec for rec in continuation.output.recommendations if rec.title not in received_titles
+            ],
+            summary=continuation.output.summary or salvaged.summary
         )
-        
-        return total_savings if total_savings > ZERO_VALUE_THRESHOLD else None
+        return output, not continuation.truncated
 
-    def _parse_llm_response(self, response: str, home_id: str) -> dict:
-        """Parse LLM response with detailed error logging."""
-        cleaned_response = response.strip()
+    def _parse_llm_response(self, home_id: str, llm_response: str) -> ParsedAdvice:
+        """Single-pass parse of the LLM response, repairing it if needed; raises LLMValidationError."""
         try:
-            return json.loads(cleaned_response)
-        except json.JSONDecodeError as e:
-            error_msg = f"JSON parsing error - Line: {e.lineno}, Column: {e.colno}, Message: {e.msg}"
-            if home_id:
-                logger.error(f"Failed to parse LLM response for home {home_id}: {error_msg}")
-                logger.debug(f"Raw LLM response causing error: {cleaned_response}")
-            else:
-                logger.error(f"Failed to parse LLM response: {error_msg}")
-                logger.debug(f"Raw response: {cleaned_response}")
-            
+            with observe_stage("parse"):
+                return parse_advice_output(llm_response)
+        except ValidationError as e:
+            logger.error(f"Failed to parse LLM response for home {home_id}: {_describe_validation_error(e)}")
+            logger.debug(f"Raw LLM response causing error: {llm_response}")
+            LLM_OUTPUT_SALVAGE.labels(outcome="failed").inc()
             # Re-raise with user-friendly message (technical details already logged)
-            raise LLMValidationError("Unable to process AI response. Please try again.")
+            validation_error = LLMValidationError("Unable to process AI response. Please try again.")
+            record_llm_error(validation_error)
+            raise validation_error
+
+
+def _describe_validation_error(error: ValidationError) -> str:
+    """First error of a failed parse on one line, e.g. 'json_invalid at root: Invalid JSON: ...'."""
+    first = error.errors(include_url=False)[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{first['type']} at {location or 'root'}: {first['msg']}"
@@ -0,0 +1,73 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class FleetGroupSavings(BaseModel):
+    group: Dict[str, str] = Field(description="Value of each group_by dimension (\"unknown\" when unset)")
+    homes: int = Field(description="Homes in the group")
+    homes_with_advice: int = Field(description="Homes whose latest advice includes a savings estimate")
+    total_annual_savings: float = Field(description="Sum of estimated annual savings in EUR")
+    total_investment: float = Field(description="Sum of estimated implementation costs in EUR")
+    median_payback_years: Optional[float] = Field(default=None, description="Median of investment / annual savings")
+
+
+class FleetSavingsResponse(BaseModel):
+    data_version: str = Field(description="Changes whenever homes or advice change")
+    group_by: List[str]
+    total_homes: int = Field(description="Homes matching the filters")
+    groups: List[FleetGroupSavings] = Field(description="Groups ordered by total annual savings, highest first")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "data_version": "1200:2026-01-05 10:30:00:950:2026-01-05 11:02:13",
+                "group_by": ["climate_zone", "heating_type"],
+                "total_homes": 1200,
+                "groups": [
+                    {
+                        "group": {"climate_zone": "cold", "heating_type": "oil"},
+                        "homes": 140,
+                        "homes_with_advice": 121,
+                        "total_annual_savings": 251340.0,
+                        "total_investment": 2140500.0,
+                        "median_payback_years": 7.9
+                    }
+                ]
+            }
+        }
+
+
+class PaybackBucket(BaseModel):
+    min_years: float
+    max_years: Optional[float] = Field(default=None, description="Exclusive upper bound; null for the open-ended last bucket")
+    homes: int
+
+
+class PaybackDistributionResponse(BaseModel):
+    data_version: str
+    total_homes: int = Field(description="Homes matching the filters")
+    homes_with_payback: int = Field(description="Homes with both a cost and a savings estimate")
+    mean_payback_years: Optional[float] = None
+    percentiles: Dict[str, Optional[float]] = Field(description="Payback in years by percentile, e.g. p50")
+    histogram: List[PaybackBucket]
+
+
+class PriceScenarioGroup(BaseModel):
+    group: Dict[str, str]
+    homes: int
+    annual_energy_cost_before: float = Field(description="Sum of reported annual energy costs in EUR")
+    annual_energy_cost_after: float
+    annual_savings_before: float = Field(description="Sum of estimated annual savings in EUR")
+    annual_savings_after: float
+    median_payback_years_before: Optional[float] = None
+    median_payback_years_after: Optional[float] = None
+    homes_within_threshold_before: int = Field(description="Homes whose payback is at most payback_threshold_years")
+    homes_within_threshold_after: int
+
+
+class PriceScenarioResponse(BaseModel):
+    data_version: str
+    price_change_pct: float
+    payback_threshold_years: float
+    group_by: List[str]
+    groups: List[PriceScenarioGroup] = Field(description="Groups ordered by current annual savings, highest first")
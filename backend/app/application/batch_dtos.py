@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from app.domain.entities import BatchJobStatus, BatchItemStatus
+from app.application.advice_dtos import EnergyAdviceResponse
+from app.constants import BATCH_MAX_HOMES
+
+
+class CreateBatchRequest(BaseModel):
+    home_ids: List[str] = Field(
+        min_length=1,
+        max_length=BATCH_MAX_HOMES,
+        description="IDs of the home profiles to generate advice for"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "home_ids": [
+                    "123e4567-e89b-12d3-a456-426614174000",
+                    "123e4567-e89b-12d3-a456-426614174001"
+                ]
+            }
+        }
+
+
+class BatchJobResponse(BaseModel):
+    id: str = Field(description="Unique identifier of the batch job")
+    status: BatchJobStatus = Field(description="pending, running or completed")
+    total_items: int = Field(description="Number of homes in the job")
+    completed_items: int = Field(description="Homes with generated advice")
+    failed_items: int = Field(description="Homes whose advice generation failed")
+    progress: float = Field(description="Fraction of items finished, from 0.0 to 1.0")
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": "9b2f7c1e-4d5a-4e8b-9c3d-2a1b0c9d8e7f",
+                "status": "running",
+                "total_items": 1000,
+                "completed_items": 412,
+                "failed_items": 3,
+                "progress": 0.415,
+                "created_at": "2025-12-30T10:30:00Z",
+                "updated_at": "2025-12-30T10:42:00Z"
+            }
+        }
+
+
+class BatchItemResponse(BaseModel):
+    position: int = Field(description="Index of the home in the submitted list")
+    home_id: str
+    status: BatchItemStatus = Field(description="pending, completed or failed")
+    advice: Optional[EnergyAdviceResponse] = Field(default=None, description="Generated advice, once completed")
+    error: Optional[str] = Field(default=None, description="Reason the item failed")
+    completed_at: Optional[datetime] = None
+
+
+class BatchResultsResponse(BaseModel):
+    job_id: str
+    offset: int
+    limit: int
+    items: List[BatchItemResponse]
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from collections import defaultdict, deque
+from typing import AsyncContextManager, Callable, Deque, Dict, List, NamedTuple, Optional
+from app.domain.entities import BatchJob, BatchJobItem
+from app.domain.repositories import BatchJobRepository
+from app.domain.exceptions import (
+    HomeNotFoundError,
+    LLMConnectionError,
+    LLMProviderError,
+    LLMServiceUnavailableError,
+    LLMTimeoutError,
+    LLMValidationError
+)
+from app.application.advice_service import EnergyAdviceService
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Item errors are part of the job's public status: fixed user-facing reasons, never provider messages
+HOME_NOT_FOUND_REASON = "Home profile not found"
+LLM_ERROR_REASONS = {
+    LLMTimeoutError: "The AI service took too long to respond",
+    LLMConnectionError: "The AI service was unavailable",
+    LLMServiceUnavailableError: "The AI service was unavailable",
+    LLMValidationError: "Unable to process the AI response"
+}
+UNEXPECTED_ERROR_REASON = "Unable to generate recommendations"
+
+
+class BatchScope(NamedTuple):
+    """Repositories and services bound to one database session."""
+    job_repository: BatchJobRepository
+    advice_service: EnergyAdviceService
+
+
+class BatchAdviceScheduler:
+    """
+    Runs batch advice jobs on a fixed pool of workers.
+
+    At most max_concurrency generations are in flight at once, matching the
+    number of requests Ollama serves in parallel. Jobs are served round-robin,
+    one item per turn, so a large job cannot starve jobs submitted after it.
+    Progress lives in the database: on start, unfinished jobs are resumed and
+    only their pending items are generated.
+    """
+
+    def __init__(self, scope_factory: Callable[[], AsyncContextManager[BatchScope]], max_concurrency: int):
+        self._scope_factory = scope_factory
+        self.max_concurrency = max_concurrency
+        self._queues: Dict[str, Deque[BatchJobItem]] = {}
+        self._ready_jobs: Deque[str] = deque()
+        self._work_available = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self._subscribers: Dict[str, List[asyncio.Queue]] = defaultdict(list)
+        self.active_items = 0
+
+    @property
+    def queued_items(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def start(self) -> None:
+        async with self._scope_factory() as scope:
+            for job in await scope.job_repository.list_unfinished():
+                pending_items = await scope.job_repository.get_pending_items(job.id)
+                if pending_items:
+                    logger.info(f"Resuming batch job {job.id}: {len(pending_items)} of {job.total_items} items pending")
+                self._enqueue(job.id, pending_items)
+
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)]
+        logger.info(f"Batch scheduler started with {self.max_concurrency} workers")
+
+    async def stop(self) -> None:
+        # Items being generated stay pending in the database and resume on next start
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, home_ids: List[str]) -> BatchJob:
+        async with self._scope_factory() as scope:
+            job = await scope.job_repository.create(home_ids)
+
+        self._enqueue(job.id, [
+            BatchJobItem(job_id=job.id, position=position, home_id=home_id)
+            for position, home_id in enumerate(home_ids)
+        ])
+        logger.info(f"Batch job {job.id} submitted with {job.total_items} homes")
+        return job
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Queue receiving each item of the job as soon as it finishes."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers[job_id].append(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(job_id, [])
+        if queue in subscribers:
+            subscribers.remove(queue)
+        if not subscribers:
+            self._subscribers.pop(job_id, None)
+
+    def _enqueue(self, job_id: str, items: List[BatchJobItem]) -> None:
+        if not items:
+            return
+        self._queues[job_id] = deque(items)
+        self._ready_jobs.append(job_id)
+        self._work_available.set()
+
+    async def _next_item(self) -> BatchJobItem:
+        while not self._ready_jobs:
+            self._work_available.clear()
+            await self._work_available.wait()
+
+        job_id = self._ready_jobs.popleft()
+        queue = self._queues[job_id]
+        item = queue.popleft()
+        if queue:
+            # Back of the line: every other job gets a turn first
+            self._ready_jobs.append(job_id)
+        else:
+            del self._queues[job_id]
+        return item
+
+    async def _worker(self) -> None:
+        while True:
+            item = await self._next_item()
+            self.active_items += 1
+            try:
+                finished_item = await self._process(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"Unexpected error processing item {item.position} of batch job {item.job_id}: {str(e)}",
+                    exc_info=True
+                )
+                # Failed rather than left pending, so the job still completes
+                finished_item = await self._fail_unexpectedly(item)
+                if finished_item is None:
+                    continue
+            finally:
+                self.active_items -= 1
+
+            for queue in self._subscribers.get(item.job_id, []):
+                queue.put_nowait(finished_item)
+
+    async def _process(self, item: BatchJobItem) -> BatchJobItem:
+        async with self._scope_factory() as scope:
+            error: Optional[str] = None
+            try:
+                # Stored results should be LLM advice; a failed item can be regenerated later
+                advice = await scope.advice_service.generate_advice(item.home_id, allow_fallback=False)
+            except HomeNotFoundError:
+                error = HOME_NOT_FOUND_REASON
+            except LLMProviderError as e:
+                logger.warning(f"Batch job {item.job_id} item {item.position} failed: {str(e)}")
+                error = LLM_ERROR_REASONS.get(type(e), UNEXPECTED_ERROR_REASON)
+            else:
+                return await scope.job_repository.complete_item(item.job_id, item.position, advice)
+
+            return await scope.job_repository.fail_item(item.job_id, item.position, error)
+
+    async def _fail_unexpectedly(self, item: BatchJobItem) -> Optional[BatchJobItem]:
+        """Mark an item failed after an unexpected error; None if even that fails (it then stays pending)."""
+        try:
+            async with self._scope_factory() as scope:
+                return await scope.job_repository.fail_item(item.job_id, item.position, UNEXPECTED_ERROR_REASON)
+        except Exception as e:
+            logger.error(
+                f"Failed to record failure of item {item.position} of batch job {item.job_id}: {str(e)}",
+                exc_info=True
+            )
+            return None
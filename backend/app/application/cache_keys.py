@@ -0,0 +1,44 @@
+import hashlib
+import json
+from typing import Any
+from app.domain.entities import HomeProfile
+from app.constants import PROMPT_VERSION
+
+# Identity and bookkeeping fields never reach the prompt, so they must not affect the key
+NON_PROMPT_FIELDS = {"id", "created_at", "updated_at"}
+
+# The prompt omits these when they are 0, so 0 and None produce the same advice
+OMITTED_WHEN_ZERO_FIELDS = {"avg_monthly_energy_cost", "avg_monthly_kwh"}
+
+# Decimal places the prompt renders each float field with
+RENDERED_DECIMALS = {"avg_monthly_energy_cost": 2, "avg_monthly_kwh": 1}
+
+
+def build_advice_cache_key(home: HomeProfile, model_name: str, prompt_version: str = PROMPT_VERSION) -> str:
+    """
+    Stable content hash of everything that determines the generated advice.
+
+    Two homes with different IDs but identical characteristics map to the same key.
+    """
+    profile = {
+        field: _normalize(field, value)
+        for field, value in home.model_dump(mode="json", exclude=NON_PROMPT_FIELDS).items()
+    }
+    material = json.dumps(
+        {"profile": profile, "model": model_name, "prompt_version": prompt_version},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _normalize(field: str, value: Any) -> Any:
+    """The value as far as the prompt can tell: values it renders the same map to the same key."""
+    if isinstance(value, str):
+        # Rendered stripped, and omitted when empty
+        return value.strip() or None
+    if field in OMITTED_WHEN_ZERO_FIELDS and not value:
+        return None
+    if field in RENDERED_DECIMALS and value is not None:
+        return round(value, RENDERED_DECIMALS[field])
+    return value
@@ -0,0 +1,338 @@
+"""
+Fleet-level savings analytics over every stored home.
+
+Homes and their latest advice are loaded once into a columnar FleetSnapshot of
+NumPy arrays; group-bys, percentiles and what-if scenarios are then computed
+with vectorized operations. Snapshots and results are cached until the
+repository reports a new data version.
+"""
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.domain.entities import HomeFilter
+from app.domain.repositories import FleetRepository
+from app.application.analytics_dtos import (
+    FleetGroupSavings,
+    FleetSavingsResponse,
+    PaybackBucket,
+    PaybackDistributionResponse,
+    PriceScenarioGroup,
+    PriceScenarioResponse
+)
+from app.constants import FLEET_RESULT_CACHE_SIZE, FLEET_PAYBACK_PERCENTILES, FLEET_PAYBACK_BUCKET_EDGES
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Dimensions results can be grouped and filtered by
+GROUP_DIMENSIONS = ("climate_zone", "heating_type", "insulation_type", "budget_range", "country")
+UNKNOWN = "unknown"
+
+
+@dataclass(frozen=True)
+class FleetSnapshot:
+    """Columnar view of the fleet: one array entry per home."""
+    # Per dimension: sorted distinct labels and each home's index into them
+    labels: Dict[str, np.ndarray]
+    codes: Dict[str, np.ndarray]
+    size_sqft: np.ndarray
+    age_years: np.ndarray
+    annual_energy_cost: np.ndarray  # NaN when the home has no cost data
+    annual_savings: np.ndarray      # NaN when the home has no advice
+    investment: np.ndarray          # NaN when the advice has no cost estimates
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List[Any]]) -> "FleetSnapshot":
+        labels, codes = {}, {}
+        for dimension in GROUP_DIMENSIONS:
+            labels[dimension], codes[dimension] = _factorize(columns[dimension])
+        return cls(
+            labels=labels,
+            codes=codes,
+            size_sqft=np.asarray(columns["size_sqft"], dtype=np.float64),
+            age_years=np.asarray(columns["age_years"], dtype=np.float64),
+            annual_energy_cost=_to_float_array(columns["avg_monthly_energy_cost"]) * 12,
+            annual_savings=_to_float_array(columns["annual_savings"]),
+            investment=_to_float_array(columns["investment"])
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self.size_sqft)
+
+    def payback_years(self, savings_factor: float = 1.0) -> np.ndarray:
+        """Investment / annual savings per home; NaN unless both are positive."""
+        savings = self.annual_savings * savings_factor
+        valid = (savings > 0) & (self.investment > 0)
+        payback = np.full(self.size, np.nan)
+        np.divide(self.investment, savings, out=payback, where=valid)
+        return payback
+
+    def mask(self, filters: HomeFilter) -> np.ndarray:
+        selected = np.ones(self.size, dtype=bool)
+        for dimension in GROUP_DIMENSIONS:
+            value = getattr(filters, dimension, None)
+            if value is not None:
+                # A label that does not occur matches no home
+                position = np.searchsorted(self.labels[dimension], value)
+                found = position < len(self.labels[dimension]) and self.labels[dimension][position] == value
+                selected &= (self.codes[dimension] == position) if found else False
+        for column, low, high in (
+            (self.size_sqft, filters.min_size_sqft, filters.max_size_sqft),
+            (self.age_years, filters.min_age_years, filters.max_age_years),
+        ):
+            if low is not None:
+                selected &= column >= low
+            if high is not None:
+                selected &= column <= high
+        return selected
+
+    def group(self, selected: np.ndarray, group_by: Sequence[str]) -> Tuple[List[Dict[str, str]], np.ndarray]:
+        """Group the selected homes; returns one label dict per group and each selected home's group index."""
+        if not group_by:
+            return [{}], np.zeros(int(selected.sum()), dtype=np.intp)
+        # Mixed-radix key: one integer per home encodes its code in every dimension
+        keys = np.zeros(int(selected.sum()), dtype=np.int64)
+        for dimension in group_by:
+            keys = keys * len(self.labels[dimension]) + self.codes[dimension][selected]
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        groups = []
+        for key in unique_keys.tolist():
+            group = {}
+            for dimension in reversed(group_by):
+                key, code = divmod(key, len(self.labels[dimension]))
+                group[dimension] = str(self.labels[dimension][code])
+            groups.append({dimension: group[dimension] for dimension in group_by})
+        return groups, inverse.reshape(-1)
+
+
+def _factorize(values: List[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted distinct labels and each value's index into them (None becomes UNKNOWN)."""
+    labels = sorted({UNKNOWN if value is None else value for value in values})
+    index = {label: code for code, label in enumerate(labels)}
+    index[None] = index.get(UNKNOWN, 0)
+    codes = np.fromiter((index[value] for value in values), dtype=np.intp, count=len(values))
+    return np.array(labels, dtype=object), codes
+
+
+def _to_float_array(values: List[Optional[float]]) -> np.ndarray:
+    # None becomes NaN
+    return np.array(values, dtype=np.float64)
+
+
+def _group_sum(groups: np.ndarray, values: np.ndarray, count: int) -> np.ndarray:
+    return np.bincount(groups, weights=np.nan_to_num(values), minlength=count)
+
+
+def _group_count(groups: np.ndarray, valid: np.ndarray, count: int) -> np.ndarray:
+    return np.bincount(groups, weights=valid.astype(np.float64), minlength=count).astype(np.int64)
+
+
+def _group_median(groups: np.ndarray, values: np.ndarray, count: int) -> np.ndarray:
+    """Median per group ignoring NaN, via one lexsort instead of a Python loop over groups."""
+    valid = ~np.isnan(values)
+    groups, values = groups[valid], values[valid]
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    starts = np.searchsorted(groups, np.arange(count), side="left")
+    ends = np.searchsorted(groups, np.arange(count), side="right")
+    sizes = ends - starts
+    medians = np.full(count, np.nan)
+    present = sizes > 0
+    low = starts[present] + (sizes[present] - 1) // 2
+    high = starts[present] + sizes[present] // 2
+    medians[present] = (values[low] + values[high]) / 2
+    return medians
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+class FleetSnapshotCache:
+    """Latest snapshot plus memoized results, both valid for a single data version."""
+
+    def __init__(self, max_results: int = FLEET_RESULT_CACHE_SIZE):
+        self.max_results = max_results
+        self.version: Optional[str] = None
+        self.snapshot: Optional[FleetSnapshot] = None
+        self.results: "OrderedDict[str, Any]" = OrderedDict()
+        # Only one request rebuilds the snapshot after a change; the others wait for it
+        self.lock = asyncio.Lock()
+
+    def store(self, version: str, snapshot: FleetSnapshot) -> None:
+        self.version, self.snapshot = version, snapshot
+        self.results.clear()
+
+    def get_result(self, key: str) -> Any:
+        result = self.results.get(key)
+        if result is not None:
+            self.results.move_to_end(key)
+        return result
+
+    def set_result(self, key: str, result: Any) -> None:
+        self.results[key] = result
+        self.results.move_to_end(key)
+        while len(self.results) > self.max_results:
+            self.results.popitem(last=False)
+
+
+class FleetAnalyticsService:
+    def __init__(self, repository: FleetRepository, cache: FleetSnapshotCache):
+        self.repository = repository
+        self.cache = cache
+
+    async def savings_by_group(self, filters: HomeFilter, group_by: List[str]) -> FleetSavingsResponse:
+        """Total savings, investment and median payback per combination of group_by dimensions."""
+        def compute(snapshot: FleetSnapshot, version: str) -> FleetSavingsResponse:
+            selected = snapshot.mask(filters)
+            groups, index = snapshot.group(selected, group_by)
+            count = len(groups)
+            savings = snapshot.annual_savings[selected]
+            investment = snapshot.investment[selected]
+            homes = np.bincount(index, minlength=count)
+            with_advice = _group_count(index, ~np.isnan(savings), count)
+            total_savings = _group_sum(index, savings, count)
+            total_investment = _group_sum(index, investment, count)
+            median_payback = _group_median(index, snapshot.payback_years()[selected], count)
+            return FleetSavingsResponse(
+                data_version=version,
+                group_by=group_by,
+                total_homes=int(selected.sum()),
+                groups=[
+                    FleetGroupSavings(
+                        group=groups[i],
+                        homes=int(homes[i]),
+                        homes_with_advice=int(with_advice[i]),
+                        total_annual_savings=round(float(total_savings[i]), 2),
+                        total_investment=round(float(total_investment[i]), 2),
+                        median_payback_years=_optional(median_payback[i])
+                    )
+                    for i in np.argsort(-total_savings, kind="stable")
+                ]
+            )
+
+        return await self._cached("savings", {"filters": filters, "group_by": group_by}, compute)
+
+    async def payback_distribution(self, filters: HomeFilter) -> PaybackDistributionResponse:
+        """Payback percentiles and histogram for the selected homes."""
+        def compute(snapshot: FleetSnapshot, version: str) -> PaybackDistributionResponse:
+            selected = snapshot.mask(filters)
+            payback = snapshot.payback_years()[selected]
+            payback = payback[~np.isnan(payback)]
+            percentiles = (
+                np.percentile(payback, FLEET_PAYBACK_PERCENTILES) if len(payback)
+                else np.full(len(FLEET_PAYBACK_PERCENTILES), np.nan)
+            )
+            counts, edges = np.histogram(payback, bins=np.array(FLEET_PAYBACK_BUCKET_EDGES, dtype=np.float64))
+            return PaybackDistributionResponse(
+                data_version=version,
+                total_homes=int(selected.sum()),
+                homes_with_payback=len(payback),
+                mean_payback_years=_optional(payback.mean()) if len(payback) else None,
+                percentiles={f"p{pct}": _optional(value) for pct, value in zip(FLEET_PAYBACK_PERCENTILES, percentiles)},
+                histogram=[
+                    PaybackBucket(
+                        min_years=float(edges[i]),
+                        max_years=None if np.isinf(edges[i + 1]) else float(edges[i + 1]),
+                        homes=int(counts[i])
+                    )
+                    for i in range(len(counts))
+                ]
+            )
+
+        return await self._cached("payback", {"filters": filters}, compute)
+
+    async def price_scenario(
+        self,
+        filters: HomeFilter,
+        group_by: List[str],
+        price_change_pct: float,
+        payback_threshold_years: float
+    ) -> PriceScenarioResponse:
+        """
+        What-if on energy prices: bills and savings scale with the price, so paybacks
+        shorten (or lengthen) and more (or fewer) homes reach the payback threshold.
+        """
+        def compute(snapshot: FleetSnapshot, version: str) -> PriceScenarioResponse:
+            factor = 1 + price_change_pct / 100
+            selected = snapshot.mask(filters)
+            groups, index = snapshot.group(selected, group_by)
+            count = len(groups)
+            cost = snapshot.annual_energy_cost[selected]
+            savings = snapshot.annual_savings[selected]
+            payback_before = snapshot.payback_years()[selected]
+            payback_after = snapshot.payback_years(factor)[selected]
+            homes = np.bincount(index, minlength=count)
+            cost_before = _group_sum(index, cost, count)
+            savings_before = _group_sum(index, savings, count)
+            within_before = _group_count(index, payback_before <= payback_threshold_years, count)
+            within_after = _group_count(index, payback_after <= payback_threshold_years, count)
+            median_before = _group_median(index, payback_before, count)
+            median_after = _group_median(index, payback_after, count)
+            return PriceScenarioResponse(
+                data_version=version,
+                price_change_pct=price_change_pct,
+                payback_threshold_years=payback_threshold_years,
+                group_by=group_by,
+                groups=[
+                    PriceScenarioGroup(
+                        group=groups[i],
+                        homes=int(homes[i]),
+                        annual_energy_cost_before=round(float(cost_before[i]), 2),
+                        annual_energy_cost_after=round(float(cost_before[i] * factor), 2),
+                        annual_savings_before=round(float(savings_before[i]), 2),
+                        annual_savings_after=round(float(savings_before[i] * factor), 2),
+                        median_payback_years_before=_optional(median_before[i]),
+                        median_payback_years_after=_optional(median_after[i]),
+                        homes_within_threshold_before=int(within_before[i]),
+                        homes_within_threshold_after=int(within_after[i])
+                    )
+                    for i in np.argsort(-savings_before, kind="stable")
+                ]
+            )
+
+        params = {
+            "filters": filters,
+            "group_by": group_by,
+            "price_change_pct": price_change_pct,
+            "payback_threshold_years": payback_threshold_years
+        }
+        return await self._cached("price_scenario", params, compute)
+
+    async def _cached(
+        self,
+        name: str,
+        params: Dict[str, Any],
+        compute: Callable[[FleetSnapshot, str], Any]
+    ) -> Any:
+        version, snapshot = await self._get_snapshot()
+        key = json.dumps(
+            [name, {k: v.model_dump() if isinstance(v, HomeFilter) else v for k, v in params.items()}],
+            sort_keys=True
+        )
+        result = self.cache.get_result(key)
+        if result is None or self.cache.version != version:
+            # Vectorized, but still O(fleet size): keep it off the event loop
+            result = await asyncio.to_thread(compute, snapshot, version)
+            if self.cache.version == version:
+                self.cache.set_result(key, result)
+        return result
+
+    async def _get_snapshot(self) -> Tuple[str, FleetSnapshot]:
+        version = await self.repository.get_data_version()
+        if self.cache.version == version and self.cache.snapshot is not None:
+            return version, self.cache.snapshot
+
+        async with self.cache.lock:
+            if self.cache.version == version and self.cache.snapshot is not None:
+                return version, self.cache.snapshot
+            logger.info(f"Rebuilding fleet analytics snapshot for data version {version}")
+            columns = await self.repository.load_columns()
+            snapshot = await asyncio.to_thread(FleetSnapshot.from_columns, columns)
+            self.cache.store(version, snapshot)
+            return version, snapshot
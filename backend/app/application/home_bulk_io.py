@@ -0,0 +1,94 @@
+"""Incremental NDJSON/CSV parsing and serialization for bulk home import/export."""
+import codecs
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional
+from app.application.home_dtos import HomeResponse
+
+# Column order for CSV export (and the header expected on import)
+CSV_FIELDS: List[str] = list(HomeResponse.model_fields)
+
+
+class ImportRow(NamedTuple):
+    row: int  # 1-based data row; the CSV header is not counted
+    data: Optional[Dict[str, Any]]
+    error: Optional[str] = None
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into text lines without holding more than one line in memory."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[ImportRow]:
+    row = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield ImportRow(row, None, f"Invalid JSON: {e.msg}")
+            continue
+        if not isinstance(data, dict):
+            yield ImportRow(row, None, "Each line must be a JSON object")
+            continue
+        yield ImportRow(row, data)
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[ImportRow]:
+    header: Optional[List[str]] = None
+    row = 0
+    record = ""
+    async for line in iter_lines(chunks):
+        # A quoted field may contain newlines; a record is complete once its quotes are balanced
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            continue
+        fields, record = next(csv.reader([record])), ""
+
+        if header is None:
+            header = [name.strip() for name in fields]
+            continue
+        if not any(value.strip() for value in fields):
+            continue
+
+        row += 1
+        if len(fields) != len(header):
+            yield ImportRow(row, None, f"Expected {len(header)} columns, got {len(fields)}")
+            continue
+        # Empty cells mean "not provided" so optional fields fall back to their defaults
+        yield ImportRow(row, {name: value for name, value in zip(header, fields) if value.strip() != ""})
+
+    if record:
+        yield ImportRow(row + 1, None, "Unterminated quoted field")
+
+
+def to_ndjson_line(home: HomeResponse) -> str:
+    return home.model_dump_json() + "\n"
+
+
+def csv_header() -> str:
+    return _format_csv_row(CSV_FIELDS)
+
+
+def to_csv_line(home: HomeResponse) -> str:
+    data = home.model_dump(mode="json")
+    return _format_csv_row(["" if data[field] is None else data[field] for field in CSV_FIELDS])
+
+
+def _format_csv_row(values: List[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(values)
+    return buffer.getvalue()
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from app.domain.entities import (
     HeatingType, 
@@ -74,6 +74,52 @@ class CreateHomeRequest(BaseModel):
         }
 
 
+class UpdateHomeRequest(BaseModel):
+    """
+    Partial update (PATCH): only the fields present in the body change. null clears an optional
+    field; the merged profile is validated like CreateHomeRequest.
+    """
+    # Basic Information
+    size_sqft: Optional[int] = Field(default=None, gt=0, le=50000, description="Home size in square feet")
+    age_years: Optional[int] = Field(default=None, ge=0, le=300, description="Age of the home in years")
+    heating_type: Optional[HeatingType] = Field(default=None, description="Type of heating system")
+    insulation_type: Optional[InsulationType] = Field(default=None, description="Quality of insulation")
+    window_type: Optional[WindowType] = Field(default=None, description="Type of windows")
+    num_floors: Optional[int] = Field(default=None, ge=1, le=10, description="Number of floors")
+    num_occupants: Optional[int] = Field(default=None, ge=1, le=20, description="Number of occupants")
+    has_basement: Optional[bool] = Field(default=None, description="Whether the home has a basement")
+    has_attic: Optional[bool] = Field(default=None, description="Whether the home has an attic")
+    has_solar_panels: Optional[bool] = Field(default=None, description="Whether the home has solar panels")
+    has_smart_thermostat: Optional[bool] = Field(default=None, description="Whether the home has a smart thermostat")
+
+    # Advanced - Location & Climate
+    country: Optional[str] = Field(default=None, max_length=100, description="Country")
+    zip_code: Optional[str] = Field(default=None, max_length=10, description="Zip code for climate considerations")
+    climate_zone: Optional[ClimateZone] = Field(default=None, description="Climate zone classification")
+
+    # Advanced - Energy Details
+    primary_energy_source: Optional[EnergySource] = Field(default=None, description="Primary energy source")
+    avg_monthly_energy_cost: Optional[float] = Field(default=None, ge=0, description="Average monthly energy cost in EUR")
+    avg_monthly_kwh: Optional[float] = Field(default=None, ge=0, description="Average monthly electricity consumption in kWh")
+    hvac_age_years: Optional[int] = Field(default=None, ge=0, le=50, description="Age of HVAC system")
+
+    # Advanced - Building Characteristics
+    roof_type: Optional[RoofType] = Field(default=None, description="Type of roof")
+    roof_age_years: Optional[int] = Field(default=None, ge=0, le=100, description="Age of roof")
+
+    # Advanced - Preferences
+    budget_range: Optional[BudgetRange] = Field(default=None, description="Budget range for improvements")
+    planning_to_sell_years: Optional[int] = Field(default=None, ge=0, le=50, description="Planning to sell within this many years")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "window_type": "triple_pane",
+                "hvac_age_years": 1
+            }
+        }
+
+
 class HomeResponse(BaseModel):
     id: str
     # Basic Information
@@ -144,6 +190,37 @@ class HomeResponse(BaseModel):
         }
 
 
+class HomeListResponse(BaseModel):
+    items: List[HomeResponse] = Field(description="Homes ordered by creation time")
+    limit: int = Field(description="Requested page size")
+    next_cursor: Optional[str] = Field(default=None, description="Pass as cursor to fetch the next page; null on the last page")
+
+
+class HomeImportRowError(BaseModel):
+    row: int = Field(description="1-based data row in the uploaded file (CSV header not counted)")
+    errors: List[str] = Field(description="Validation errors for the row")
+
+
+class HomeImportResponse(BaseModel):
+    imported: int = Field(description="Number of home profiles created")
+    failed: int = Field(description="Number of rows rejected")
+    errors: List[HomeImportRowError] = Field(description="Per-row errors (capped; see errors_truncated)")
+    errors_truncated: bool = Field(default=False, description="Whether more rows failed than are listed in errors")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "imported": 99998,
+                "failed": 2,
+                "errors": [
+                    {"row": 17, "errors": ["size_sqft: Input should be greater than 0"]},
+                    {"row": 342, "errors": ["Invalid JSON: Expecting value"]}
+                ],
+                "errors_truncated": False
+            }
+        }
+
+
 class ErrorResponse(BaseModel):
     error: str
     detail: Optional[str] = None
@@ -1,7 +1,25 @@
-from typing import Optional
-from app.domain.entities import HomeProfile
+import base64
+import binascii
+import json
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Collection, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from app.domain.entities import HomeProfile, HomeFilter
 from app.domain.repositories import HomeRepository
-from app.application.home_dtos import CreateHomeRequest, HomeResponse
+from app.domain.exceptions import DomainError, HomeNotFoundError, HomeVersionConflictError
+from app.application.home_dtos import (
+    CreateHomeRequest,
+    HomeResponse,
+    HomeListResponse,
+    HomeImportResponse,
+    HomeImportRowError
+)
+from app.application.home_bulk_io import ImportRow
+from app.constants import HOME_IMPORT_CHUNK_SIZE, HOME_IMPORT_MAX_REPORTED_ERRORS, HOME_EXPORT_BATCH_SIZE
+
+# Configure logger
+logger = logging.getLogger(__name__)
 
 
 class HomeService:
@@ -18,3 +36,130 @@ class HomeService:
         if home:
             return HomeResponse(**home.model_dump())
         return None
+
+    async def update_home(
+        self,
+        home_id: str,
+        changes: Dict[str, Any],
+        if_match: Optional[Collection[datetime]] = None
+    ) -> HomeResponse:
+        """
+        Apply changes (all fields for a replace, the given ones for a partial update).
+
+        With if_match, the home must still be at one of those versions (its updated_at), or
+        HomeVersionConflictError is raised and nothing is written. Raises HomeNotFoundError,
+        or ValidationError when the resulting profile is invalid.
+        """
+        current = await self._get_current(home_id, if_match)
+        merged = {**current.model_dump(exclude={"id", "created_at", "updated_at"}), **changes}
+        profile = HomeProfile(**CreateHomeRequest.model_validate(merged).model_dump())
+        changed = {field for field in changes if getattr(profile, field) != getattr(current, field)}
+        if not changed:
+            # Nothing to write: updated_at, and with it the ETag, stays the same
+            return HomeResponse(**current.model_dump())
+
+        # Only the changed fields are written, so a concurrent update of other fields is not undone
+        update = HomeProfile.model_construct(id=home_id, **profile.model_dump(include=changed))
+        updated_home = await self.repository.update(
+            update,
+            expected_updated_at=current.updated_at if if_match is not None else None
+        )
+        logger.info(f"Updated home {home_id}: {', '.join(sorted(changed))}")
+        return HomeResponse(**updated_home.model_dump())
+
+    async def delete_home(self, home_id: str, if_match: Optional[Collection[datetime]] = None) -> None:
+        """Delete a home and its advice; raises like update_home."""
+        current = await self._get_current(home_id, if_match)
+        deleted = await self.repository.delete(
+            home_id,
+            expected_updated_at=current.updated_at if if_match is not None else None
+        )
+        if not deleted:
+            raise HomeNotFoundError(home_id)
+        logger.info(f"Deleted home {home_id}")
+
+    async def list_homes(self, filters: HomeFilter, cursor: Optional[str] = None, limit: int = 50) -> HomeListResponse:
+        """Return one page of homes; raises ValueError for a malformed cursor."""
+        after = self._decode_cursor(cursor) if cursor else None
+        # One extra row tells us whether another page exists without a COUNT(*)
+        homes = await self.repository.list_page(filters, after=after, limit=limit + 1)
+        has_more = len(homes) > limit
+        homes = homes[:limit]
+        return HomeListResponse(
+            items=[HomeResponse(**home.model_dump()) for home in homes],
+            limit=limit,
+            next_cursor=self._encode_cursor(homes[-1]) if has_more else None
+        )
+
+    async def import_homes(self, rows: AsyncIterator[ImportRow]) -> HomeImportResponse:
+        """
+        Validate rows through CreateHomeRequest and insert them in chunks, one
+        transaction per chunk. Only the current chunk is held in memory.
+        """
+        result = HomeImportResponse(imported=0, failed=0, errors=[])
+        chunk: List[Tuple[int, HomeProfile]] = []
+
+        async for row in rows:
+            if row.error:
+                self._record_failure(result, row.row, [row.error])
+                continue
+            try:
+                request = CreateHomeRequest.model_validate(row.data)
+            except ValidationError as e:
+                self._record_failure(result, row.row, [
+                    f"{' -> '.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                    for error in e.errors()
+                ])
+                continue
+
+            chunk.append((row.row, HomeProfile(**request.model_dump())))
+            if len(chunk) >= HOME_IMPORT_CHUNK_SIZE:
+                await self._store_chunk(result, chunk)
+                chunk = []
+
+        if chunk:
+            await self._store_chunk(result, chunk)
+
+        logger.info(f"Home import finished: {result.imported} imported, {result.failed} failed")
+        return result
+
+    async def export_homes(self) -> AsyncIterator[HomeResponse]:
+        async for home in self.repository.stream_all(batch_size=HOME_EXPORT_BATCH_SIZE):
+            yield HomeResponse(**home.model_dump())
+
+    async def _get_current(self, home_id: str, if_match: Optional[Collection[datetime]]) -> HomeProfile:
+        home = await self.repository.get_by_id(home_id)
+        if not home:
+            raise HomeNotFoundError(home_id)
+        if if_match is not None and home.updated_at not in if_match:
+            raise HomeVersionConflictError(home_id, home.updated_at)
+        return home
+
+    @staticmethod
+    def _encode_cursor(home: HomeProfile) -> str:
+        key = json.dumps([home.created_at.isoformat(), home.id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            created_at, home_id = json.loads(raw)
+            return datetime.fromisoformat(created_at), str(home_id)
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+
+    async def _store_chunk(self, result: HomeImportResponse, chunk: List[Tuple[int, HomeProfile]]) -> None:
+        try:
+            result.imported += await self.repository.create_many([home for _, home in chunk])
+        except DomainError:
+            # The whole chunk was rolled back; earlier chunks stay committed
+            for row_number, _ in chunk:
+                self._record_failure(result, row_number, ["Failed to store row"])
+
+    def _record_failure(self, result: HomeImportResponse, row_number: int, errors: List[str]) -> None:
+        result.failed += 1
+        if len(result.errors) < HOME_IMPORT_MAX_REPORTED_ERRORS:
+            result.errors.append(HomeImportRowError(row=row_number, errors=errors))
+        else:
+            result.errors_truncated = True
@@ -1,15 +1,29 @@
 from app.domain.entities import HomeProfile
 from app.infrastructure.llm.types import ChatMessage
+from app.application.prompt_templates import (
+    SYSTEM_MESSAGE,
+    OUTPUT_FORMAT_INSTRUCTIONS,
+    RESPONSE_SCHEMA_HEADER,
+    get_energy_advice_prompt_template
+)
 from typing import Optional, List
+import json
 
 
 class EnergyAdvicePromptBuilder:
-    """Builder pattern for constructing energy advice prompts with fluent interface."""
+    """
+    Builder pattern for constructing energy advice prompts with fluent interface.
+
+    Static sections (system context, output format) go into the system message and
+    per-request sections into the user message, with the home details always last,
+    so that every prompt starts with the same prefix.
+    """
     
     def __init__(self):
-        self._system_message: Optional[str] = None
+        self._system_parts: List[str] = []
         self._user_parts: List[str] = []
         self._home: Optional[HomeProfile] = None
+        self._include_home_details = False
         
     def with_home_profile(self, home: HomeProfile) -> 'EnergyAdvicePromptBuilder':
         """Set the home profile for the prompt."""
@@ -18,7 +32,7 @@ class EnergyAdvicePromptBuilder:
     
     def add_system_context(self) -> 'EnergyAdvicePromptBuilder':
         """Add the expert system context."""
-        self._system_message = self.build_system_message()
+        self._system_parts.append(self.build_system_message())
         return self
     
     def add_home_details(self) -> 'EnergyAdvicePromptBuilder':
@@ -26,36 +40,18 @@ class EnergyAdvicePromptBuilder:
         if not self._home:
             raise ValueError("Home profile must be set before adding details")
         
-        self._user_parts.append(str(self._home))
+        # Rendered last by build_messages
+        self._include_home_details = True
         return self
     
     def add_output_format_instructions(self) -> 'EnergyAdvicePromptBuilder':
-        """Add instructions for the expected output format."""
-        instructions = """
-Based on this information, provide a comprehensive energy efficiency analysis with the following structure:
-
-1. SUMMARY: A brief 2-3 sentence overview of the home's current energy efficiency status and potential for improvement. Include the estimated total annual savings if all recommendations are implemented.
-
-2. RECOMMENDATIONS: Provide 5-8 prioritized recommendations in the JSON format added to the input (return ONLY valid JSON, no markdown)
-
-IMPORTANT GUIDELINES:
-- Prioritize recommendations by impact and cost-effectiveness
-- Consider the home's age and current features when making suggestions
-- Provide realistic cost estimates and savings projections
-- Include both quick wins (low-cost, high-impact) and long-term investments
-- Make recommendations specific to this home's characteristics
-- Ensure all recommendations are actionable and practical
-- Return ONLY valid JSON, no markdown formatting, no code blocks
-- All numeric values should be numbers, not strings
-- Provide details for all properties of the response model
-- For financial properties (costs, savings, payback period): Always provide valid positive values greater than 0 (e.g., use 1.0 instead of 0.0 or null) when the schema requires gt > 0
-- Perform mathematical calculations and fill in property values (estimated_savings_annual for each recommendation, estimated_total_annual_savings for EnergyAdvice) based on the logic provided in the schema descriptions"""
-        
-        self._user_parts.append(instructions)
+        """Add instructions and the response schema for the expected output format."""
+        schema = json.dumps(get_energy_advice_prompt_template().response_schema, sort_keys=True)
+        self._system_parts.append(f"{OUTPUT_FORMAT_INSTRUCTIONS}\n\n{RESPONSE_SCHEMA_HEADER}\n{schema}")
         return self
     
     def add_custom_section(self, section: str) -> 'EnergyAdvicePromptBuilder':
-        """Add a custom section to the user prompt."""
+        """Add a custom section to the user prompt, ahead of the home details."""
         self._user_parts.append(section)
         return self
     
@@ -64,22 +60,23 @@ IMPORTANT GUIDELINES:
         if not self._home:
             raise ValueError("Home profile must be set before building messages")
         
-        if not self._user_parts:
+        user_parts = self._user_parts + ([str(self._home)] if self._include_home_details else [])
+        if not user_parts:
             raise ValueError("User message must have at least one section")
         
         messages = []
         
         # Add system message if present
-        if self._system_message:
+        if self._system_parts:
             messages.append(ChatMessage(
                 role="system",
-                content=self._system_message
+                content="\n".join(self._system_parts)
             ))
         
         # Add user message
         messages.append(ChatMessage(
             role="user",
-            content="\n".join(self._user_parts)
+            content="\n".join(user_parts)
         ))
         
         return messages
@@ -92,31 +89,18 @@ IMPORTANT GUIDELINES:
     
     def reset(self) -> 'EnergyAdvicePromptBuilder':
         """Reset the builder for reuse."""
-        self._system_message = None
+        self._system_parts = []
         self._user_parts = []
         self._home = None
+        self._include_home_details = False
         return self
     
     @staticmethod
     def build_prompt(home: HomeProfile) -> List[ChatMessage]:
         """Convenience method for building messages in chat format."""
-        return (EnergyAdvicePromptBuilder()
-                .with_home_profile(home)
-                .add_system_context()
-                .add_home_details()
-                .add_output_format_instructions()
-                .build_messages())
+        return get_energy_advice_prompt_template().render(home)
     
     @staticmethod
     def build_system_message() -> str:
         """Build the system message for the LLM."""
-        return """You are an expert energy efficiency consultant with deep knowledge of:
-- Building science and thermal dynamics
-- HVAC systems and heating/cooling efficiency
-- Insulation materials and techniques
-- Renewable energy systems
-- Energy-efficient appliances and technologies
-- Cost-benefit analysis for energy improvements
-- Regional climate considerations
-
-Provide accurate, practical, and cost-effective recommendations tailored to each home's unique characteristics."""
+        return SYSTEM_MESSAGE
@@ -0,0 +1,147 @@
+"""
+Compiled prompt template for energy advice.
+
+Everything that does not depend on the home (system message, output instructions,
+compact generation JSON schema) is built once per process into a single system message that
+is byte-identical for every request, and the home details follow it in the user
+message. The LLM server can then reuse its cached evaluation of the whole static
+prefix (Ollama keeps it per slot) and only evaluates the home details per request.
+"""
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List
+from app.domain.entities import HomeProfile
+from app.application.advice_parsing import generation_schema
+from app.application.advice_refresh import ProfileChange
+from app.domain.value_objects import RecommendationCategory
+from app.infrastructure.llm.types import ChatMessage
+from app.constants import PROMPT_VERSION
+
+SYSTEM_MESSAGE = """You are an expert energy efficiency consultant with deep knowledge of:
+- Building science and thermal dynamics
+- HVAC systems and heating/cooling efficiency
+- Insulation materials and techniques
+- Renewable energy systems
+- Energy-efficient appliances and technologies
+- Cost-benefit analysis for energy improvements
+- Regional climate considerations
+
+Provide accurate, practical, and cost-effective recommendations tailored to each home's unique characteristics."""
+
+OUTPUT_FORMAT_INSTRUCTIONS = """
+Based on the home profile in the user message, provide a comprehensive energy efficiency analysis with the following structure:
+
+1. SUMMARY: A brief 2-3 sentence overview of the home's current energy efficiency status and potential for improvement. Include the estimated total annual savings if all recommendations are implemented.
+
+2. RECOMMENDATIONS: Provide 5-8 prioritized recommendations in the JSON format defined by the response schema below (return ONLY valid JSON, no markdown)
+
+IMPORTANT GUIDELINES:
+- Prioritize recommendations by impact and cost-effectiveness
+- Consider the home's age and current features when making suggestions
+- Provide realistic cost estimates and savings projections
+- Include both quick wins (low-cost, high-impact) and long-term investments
+- Make recommendations specific to this home's characteristics
+- Ensure all recommendations are actionable and practical
+- Return ONLY valid JSON, no markdown formatting, no code blocks
+- All numeric values should be numbers, not strings
+- Provide details for all properties of the response schema
+- title is a brief title and description a detailed description of the recommendation
+- Amounts are in EUR: estimated_cost is the implementation cost, estimated_savings_annual the annual savings; payback_period_years is in years
+- For financial properties (costs, savings, payback period): Always provide valid positive values greater than 0 (e.g., use 1.0 instead of 0.0 or null)
+- Calculate estimated_savings_annual = estimated_cost / payback_period_years for each recommendation, and estimated_total_annual_savings as the sum of estimated_savings_annual over all recommendations"""
+
+
+RESPONSE_SCHEMA_HEADER = "Response JSON schema:"
+
+CONTINUATION_INSTRUCTIONS = """Your previous response was cut off before the JSON was complete. These recommendations were received in full and must not be repeated: {titles}.
+Return a new, complete JSON object in the same format with only the remaining recommendations, followed by a summary that covers all recommendations. Keep descriptions brief so the response fits."""
+
+REFRESH_INSTRUCTIONS = """The home profile above changed since the previous advice ({changes}). Only recommendations in these categories need to be redone: {categories}.
+Return a complete JSON object in the same format with 1-4 recommendations for the updated home, all in those categories. These recommendations from the previous advice are kept and must not be repeated: {titles}.
+The summary and estimated_total_annual_savings must cover the kept and the new recommendations together."""
+
+
+class CompiledPromptTemplate:
+    """Immutable prompt template; render() is the only per-request work."""
+
+    def __init__(
+        self,
+        system_message: str,
+        instructions: str,
+        response_schema: Dict[str, Any],
+        prompt_version: str,
+        continuation_instructions: str = CONTINUATION_INSTRUCTIONS,
+        refresh_instructions: str = REFRESH_INSTRUCTIONS
+    ):
+        self.system_message = ChatMessage(
+            role="system",
+            content=build_static_prompt(system_message, instructions, response_schema)
+        )
+        # The start of every conversation that does not depend on the home; warm-up primes the LLM's prompt cache with it
+        self.prefix_messages = [self.system_message]
+        self.continuation_instructions = continuation_instructions
+        self.refresh_instructions = refresh_instructions
+        # Shared by every request: callers must treat it as read-only
+        self.response_schema = response_schema
+        fingerprint = hashlib.sha256(
+            json.dumps(
+                [system_message, instructions, response_schema, continuation_instructions, refresh_instructions],
+                sort_keys=True
+            ).encode("utf-8")
+        ).hexdigest()
+        # Editing the text or the schema changes the version even if PROMPT_VERSION is not bumped
+        self.version = f"{prompt_version}-{fingerprint[:12]}"
+
+    def render(self, home: HomeProfile) -> List[ChatMessage]:
+        # Nothing per-home may go before the home details, or the shared prefix ends there
+        return [
+            self.system_message,
+            ChatMessage(role="user", content=str(home))
+        ]
+
+    def render_continuation(
+        self,
+        messages: List[ChatMessage],
+        partial_response: str,
+        received_titles: List[str]
+    ) -> List[ChatMessage]:
+        """Follow-up conversation asking the LLM to finish a response that was cut off."""
+        titles = ", ".join(f'"{title}"' for title in received_titles) or "none"
+        return [
+            *messages,
+            ChatMessage(role="assistant", content=partial_response),
+            ChatMessage(role="user", content=self.continuation_instructions.format(titles=titles))
+        ]
+
+    def render_refresh(
+        self,
+        home: HomeProfile,
+        changes: List[ProfileChange],
+        categories: FrozenSet[RecommendationCategory],
+        kept_titles: List[str]
+    ) -> List[ChatMessage]:
+        """Conversation regenerating only the given categories of a home's advice after a profile change."""
+        instructions = self.refresh_instructions.format(
+            changes="; ".join(str(change) for change in changes),
+            categories=", ".join(sorted(category.value for category in categories)),
+            titles=", ".join(f'"{title}"' for title in kept_titles) or "none"
+        )
+        # Same start as render(home), so the cached static prefix is reused
+        return [*self.render(home), ChatMessage(role="user", content=instructions)]
+
+
+def build_static_prompt(system_message: str, instructions: str, response_schema: Dict[str, Any]) -> str:
+    """The home-independent part of the prompt; sort_keys keeps the schema text stable across processes."""
+    schema = json.dumps(response_schema, sort_keys=True)
+    return f"{system_message}\n{instructions}\n\n{RESPONSE_SCHEMA_HEADER}\n{schema}"
+
+
+@lru_cache(maxsize=None)
+def get_energy_advice_prompt_template() -> CompiledPromptTemplate:
+    return CompiledPromptTemplate(
+        system_message=SYSTEM_MESSAGE,
+        instructions=OUTPUT_FORMAT_INSTRUCTIONS,
+        response_schema=generation_schema(),
+        prompt_version=PROMPT_VERSION
+    )
@@ -0,0 +1,271 @@
+"""
+Deterministic energy advice computed from the HomeProfile alone.
+
+Used for instant answers, as a fallback when the LLM is unavailable and as a
+provisional result while the LLM is still generating. Costs and savings come
+from the tables below, scaled by floor area and climate and filtered by budget.
+"""
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+from app.domain.entities import HomeProfile
+from app.domain.value_objects import (
+    EnergyAdvice,
+    Recommendation,
+    Priority,
+    PRIORITY_ORDER,
+    RecommendationCategory,
+    ImplementationDifficulty
+)
+from app.constants import BUDGET_LOW_MAX, BUDGET_MEDIUM_MAX, BUDGET_HIGH_MAX
+
+RULE_BASED_PROVIDER_NAME = "rule-based"
+
+# Typical annual energy bill per square foot when the profile has no cost data (EUR)
+DEFAULT_ANNUAL_COST_PER_SQFT = 1.2
+# Share of the bill spent on space heating/cooling; the rest is electricity for lighting and appliances
+CLIMATE_CONTROL_SHARE = 0.6
+ELECTRICITY_PRICE_PER_KWH = 0.32
+# Share of household electricity a typical rooftop system covers
+SOLAR_COVERAGE = 0.6
+
+
+class ClimateFactors(NamedTuple):
+    heating: float  # Scales heating-related savings (and the default bill)
+    solar: float    # Scales solar yield
+
+
+CLIMATE_FACTORS = {
+    "hot_humid": ClimateFactors(heating=0.6, solar=1.2),
+    "hot_dry": ClimateFactors(heating=0.6, solar=1.3),
+    "mixed_humid": ClimateFactors(heating=1.0, solar=1.0),
+    "mixed_dry": ClimateFactors(heating=1.0, solar=1.1),
+    "cold": ClimateFactors(heating=1.3, solar=0.9),
+    "very_cold": ClimateFactors(heating=1.5, solar=0.8),
+    "subarctic": ClimateFactors(heating=1.7, solar=0.6),
+    "marine": ClimateFactors(heating=1.1, solar=0.8),
+}
+DEFAULT_CLIMATE_FACTORS = ClimateFactors(heating=1.0, solar=1.0)
+
+# Most a single measure may cost for each budget range (EUR)
+BUDGET_MAX_MEASURE_COST = {
+    "low": BUDGET_LOW_MAX,
+    "medium": BUDGET_MEDIUM_MAX,
+    "high": BUDGET_HIGH_MAX,
+    "premium": float("inf"),
+}
+
+# Payback thresholds (years) for priorities
+HIGH_PRIORITY_MAX_PAYBACK = 3
+MEDIUM_PRIORITY_MAX_PAYBACK = 8
+# Heating factor from which missing insulation or single glazing is critical
+CRITICAL_HEATING_FACTOR = 1.3
+
+
+class Measure(NamedTuple):
+    title: str
+    description: str
+    category: RecommendationCategory
+    difficulty: ImplementationDifficulty
+    applies: Callable[[HomeProfile], bool]
+    fixed_cost: float
+    cost_per_sqft: float
+    savings_share: float  # Share of the remaining heating/cooling (or electricity) spend saved
+    heating_related: bool = True
+    critical_when_cold: bool = False
+
+
+def _old_or_inefficient_heating(home: HomeProfile) -> bool:
+    return (home.hvac_age_years or 0) > 15 or home.heating_type in ("oil", "electric")
+
+
+def _solar_suitable(home: HomeProfile) -> bool:
+    # A roof due for replacement should be redone before panels go on
+    return not home.has_solar_panels and (home.roof_age_years is None or home.roof_age_years <= 15)
+
+
+# Cost table: one entry per measure, evaluated in order
+MEASURES = (
+    Measure(
+        title="Insulate walls and attic",
+        description="The home has no insulation. Insulating the attic floor and external walls is the single largest reduction in heat loss.",
+        category=RecommendationCategory.INSULATION,
+        difficulty=ImplementationDifficulty.Difficult,
+        applies=lambda home: home.insulation_type == "none",
+        fixed_cost=1500,
+        cost_per_sqft=3.5,
+        savings_share=0.25,
+        critical_when_cold=True
+    ),
+    Measure(
+        title="Top up attic insulation",
+        description="Basic insulation can be brought to current standards by adding a layer in the attic, which is where most heat escapes.",
+        category=RecommendationCategory.INSULATION,
+        difficulty=ImplementationDifficulty.MODERATE,
+        applies=lambda home: home.insulation_type == "basic",
+        fixed_cost=500,
+        cost_per_sqft=1.5,
+        savings_share=0.12
+    ),
+    Measure(
+        title="Replace single-pane windows",
+        description="Single-pane glass loses several times more heat than double glazing. Replace with double or triple-pane, low-e windows.",
+        category=RecommendationCategory.WINDOWS,
+        difficulty=ImplementationDifficulty.Difficult,
+        applies=lambda home: home.window_type == "single_pane",
+        fixed_cost=1000,
+        cost_per_sqft=10.0,
+        savings_share=0.15,
+        critical_when_cold=True
+    ),
+    Measure(
+        title="Replace the heating system with a heat pump",
+        description="The heating system is old or uses oil or direct electric heating. A modern heat pump delivers 3-4 units of heat per unit of electricity.",
+        category=RecommendationCategory.HEATING_COOLING,
+        difficulty=ImplementationDifficulty.Difficult,
+        applies=_old_or_inefficient_heating,
+        fixed_cost=9000,
+        cost_per_sqft=2.0,
+        savings_share=0.30
+    ),
+    Measure(
+        title="Install a smart thermostat",
+        description="Scheduling and occupancy-based setbacks avoid heating and cooling an empty home.",
+        category=RecommendationCategory.HEATING_COOLING,
+        difficulty=ImplementationDifficulty.EASY,
+        applies=lambda home: not home.has_smart_thermostat,
+        fixed_cost=250,
+        cost_per_sqft=0.0,
+        savings_share=0.08
+    ),
+    Measure(
+        title="Install rooftop solar panels",
+        description="A rooftop photovoltaic system covers a large share of household electricity and protects against rising prices.",
+        category=RecommendationCategory.RENEWABLE_ENERGY,
+        difficulty=ImplementationDifficulty.MODERATE,
+        applies=_solar_suitable,
+        fixed_cost=7500,
+        cost_per_sqft=0.0,
+        savings_share=SOLAR_COVERAGE,
+        heating_related=False
+    ),
+    Measure(
+        title="Switch to LED lighting and cut standby power",
+        description="Replace remaining incandescent and halogen bulbs with LEDs and use switchable power strips for electronics.",
+        category=RecommendationCategory.APPLIANCES,
+        difficulty=ImplementationDifficulty.EASY,
+        applies=lambda home: True,
+        fixed_cost=150,
+        cost_per_sqft=0.0,
+        savings_share=0.03,
+        heating_related=False
+    ),
+)
+
+
+class RuleBasedAdvisor:
+    """Scores the measures in MEASURES against a home; pure computation, no I/O."""
+
+    def advise(self, home: HomeProfile) -> EnergyAdvice:
+        climate = CLIMATE_FACTORS.get(home.climate_zone, DEFAULT_CLIMATE_FACTORS)
+        budget_limit = BUDGET_MAX_MEASURE_COST.get(home.budget_range, float("inf"))
+        annual_bill = self._annual_bill(home, climate)
+
+        recommendations: List[Recommendation] = []
+        # Savings compound on what is left of each part of the bill, so overlapping measures
+        # (insulation, then a heat pump for the smaller remaining load) are not double counted
+        remaining = {
+            True: annual_bill * CLIMATE_CONTROL_SHARE,
+            False: annual_bill * (1 - CLIMATE_CONTROL_SHARE),
+        }
+        for measure in MEASURES:
+            if not measure.applies(home):
+                continue
+            cost = round(measure.fixed_cost + measure.cost_per_sqft * home.size_sqft, -1)
+            if cost > budget_limit:
+                continue
+
+            savings = self._annual_savings(measure, home, climate, remaining[measure.heating_related])
+            remaining[measure.heating_related] -= savings
+            savings = max(round(savings), 1.0)
+            payback = round(cost / savings, 1)
+            recommendations.append(Recommendation(
+                title=measure.title,
+                description=measure.description,
+                priority=self._priority(measure, home, climate, payback),
+                category=measure.category,
+                estimated_savings_annual=savings,
+                estimated_cost=cost,
+                payback_period_years=max(payback, 0.1),
+                implementation_difficulty=measure.difficulty
+            ))
+
+        recommendations.sort(key=lambda rec: (PRIORITY_ORDER.index(rec.priority), rec.payback_period_years))
+        total_savings = sum(rec.estimated_savings_annual for rec in recommendations)
+        return EnergyAdvice(
+            home_id=home.id or "",
+            recommendations=recommendations,
+            summary=self._summary(home, recommendations, total_savings, annual_bill),
+            estimated_total_annual_savings=total_savings or None,
+            generated_at=datetime.utcnow(),
+            llm_provider=RULE_BASED_PROVIDER_NAME
+        )
+
+    def _annual_bill(self, home: HomeProfile, climate: ClimateFactors) -> float:
+        if home.avg_monthly_energy_cost:
+            return home.avg_monthly_energy_cost * 12
+        return home.size_sqft * DEFAULT_ANNUAL_COST_PER_SQFT * climate.heating
+
+    def _annual_savings(
+        self,
+        measure: Measure,
+        home: HomeProfile,
+        climate: ClimateFactors,
+        remaining_spend: float
+    ) -> float:
+        if measure.category == RecommendationCategory.RENEWABLE_ENERGY:
+            if home.avg_monthly_kwh:
+                savings = home.avg_monthly_kwh * 12 * ELECTRICITY_PRICE_PER_KWH * SOLAR_COVERAGE * climate.solar
+            else:
+                savings = remaining_spend * SOLAR_COVERAGE * climate.solar
+            return min(savings, remaining_spend * SOLAR_COVERAGE)
+        if measure.heating_related:
+            return remaining_spend * min(measure.savings_share * climate.heating, 0.5)
+        return remaining_spend * measure.savings_share
+
+    def _priority(
+        self,
+        measure: Measure,
+        home: HomeProfile,
+        climate: ClimateFactors,
+        payback: float
+    ) -> Priority:
+        if measure.critical_when_cold and climate.heating >= CRITICAL_HEATING_FACTOR:
+            priority = Priority.CRITICAL
+        elif payback <= HIGH_PRIORITY_MAX_PAYBACK:
+            priority = Priority.HIGH
+        elif payback <= MEDIUM_PRIORITY_MAX_PAYBACK:
+            priority = Priority.MEDIUM
+        else:
+            priority = Priority.LOW
+
+        if home.planning_to_sell_years is not None and payback > home.planning_to_sell_years:
+            # The owner will not recoup the cost before selling
+            priority = PRIORITY_ORDER[min(PRIORITY_ORDER.index(priority) + 1, len(PRIORITY_ORDER) - 1)]
+        return priority
+
+    def _summary(
+        self,
+        home: HomeProfile,
+        recommendations: List[Recommendation],
+        total_savings: float,
+        annual_bill: float
+    ) -> str:
+        if not recommendations:
+            return "No standard improvements fit this home's budget. A detailed analysis may still find opportunities."
+        quick_wins = sum(1 for rec in recommendations if rec.payback_period_years <= HIGH_PRIORITY_MAX_PAYBACK)
+        return (
+            f"This {home.age_years}-year-old, {home.size_sqft} sq ft home has {len(recommendations)} standard "
+            f"improvements available, {quick_wins} of them paying back within {HIGH_PRIORITY_MAX_PAYBACK} years. "
+            f"Implementing all of them could save about €{total_savings:,.0f} per year "
+            f"(roughly {total_savings / annual_bill:.0%} of an estimated €{annual_bill:,.0f} annual energy bill)."
+        )
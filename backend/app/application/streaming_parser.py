@@ -0,0 +1,98 @@
+import json
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+RECOMMENDATIONS_KEY = "recommendations"
+
+
+class IncrementalRecommendationParser:
+    """
+    Incremental scanner over a streamed EnergyAdvice JSON document.
+
+    Feed it text chunks as they arrive from the LLM; it returns every object of
+    the top-level "recommendations" array as soon as its closing brace is seen,
+    without waiting for the rest of the document. The full text is kept so the
+    complete response can still be parsed once the stream ends.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        # Each entry is the container char and whether it is the recommendations array
+        self._stack: List[tuple[str, bool]] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_chars: List[str] = []
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._capturing = False
+        self._object_chars: List[str] = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self._buffer)
+
+    def feed(self, chunk: str) -> List[dict]:
+        """Consume a chunk and return the recommendation objects it completed."""
+        self._buffer.append(chunk)
+        completed = []
+
+        for char in chunk:
+            if self._capturing:
+                self._object_chars.append(char)
+
+            if self._in_string:
+                self._consume_string_char(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_chars = []
+            elif char == ":" and len(self._stack) == 1:
+                self._pending_key = self._last_string
+            elif char == "{":
+                if self._in_recommendations_array():
+                    self._capturing = True
+                    self._object_chars = [char]
+                self._stack.append(("{", False))
+            elif char == "[":
+                is_recommendations = len(self._stack) == 1 and self._pending_key == RECOMMENDATIONS_KEY
+                self._stack.append(("[", is_recommendations))
+            elif char in "}]" and self._stack:
+                self._stack.pop()
+                if char == "}" and self._capturing and self._in_recommendations_array():
+                    recommendation = self._decode_object()
+                    if recommendation is not None:
+                        completed.append(recommendation)
+
+        return completed
+
+    def _consume_string_char(self, char: str) -> None:
+        if self._escaped:
+            self._escaped = False
+            self._string_chars.append(char)
+        elif char == "\\":
+            self._escaped = True
+            self._string_chars.append(char)
+        elif char == '"':
+            self._in_string = False
+            # Only top-level keys matter; skip building strings inside nested values
+            if len(self._stack) == 1:
+                self._last_string = "".join(self._string_chars)
+        elif len(self._stack) == 1:
+            self._string_chars.append(char)
+
+    def _in_recommendations_array(self) -> bool:
+        return len(self._stack) == 2 and self._stack[-1] == ("[", True)
+
+    def _decode_object(self) -> Optional[dict]:
+        raw = "".join(self._object_chars)
+        self._capturing = False
+        self._object_chars = []
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.debug(f"Skipping undecodable streamed recommendation: {e.msg}")
+            return None
+        return value if isinstance(value, dict) else None
@@ -12,6 +12,63 @@ class Settings(BaseSettings):
     
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "llama3.2"
+    # Connection pool shared by all requests to Ollama
+    OLLAMA_MAX_CONNECTIONS: int = 100
+    OLLAMA_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OLLAMA_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    OLLAMA_HTTP2: bool = True  # Only used when the optional 'h2' package is installed
+    # Ollama keep_alive: during business hours the model stays loaded until closing time; otherwise
+    # it is unloaded after OLLAMA_KEEP_ALIVE_SECONDS without requests
+    OLLAMA_KEEP_ALIVE_SECONDS: int = 300
+    OLLAMA_BUSINESS_HOURS: str = "07:00-19:00"  # Empty to always use OLLAMA_KEEP_ALIVE_SECONDS
+    OLLAMA_BUSINESS_DAYS: str = "mon,tue,wed,thu,fri"
+    OLLAMA_BUSINESS_TIMEZONE: str = "UTC"
+    # Load the model and prime the system prompt at startup (readiness waits for it), and reload
+    # the model if it is found unloaded during business hours
+    LLM_WARMUP_ENABLED: bool = True
+    LLM_WARMUP_CHECK_INTERVAL_SECONDS: float = 60.0
+
+    # Comma-separated Ollama nodes; when set, requests are balanced across them instead of OLLAMA_BASE_URL
+    OLLAMA_NODE_URLS: str = ""
+    LLM_ROUTING_EJECT_AFTER_FAILURES: int = 3
+    LLM_ROUTING_HEALTH_CHECK_INTERVAL_SECONDS: float = 10.0
+    # Duplicate slow calls on a less loaded node; costs extra GPU time on the losing node
+    LLM_ROUTING_HEDGE: bool = True
+
+    # Overload protection in front of the provider (single node or routed pool)
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failures before failing fast
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0  # How long to fail fast before letting a probe call through
+    LLM_CONCURRENCY_INITIAL: int = 4
+    LLM_CONCURRENCY_MIN: int = 1
+    LLM_CONCURRENCY_MAX: int = 32
+    LLM_CONCURRENCY_LATENCY_THRESHOLD_SECONDS: float = 60.0  # Slower calls count as overload
+    # Total budget per call, covering the wait for a slot, the call and its retries
+    LLM_REQUEST_DEADLINE_SECONDS: float = 150.0
+
+    # Advice cache: memory | sqlite | redis | none
+    ADVICE_CACHE_BACKEND: str = "memory"
+    ADVICE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    ADVICE_CACHE_MAX_ENTRIES: int = 1024
+    ADVICE_CACHE_SQLITE_PATH: str = "./advice_cache.db"
+    ADVICE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Serve rule-based advice when Ollama is down or times out instead of failing the request
+    ADVICE_RULE_BASED_FALLBACK: bool = True
+
+    # Batch advice workers; match Ollama's OLLAMA_NUM_PARALLEL so every slot stays busy without queueing in Ollama
+    BATCH_MAX_CONCURRENCY: int = 4
+
+    # Readiness probes run in the background; /health/ready only reads the last result
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 5.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
+
+    # Logging: records are queued and written by a background thread
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # text | json
+    LOG_FILE: Optional[str] = "app.log"  # Empty to log to stdout only
+    LOG_FILE_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_FILE_BACKUP_COUNT: int = 5
+    LOG_QUEUE_SIZE: int = 10_000  # Records beyond this are dropped instead of blocking requests
 
     class Config:
         env_file = ".env"
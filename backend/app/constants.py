@@ -4,10 +4,56 @@
 LLM_TEMPERATURE = 0.7
 LLM_MAX_TOKENS = 4000
 LLM_TIMEOUT_SECONDS = 120
+LLM_HEALTH_CHECK_TIMEOUT_SECONDS = 5
 LLM_RETRY_ATTEMPTS = 3
 LLM_RETRY_MIN_WAIT = 1
 LLM_RETRY_MAX_WAIT = 10
 
+# LLM Routing (multiple Ollama nodes)
+LLM_ROUTING_MAX_ATTEMPTS = 3
+# A call is hedged once it runs longer than this percentile of recent call latencies
+LLM_ROUTING_HEDGE_PERCENTILE = 95
+LLM_ROUTING_HEDGE_MIN_DELAY_SECONDS = 5.0
+LLM_ROUTING_HEDGE_MIN_SAMPLES = 20
+LLM_ROUTING_LATENCY_WINDOW = 200
+
+# LLM Overload Protection
+# Multiplicative decrease of the adaptive concurrency limit on an overload signal
+LLM_CONCURRENCY_BACKOFF_RATIO = 0.75
+LLM_LATENCY_EWMA_WEIGHT = 0.2
+
+# LLM Warm-up
+# Backoff between failed startup warm-ups (e.g. Ollama still starting)
+LLM_WARMUP_RETRY_MIN_WAIT = 1
+LLM_WARMUP_RETRY_MAX_WAIT = 30
+
+# Prompt Configuration
+# Bump whenever prompt text or output schema changes so cached advice is not reused
+PROMPT_VERSION = "3"
+
+# Bulk Home Import/Export
+HOME_IMPORT_CHUNK_SIZE = 1_000
+HOME_IMPORT_MAX_REPORTED_ERRORS = 1_000
+HOME_EXPORT_BATCH_SIZE = 1_000
+
+# Home Listing
+HOME_LIST_PAGE_SIZE = 50
+HOME_LIST_MAX_PAGE_SIZE = 500
+
+# Fleet Analytics
+FLEET_RESULT_CACHE_SIZE = 256
+FLEET_PAYBACK_PERCENTILES = (10, 25, 50, 75, 90)
+FLEET_PAYBACK_BUCKET_EDGES = (0, 1, 2, 3, 5, 7, 10, 15, 20, 30, float("inf"))
+
+# Advice History
+ADVICE_HISTORY_PAGE_SIZE = 20
+ADVICE_HISTORY_MAX_PAGE_SIZE = 100
+
+# Batch Advice
+BATCH_MAX_HOMES = 10_000
+BATCH_RESULTS_PAGE_SIZE = 100
+BATCH_RESULTS_MAX_PAGE_SIZE = 1_000
+
 # Logging
 LOG_RESPONSE_PREVIEW_LENGTH = 200
 
@@ -1,7 +1,8 @@
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Callable, Optional, Tuple
 from pydantic import BaseModel, Field, field_validator
+from app.domain.value_objects import EnergyAdvice
 
 
 class HeatingType(str, Enum):
@@ -64,6 +65,50 @@ class BudgetRange(str, Enum):
     PREMIUM = "premium"   # Over €50,000
 
 
+def _always(value: Any) -> bool:
+    return True
+
+
+def _is_set(value: Any) -> bool:
+    return value is not None
+
+
+def _yes_no(value: bool) -> str:
+    return "Yes" if value else "No"
+
+
+# Prompt rendering of HomeProfile: (field, line template, include predicate), in output order.
+# Optional text/amount fields are skipped when empty or 0; optional ages only when unset.
+_PROFILE_DETAIL_FIELDS: Tuple[Tuple[str, str, Callable[[Any], bool]], ...] = (
+    ("size_sqft", "- Size: {} square feet", _always),
+    ("age_years", "- Age: {} years old", _always),
+    ("heating_type", "- Heating Type: {}", _always),
+    ("insulation_type", "- Insulation: {}", _always),
+    ("window_type", "- Windows: {}", _always),
+    ("num_floors", "- Floors: {}", _always),
+    ("num_occupants", "- Occupants: {}", _always),
+    ("has_basement", "- Basement: {}", _always),
+    ("has_attic", "- Attic: {}", _always),
+    ("has_solar_panels", "- Solar Panels: {}", _always),
+    ("has_smart_thermostat", "- Smart Thermostat: {}", _always),
+    # Location & Climate
+    ("country", "- Country: {}", bool),
+    ("zip_code", "- Zip Code: {}", bool),
+    ("climate_zone", "- Climate Zone: {}", bool),
+    # Energy Details
+    ("primary_energy_source", "- Primary Energy Source: {}", bool),
+    ("avg_monthly_energy_cost", "- Average Monthly Energy Cost: €{:.2f}", bool),
+    ("avg_monthly_kwh", "- Average Monthly Electricity Usage: {:.1f} kWh", bool),
+    ("hvac_age_years", "- HVAC System Age: {} years", _is_set),
+    # Building Characteristics
+    ("roof_type", "- Roof Type: {}", bool),
+    ("roof_age_years", "- Roof Age: {} years", _is_set),
+    # Preferences
+    ("budget_range", "- Budget Range: {}", bool),
+    ("planning_to_sell_years", "- Planning to Sell Within: {} years", _is_set),
+)
+
+
 class HomeProfile(BaseModel):
     id: Optional[str] = None
     # Basic Information
@@ -110,50 +155,81 @@ class HomeProfile(BaseModel):
 
     def __str__(self) -> str:
         """String representation suitable for LLM prompts and logging."""
-        details = f"""Home Profile:
-- Size: {self.size_sqft} square feet
-- Age: {self.age_years} years old
-- Heating Type: {self.heating_type}
-- Insulation: {self.insulation_type}
-- Windows: {self.window_type}
-- Floors: {self.num_floors}
-- Occupants: {self.num_occupants}
-- Basement: {"Yes" if self.has_basement else "No"}
-- Attic: {"Yes" if self.has_attic else "No"}
-- Solar Panels: {"Yes" if self.has_solar_panels else "No"}
-- Smart Thermostat: {"Yes" if self.has_smart_thermostat else "No"}"""
-        
-        # Location & Climate
-        if self.country:
-            details += f"\n- Country: {self.country}"
-        if self.zip_code:
-            details += f"\n- Zip Code: {self.zip_code}"
-        if self.climate_zone:
-            details += f"\n- Climate Zone: {self.climate_zone}"
-        
-        # Energy Details
-        if self.primary_energy_source:
-            details += f"\n- Primary Energy Source: {self.primary_energy_source}"
-        if self.avg_monthly_energy_cost:
-            details += f"\n- Average Monthly Energy Cost: €{self.avg_monthly_energy_cost:.2f}"
-        if self.avg_monthly_kwh:
-            details += f"\n- Average Monthly Electricity Usage: {self.avg_monthly_kwh:.1f} kWh"
-        if self.hvac_age_years is not None:
-            details += f"\n- HVAC System Age: {self.hvac_age_years} years"
-        
-        # Building Characteristics
-        if self.roof_type:
-            details += f"\n- Roof Type: {self.roof_type}"
-        if self.roof_age_years is not None:
-            details += f"\n- Roof Age: {self.roof_age_years} years"
-        
-        # Preferences
-        if self.budget_range:
-            details += f"\n- Budget Range: {self.budget_range}"
-        if self.planning_to_sell_years is not None:
-            details += f"\n- Planning to Sell Within: {self.planning_to_sell_years} years"
-        
-        return details
+        lines = ["Home Profile:"]
+        for field, template, include in _PROFILE_DETAIL_FIELDS:
+            value = getattr(self, field)
+            if isinstance(value, str):
+                value = value.strip()
+            if include(value):
+                lines.append(template.format(_yes_no(value) if type(value) is bool else value))
+        return "\n".join(lines)
+
+    class Config:
+        use_enum_values = True
+
+
+class HomeFilter(BaseModel):
+    """Criteria for listing home profiles; unset fields do not restrict the result."""
+    heating_type: Optional[HeatingType] = None
+    insulation_type: Optional[InsulationType] = None
+    climate_zone: Optional[ClimateZone] = None
+    country: Optional[str] = None
+    budget_range: Optional[BudgetRange] = None
+    min_size_sqft: Optional[int] = Field(default=None, ge=0)
+    max_size_sqft: Optional[int] = Field(default=None, ge=0)
+    min_age_years: Optional[int] = Field(default=None, ge=0)
+    max_age_years: Optional[int] = Field(default=None, ge=0)
+
+    class Config:
+        use_enum_values = True
+
+
+class BatchJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+
+class BatchItemStatus(str, Enum):
+    PENDING = "pending"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class BatchJob(BaseModel):
+    id: Optional[str] = None
+    status: BatchJobStatus = BatchJobStatus.PENDING
+    total_items: int = Field(ge=0)
+    completed_items: int = Field(default=0, ge=0)
+    failed_items: int = Field(default=0, ge=0)
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.completed_items + self.failed_items >= self.total_items
+
+    class Config:
+        use_enum_values = True
+
+
+class StoredAdvice(BaseModel):
+    """An entry of a home's advice history."""
+    id: str
+    advice: EnergyAdvice
+    profile: HomeProfile = Field(description="The profile the advice was generated for")
+    cache_key: Optional[str] = None
+    stored_at: datetime = Field(description="When the entry was added; orders the history")
+
+
+class BatchJobItem(BaseModel):
+    job_id: str
+    position: int = Field(ge=0, description="Index of the home in the submitted list")
+    home_id: str
+    status: BatchItemStatus = BatchItemStatus.PENDING
+    advice: Optional[EnergyAdvice] = None
+    error: Optional[str] = None
+    completed_at: Optional[datetime] = None
 
     class Config:
         use_enum_values = True
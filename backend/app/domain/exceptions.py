@@ -1,4 +1,5 @@
 """Domain exceptions for the application"""
+from datetime import datetime
 
 
 # Domain-level exceptions
@@ -14,6 +15,14 @@ class HomeNotFoundError(DomainError):
         super().__init__(f"Home profile with id '{home_id}' not found")
 
 
+class HomeVersionConflictError(DomainError):
+    """Raised when a conditional update or delete targets a home that changed since the expected version"""
+    def __init__(self, home_id: str, current_version: datetime):
+        self.resource_id = home_id
+        self.current_version = current_version
+        super().__init__(f"Home profile with id '{home_id}' was modified at {current_version.isoformat()}")
+
+
 # LLM Provider exceptions
 class LLMProviderError(Exception):
     """Base exception for LLM provider errors"""
@@ -38,3 +47,8 @@ class LLMValidationError(LLMProviderError):
 class LLMServiceUnavailableError(LLMProviderError):
     """Raised when LLM service is unavailable"""
     pass
+
+
+class LLMRequestError(LLMProviderError):
+    """Raised when LLM service rejects the request (4xx), e.g. a bad payload or too long a prompt"""
+    pass
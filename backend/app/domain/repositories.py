@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Optional
-from app.domain.entities import HomeProfile
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from app.domain.entities import HomeProfile, HomeFilter, BatchJob, BatchJobItem, StoredAdvice
+from app.domain.value_objects import EnergyAdvice
 
 
 class HomeRepository(ABC):
@@ -13,9 +15,108 @@ class HomeRepository(ABC):
         pass
 
     @abstractmethod
-    async def update(self, home: HomeProfile) -> HomeProfile:
+    async def update(self, home: HomeProfile, expected_updated_at: Optional[datetime] = None) -> HomeProfile:
+        """
+        Write the fields set on home. With expected_updated_at, only if the stored home was last
+        updated then; raises HomeVersionConflictError otherwise, HomeNotFoundError if it is gone.
+        """
         pass
 
     @abstractmethod
-    async def delete(self, home_id: str) -> bool:
+    async def delete(self, home_id: str, expected_updated_at: Optional[datetime] = None) -> bool:
+        """False if there is no such home; raises HomeVersionConflictError like update."""
+        pass
+
+    @abstractmethod
+    async def create_many(self, homes: List[HomeProfile]) -> int:
+        pass
+
+    @abstractmethod
+    def stream_all(self, batch_size: int = 1000) -> AsyncIterator[HomeProfile]:
+        pass
+
+    @abstractmethod
+    async def list_page(
+        self,
+        filters: HomeFilter,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: int = 50
+    ) -> List[HomeProfile]:
+        """Return up to limit homes ordered by (created_at, id), strictly after the given key."""
+        pass
+
+
+class AdviceRepository(ABC):
+    @abstractmethod
+    async def create(self, advice: EnergyAdvice, home: HomeProfile, cache_key: Optional[str] = None) -> EnergyAdvice:
+        pass
+
+    @abstractmethod
+    async def get_latest(self, home_id: str) -> Optional[EnergyAdvice]:
+        pass
+
+    @abstractmethod
+    async def get_latest_stored(self, home_id: str) -> Optional[StoredAdvice]:
+        """The most recently stored entry of a home's advice history."""
+        pass
+
+    @abstractmethod
+    async def list_by_home(self, home_id: str, offset: int = 0, limit: int = 20) -> List[EnergyAdvice]:
+        pass
+
+    @abstractmethod
+    async def count_by_home(self, home_id: str) -> int:
+        pass
+
+
+class BatchJobRepository(ABC):
+    @abstractmethod
+    async def create(self, home_ids: List[str]) -> BatchJob:
+        pass
+
+    @abstractmethod
+    async def get_by_id(self, job_id: str) -> Optional[BatchJob]:
+        pass
+
+    @abstractmethod
+    async def list_unfinished(self) -> List[BatchJob]:
+        pass
+
+    @abstractmethod
+    async def get_items(
+        self,
+        job_id: str,
+        offset: int = 0,
+        limit: int = 100,
+        finished_only: bool = False
+    ) -> List[BatchJobItem]:
+        pass
+
+    @abstractmethod
+    async def get_pending_items(self, job_id: str) -> List[BatchJobItem]:
+        pass
+
+    @abstractmethod
+    async def complete_item(self, job_id: str, position: int, advice: EnergyAdvice) -> BatchJobItem:
+        pass
+
+    @abstractmethod
+    async def fail_item(self, job_id: str, position: int, error: str) -> BatchJobItem:
+        pass
+
+
+class FleetRepository(ABC):
+    """Read-only, column-oriented access to every home and its latest advice."""
+
+    @abstractmethod
+    async def get_data_version(self) -> str:
+        """Opaque value that changes whenever homes or advice are added, changed or removed."""
+        pass
+
+    @abstractmethod
+    async def load_columns(self) -> Dict[str, List[Any]]:
+        """
+        One list per column, one entry per home: the home's segment and numeric fields,
+        plus annual_savings and investment from its latest advice (None without advice).
+        """
         pass
@@ -11,6 +11,10 @@ class Priority(str, Enum):
     LOW = "low"
 
 
+# Most urgent first; recommendations are listed in this order
+PRIORITY_ORDER: List[Priority] = [Priority.CRITICAL, Priority.HIGH, Priority.MEDIUM, Priority.LOW]
+
+
 class RecommendationCategory(str, Enum):
     INSULATION = "insulation"
     HEATING_COOLING = "heating_cooling"
@@ -0,0 +1,84 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+import logging
+from app.domain.value_objects import EnergyAdvice
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class AdviceCache(ABC):
+    """
+    Content-addressed store for generated advice.
+
+    Backends implement _get/_set; the public methods keep hit/miss counters and
+    make sure a failing backend degrades to a cache miss instead of failing the request.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> Optional[EnergyAdvice]:
+        try:
+            payload = await self._get(key)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Advice cache lookup failed for key {key}: {str(e)}")
+            payload = None
+
+        if payload is None:
+            self.stats.misses += 1
+            return None
+
+        try:
+            advice = EnergyAdvice.model_validate_json(payload)
+        except ValueError as e:
+            # Corrupt entry, or one written by an older EnergyAdvice schema
+            self.stats.errors += 1
+            self.stats.misses += 1
+            logger.warning(f"Discarding undecodable advice cache entry for key {key}: {str(e)}")
+            return None
+
+        self.stats.hits += 1
+        return advice
+
+    async def set(self, key: str, advice: EnergyAdvice) -> None:
+        try:
+            await self._set(key, advice.model_dump_json())
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Advice cache write failed for key {key}: {str(e)}")
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[str]:
+        """Return the serialized advice for key, or None if missing or expired."""
+        pass
+
+    @abstractmethod
+    async def _set(self, key: str, payload: str) -> None:
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def get_backend_name(self) -> str:
+        pass
+
+    async def aclose(self) -> None:
+        """Release any resources (connections, file handles) held by the cache."""
+        pass
@@ -0,0 +1,36 @@
+from typing import Optional
+from app.infrastructure.cache.base import AdviceCache
+from app.infrastructure.cache.memory_cache import InMemoryAdviceCache
+from app.infrastructure.cache.sqlite_cache import SQLiteAdviceCache
+from app.infrastructure.cache.redis_cache import RedisAdviceCache
+from app.config import settings
+
+
+class AdviceCacheFactory:
+    @staticmethod
+    def create_cache(
+        backend: Optional[str] = None,
+        **kwargs
+    ) -> Optional[AdviceCache]:
+        backend = backend or settings.ADVICE_CACHE_BACKEND
+        ttl_seconds = kwargs.get("ttl_seconds", settings.ADVICE_CACHE_TTL_SECONDS)
+
+        if backend == "none":
+            return None
+        elif backend == "memory":
+            return InMemoryAdviceCache(
+                ttl_seconds=ttl_seconds,
+                max_entries=kwargs.get("max_entries", settings.ADVICE_CACHE_MAX_ENTRIES)
+            )
+        elif backend == "sqlite":
+            return SQLiteAdviceCache(
+                ttl_seconds=ttl_seconds,
+                path=kwargs.get("path", settings.ADVICE_CACHE_SQLITE_PATH)
+            )
+        elif backend == "redis":
+            return RedisAdviceCache(
+                ttl_seconds=ttl_seconds,
+                url=kwargs.get("url", settings.ADVICE_CACHE_REDIS_URL)
+            )
+        else:
+            raise ValueError(f"Unsupported advice cache backend: {backend}")
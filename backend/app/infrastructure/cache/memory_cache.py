@@ -0,0 +1,38 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.infrastructure.cache.base import AdviceCache
+
+
+class InMemoryAdviceCache(AdviceCache):
+    """Per-process LRU cache with a TTL on every entry."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 1024):
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def _get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return payload
+
+    async def _set(self, key: str, payload: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def get_backend_name(self) -> str:
+        return "memory"
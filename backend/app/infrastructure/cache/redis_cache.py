@@ -0,0 +1,35 @@
+from typing import Optional
+from app.infrastructure.cache.base import AdviceCache
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # Optional dependency: pip install redis
+    redis = None
+
+KEY_PREFIX = "advice:"
+
+
+class RedisAdviceCache(AdviceCache):
+    """Advice cache in Redis or any Redis-compatible store (Valkey, KeyDB, Dragonfly)."""
+
+    def __init__(self, ttl_seconds: int, url: str = "redis://localhost:6379/0"):
+        if redis is None:
+            raise ValueError("The 'redis' package is required for the redis advice cache: pip install redis")
+        super().__init__(ttl_seconds)
+        self._client = redis.from_url(url, decode_responses=True)
+
+    async def _get(self, key: str) -> Optional[str]:
+        return await self._client.get(KEY_PREFIX + key)
+
+    async def _set(self, key: str, payload: str) -> None:
+        await self._client.set(KEY_PREFIX + key, payload, ex=self.ttl_seconds)
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter(match=f"{KEY_PREFIX}*"):
+            await self._client.delete(key)
+
+    def get_backend_name(self) -> str:
+        return "redis"
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,70 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Optional
+from app.infrastructure.cache.base import AdviceCache
+
+
+class SQLiteAdviceCache(AdviceCache):
+    """
+    Advice cache stored in a SQLite table, shared by all workers on the host
+    and kept across restarts. Queries run in a worker thread so they never
+    block the event loop.
+    """
+
+    def __init__(self, ttl_seconds: int, path: str = "./advice_cache.db"):
+        super().__init__(ttl_seconds)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS advice_cache ("
+            "cache_key TEXT PRIMARY KEY, "
+            "payload TEXT NOT NULL, "
+            "expires_at REAL NOT NULL)"
+        )
+        # Lets every set() delete expired rows with a range scan instead of a table scan
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_advice_cache_expires_at ON advice_cache (expires_at)")
+        self._conn.commit()
+
+    async def _get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def _set(self, key: str, payload: str) -> None:
+        await asyncio.to_thread(self._set_sync, key, payload)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM advice_cache")
+
+    def get_backend_name(self) -> str:
+        return "sqlite"
+
+    async def aclose(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _get_sync(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM advice_cache WHERE cache_key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_sync(self, key: str, payload: str) -> None:
+        now = time.time()
+        with self._lock:
+            # Expired rows are never read again; without this the table would grow forever
+            self._conn.execute("DELETE FROM advice_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO advice_cache (cache_key, payload, expires_at) VALUES (?, ?, ?)",
+                (key, payload, now + self.ttl_seconds)
+            )
+            self._conn.commit()
+
+    def _execute(self, sql: str, params: tuple = ()) -> None:
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
@@ -1,20 +1,57 @@
-from sqlalchemy import create_engine, Column, String, Integer, Float, Boolean, DateTime
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Text, ForeignKey, Index, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import relationship
+from typing import AsyncIterator
 from datetime import datetime
 from app.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+# Async drivers used when DATABASE_URL names only the dialect
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def to_async_url(database_url: str) -> str:
+    """Map a plain DATABASE_URL (e.g. sqlite:///./app.db) onto its async driver."""
+    scheme, separator, rest = database_url.partition("://")
+    if "+" in scheme or scheme not in ASYNC_DRIVERS:
+        return database_url
+    return f"{ASYNC_DRIVERS[scheme]}{separator}{rest}"
+
+
+engine = create_async_engine(to_async_url(settings.DATABASE_URL))
+
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        # SQLite ignores ON DELETE CASCADE unless foreign keys are switched on per connection
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
 class HomeModel(Base):
     __tablename__ = "homes"
+    # Listing pages by (created_at, id); each equality filter gets its own prefix so a filtered
+    # page is an index range scan. Size/age ranges are applied as residual predicates on that scan.
+    __table_args__ = (
+        Index("ix_homes_created_at_id", "created_at", "id"),
+        Index("ix_homes_heating_type_created_at_id", "heating_type", "created_at", "id"),
+        Index("ix_homes_insulation_type_created_at_id", "insulation_type", "created_at", "id"),
+        Index("ix_homes_climate_zone_created_at_id", "climate_zone", "created_at", "id"),
+        Index("ix_homes_country_created_at_id", "country", "created_at", "id"),
+        Index("ix_homes_budget_range_created_at_id", "budget_range", "created_at", "id"),
+        # MAX(updated_at) is part of the fleet analytics data version
+        Index("ix_homes_updated_at", "updated_at"),
+    )
 
     id = Column(String, primary_key=True, index=True)
     # Basic Information
@@ -53,13 +90,106 @@ class HomeModel(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
+class AdviceModel(Base):
+    __tablename__ = "advice"
+    __table_args__ = (
+        Index("ix_advice_home_stored_at", "home_id", "stored_at"),
+        Index("ix_advice_stored_at", "stored_at"),
+    )
+
+    id = Column(String, primary_key=True)
+    home_id = Column(String, ForeignKey("homes.id", ondelete="CASCADE"), nullable=False)
+    summary = Column(Text, nullable=False)
+    estimated_total_annual_savings = Column(Float, nullable=True)
+    llm_provider = Column(String, nullable=False)
+    generated_at = Column(DateTime, nullable=False)
+    # When the row was added; a cached report keeps its original generated_at
+    stored_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Prompt-relevant HomeProfile fields (JSON) the advice was generated for
+    profile_snapshot = Column(Text, nullable=False)
+    cache_key = Column(String, nullable=True)
+
+    recommendations = relationship(
+        "RecommendationModel",
+        order_by="RecommendationModel.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin"
+    )
+
+
+class RecommendationModel(Base):
+    __tablename__ = "recommendations"
+    __table_args__ = (
+        Index("ix_recommendations_advice_position", "advice_id", "position"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    advice_id = Column(String, ForeignKey("advice.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=False)
+    priority = Column(String, nullable=False)
+    category = Column(String, nullable=False)
+    estimated_savings_annual = Column(Float, nullable=True)
+    estimated_cost = Column(Float, nullable=True)
+    payback_period_years = Column(Float, nullable=True)
+    implementation_difficulty = Column(String, nullable=False)
+
+
+class BatchJobModel(Base):
+    __tablename__ = "batch_jobs"
+
+    id = Column(String, primary_key=True)
+    status = Column(String, nullable=False, index=True)
+    total_items = Column(Integer, nullable=False)
+    # Denormalized progress counters, updated in the same transaction as the item
+    completed_items = Column(Integer, default=0, nullable=False)
+    failed_items = Column(Integer, default=0, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class BatchJobItemModel(Base):
+    __tablename__ = "batch_job_items"
+    __table_args__ = (
+        Index("ix_batch_job_items_job_status", "job_id", "status"),
+    )
+
+    job_id = Column(String, ForeignKey("batch_jobs.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    home_id = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    result = Column(Text, nullable=True)  # EnergyAdvice serialized as JSON
+    error = Column(String, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+
+
+def _create_schema(connection) -> None:
+    Base.metadata.create_all(connection)
+    # create_all skips tables that already exist, so indexes added later would never be built
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+async def init_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(_create_schema)
+
+
+async def check_db() -> bool:
+    """Round-trip a trivial query; raises if the database is unreachable."""
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return True
+
+
+async def close_db():
+    await engine.dispose()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,111 @@
+"""
+Background dependency probes for the readiness endpoint.
+
+Probes run on a timer and their results are cached, so a readiness request
+only reads the last report and never waits on the database or Ollama.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# A probe returns True/False, or None when the answer is unknown (reported but never fails readiness)
+Probe = Callable[[], Awaitable[Optional[bool]]]
+
+
+class ProbeResult(NamedTuple):
+    ok: Optional[bool]
+    latency_ms: float
+    error: Optional[str] = None
+
+
+class HealthMonitor:
+    def __init__(
+        self,
+        probes: Dict[str, Probe],
+        required: Set[str],
+        interval: float = 5.0,
+        timeout: float = 2.0
+    ):
+        self.probes = probes
+        self.required = required
+        self.interval = interval
+        self.timeout = timeout
+        # A report older than this means the probe loop is stuck; do not keep claiming readiness
+        self.max_age = interval * 3 + timeout
+        self.results: Dict[str, ProbeResult] = {}
+        self.checked_at: Optional[datetime] = None
+        self._checked_monotonic: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self) -> None:
+        names = list(self.probes)
+        results = await asyncio.gather(*(self._probe(name) for name in names))
+        previous = self.is_ready()
+        self.results = dict(zip(names, results))
+        self.checked_at = datetime.utcnow()
+        self._checked_monotonic = time.monotonic()
+        if self.is_ready() != previous:
+            failing = [name for name in self.required if not self.results[name].ok]
+            if failing:
+                logger.warning(f"Instance not ready, failing checks: {', '.join(sorted(failing))}")
+            else:
+                logger.info("Instance ready: all required checks pass")
+
+    def is_ready(self) -> bool:
+        if self._checked_monotonic is None or time.monotonic() - self._checked_monotonic > self.max_age:
+            return False
+        return all(self.results[name].ok for name in self.required)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.is_ready() else "not_ready",
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+            "checks": {
+                name: {
+                    "ok": result.ok,
+                    "required": name in self.required,
+                    "latency_ms": result.latency_ms,
+                    **({"error": result.error} if result.error else {})
+                }
+                for name, result in self.results.items()
+            }
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health probes failed: {str(e)}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    async def _probe(self, name: str) -> ProbeResult:
+        started = time.perf_counter()
+        try:
+            ok = await asyncio.wait_for(self.probes[name](), timeout=self.timeout)
+            return ProbeResult(ok=ok, latency_ms=_elapsed_ms(started))
+        except asyncio.TimeoutError:
+            return ProbeResult(ok=False, latency_ms=_elapsed_ms(started), error=f"timed out after {self.timeout}s")
+        except Exception as e:
+            return ProbeResult(ok=False, latency_ms=_elapsed_ms(started), error=str(e) or type(e).__name__)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
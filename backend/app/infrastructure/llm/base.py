@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Any, List
+from typing import Optional, Any, Dict, List, AsyncIterator
 from app.infrastructure.llm.types import ChatMessage
 
 
@@ -27,6 +27,25 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def stream_completion(
+        self,
+        messages: List[ChatMessage],
+        temperature: float = 0.7,
+        response_format: Optional[dict[str, Any]] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the completion as text chunks.
+
+        Providers without native streaming yield the full completion as a single chunk.
+        """
+        yield await self.generate_completion(
+            messages=messages,
+            temperature=temperature,
+            response_format=response_format,
+            max_tokens=max_tokens
+        )
+
     @abstractmethod
     def get_provider_name(self) -> str:
         pass
@@ -34,3 +53,19 @@ class LLMProvider(ABC):
     @abstractmethod
     async def health_check(self) -> bool:
         pass
+
+    async def warm_up(self, messages: List[ChatMessage]) -> None:
+        """Load the model and process a static prompt prefix ahead of real requests; no-op by default."""
+        pass
+
+    async def model_loaded(self) -> Optional[bool]:
+        """Whether the model is resident in memory; None when the provider cannot tell."""
+        return None
+
+    def status(self) -> Dict[str, Any]:
+        """Point-in-time state for health endpoints; providers add their own details."""
+        return {"provider": self.get_provider_name()}
+
+    async def aclose(self) -> None:
+        """Release any resources (e.g. pooled connections) held by the provider."""
+        pass
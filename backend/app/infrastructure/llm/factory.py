@@ -1,7 +1,15 @@
 from typing import Optional
 from app.infrastructure.llm.base import LLMProvider
 from app.infrastructure.llm.ollama_provider import OllamaProvider
+from app.infrastructure.llm.keep_alive import BusinessHours, KeepAlivePolicy
+from app.infrastructure.llm.routing_provider import RoutingProvider
+from app.infrastructure.llm.guarded_provider import (
+    GuardedProvider,
+    CircuitBreaker,
+    AdaptiveConcurrencyLimiter
+)
 from app.config import settings
+from app.constants import LLM_TIMEOUT_SECONDS, LLM_RETRY_ATTEMPTS
 
 
 class LLMProviderFactory:
@@ -11,12 +19,81 @@ class LLMProviderFactory:
         **kwargs
     ) -> LLMProvider:
         provider_type = provider_type or settings.LLM_PROVIDER
-        
+        guarded = kwargs.pop("guarded", True)
+        provider = LLMProviderFactory._create_unguarded(provider_type, **kwargs)
+        if not guarded:
+            return provider
+        return GuardedProvider(
+            provider,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=settings.LLM_CIRCUIT_RESET_SECONDS
+            ),
+            limiter=AdaptiveConcurrencyLimiter(
+                initial_limit=settings.LLM_CONCURRENCY_INITIAL,
+                min_limit=settings.LLM_CONCURRENCY_MIN,
+                max_limit=settings.LLM_CONCURRENCY_MAX,
+                latency_threshold=settings.LLM_CONCURRENCY_LATENCY_THRESHOLD_SECONDS
+            ),
+            deadline_seconds=settings.LLM_REQUEST_DEADLINE_SECONDS
+        )
+
+    @staticmethod
+    def _create_unguarded(provider_type: str, **kwargs) -> LLMProvider:
         if provider_type == "ollama":
-            return OllamaProvider(
-                base_url=kwargs.get("base_url", settings.OLLAMA_BASE_URL),
-                model=kwargs.get("model", settings.OLLAMA_MODEL),
-                timeout=kwargs.get("timeout", 120)
+            node_urls = kwargs.pop("node_urls", settings.OLLAMA_NODE_URLS)
+            if isinstance(node_urls, str):
+                node_urls = [url.strip() for url in node_urls.split(",") if url.strip()]
+            if node_urls:
+                # The router fails over to another node, so per-node retries would only delay that
+                return RoutingProvider(
+                    providers={
+                        url: LLMProviderFactory._create_ollama(
+                            base_url=url,
+                            retry_attempts=1,
+                            **{key: value for key, value in kwargs.items() if key != "base_url"}
+                        )
+                        for url in node_urls
+                    },
+                    eject_after_failures=kwargs.get(
+                        "eject_after_failures", settings.LLM_ROUTING_EJECT_AFTER_FAILURES
+                    ),
+                    health_check_interval=kwargs.get(
+                        "health_check_interval", settings.LLM_ROUTING_HEALTH_CHECK_INTERVAL_SECONDS
+                    ),
+                    hedge=kwargs.get("hedge", settings.LLM_ROUTING_HEDGE)
+                )
+            return LLMProviderFactory._create_ollama(
+                base_url=kwargs.pop("base_url", settings.OLLAMA_BASE_URL),
+                retry_attempts=LLM_RETRY_ATTEMPTS,
+                **kwargs
             )
         else:
             raise ValueError(f"Unsupported LLM provider: {provider_type}")
+
+    @staticmethod
+    def create_keep_alive_policy() -> KeepAlivePolicy:
+        business_hours = None
+        if settings.OLLAMA_BUSINESS_HOURS:
+            business_hours = BusinessHours.parse(
+                settings.OLLAMA_BUSINESS_HOURS,
+                settings.OLLAMA_BUSINESS_DAYS,
+                settings.OLLAMA_BUSINESS_TIMEZONE
+            )
+        return KeepAlivePolicy(idle_seconds=settings.OLLAMA_KEEP_ALIVE_SECONDS, business_hours=business_hours)
+
+    @staticmethod
+    def _create_ollama(base_url: str, retry_attempts: int, **kwargs) -> OllamaProvider:
+        return OllamaProvider(
+            base_url=base_url,
+            model=kwargs.get("model", settings.OLLAMA_MODEL),
+            timeout=kwargs.get("timeout", LLM_TIMEOUT_SECONDS),
+            max_connections=kwargs.get("max_connections", settings.OLLAMA_MAX_CONNECTIONS),
+            max_keepalive_connections=kwargs.get(
+                "max_keepalive_connections", settings.OLLAMA_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=kwargs.get("keepalive_expiry", settings.OLLAMA_KEEPALIVE_EXPIRY_SECONDS),
+            http2=kwargs.get("http2", settings.OLLAMA_HTTP2),
+            retry_attempts=retry_attempts,
+            keep_alive=kwargs.get("keep_alive", LLMProviderFactory.create_keep_alive_policy())
+        )
@@ -0,0 +1,357 @@
+"""
+Overload protection in front of an LLMProvider.
+
+GuardedProvider combines a circuit breaker, which fails fast while the backend
+keeps failing, with an AIMD concurrency limit on in-flight calls. Every call
+also has a deadline budget that covers both the wait for a slot and the call
+itself, including the provider's own retries.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+from app.infrastructure.llm.base import LLMProvider
+from app.infrastructure.llm.types import ChatMessage
+from app.infrastructure.metrics import (
+    LLM_CIRCUIT_STATE,
+    LLM_CONCURRENCY_LIMIT,
+    LLM_IN_FLIGHT,
+    LLM_QUEUED,
+    LLM_QUEUE_WAIT_SECONDS,
+    LLM_REJECTED
+)
+from app.domain.exceptions import (
+    LLMConnectionError,
+    LLMTimeoutError,
+    LLMServiceUnavailableError
+)
+from app.constants import LLM_CONCURRENCY_BACKOFF_RATIO, LLM_LATENCY_EWMA_WEIGHT
+
+logger = logging.getLogger(__name__)
+
+# Errors that say the backend is unhealthy (open the circuit) ...
+# Anything else, e.g. LLMRequestError for a rejected request, leaves breaker and limiter alone
+FAILURE_ERRORS = (LLMConnectionError, LLMTimeoutError, LLMServiceUnavailableError)
+# ... and the subset that says it is overloaded (shrink the concurrency limit)
+OVERLOAD_ERRORS = (LLMTimeoutError, LLMServiceUnavailableError)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# Numeric encoding for the llm_circuit_state gauge
+_CIRCUIT_STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures and rejects calls for
+    reset_timeout seconds, then lets a single probe call through (half-open):
+    success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        LLM_CIRCUIT_STATE.set(_CIRCUIT_STATE_VALUES[self.state])
+
+    def allow(self) -> bool:
+        if self.state == CircuitState.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._set_state(CircuitState.HALF_OPEN)
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        if self.state != CircuitState.CLOSED:
+            logger.info("LLM circuit closed: probe call succeeded")
+            self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == CircuitState.HALF_OPEN or (
+            self.state == CircuitState.CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            logger.warning(
+                f"LLM circuit opened after {self.consecutive_failures} consecutive failures; "
+                f"failing fast for {self.reset_timeout}s"
+            )
+            self.opened_at = time.monotonic()
+            self._set_state(CircuitState.OPEN)
+
+    def record_ignored(self) -> None:
+        """The call ended without saying anything about backend health (e.g. it was cancelled)."""
+        self._probe_in_flight = False
+
+    def retry_after(self) -> float:
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0)
+
+    def _set_state(self, state: CircuitState) -> None:
+        self.state = state
+        LLM_CIRCUIT_STATE.set(_CIRCUIT_STATE_VALUES[state])
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on concurrent calls: +1/limit per successful call made while the
+    limit was in use, times backoff_ratio on an overload signal (timeout, 5xx or
+    a call slower than latency_threshold). Callers over the limit wait in FIFO order.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        latency_threshold: float = 60.0,
+        backoff_ratio: float = LLM_CONCURRENCY_BACKOFF_RATIO
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_threshold = latency_threshold
+        self.backoff_ratio = backoff_ratio
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        # Smoothed call latency, used to estimate how long a new caller would queue
+        self.latency_ewma: Optional[float] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._publish()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def estimated_wait(self) -> float:
+        """Rough time until a caller joining the queue now would get a slot."""
+        if self.latency_ewma is None or self.in_flight < int(self.limit):
+            return 0.0
+        return (self.queued + 1) / int(self.limit) * self.latency_ewma
+
+    async def acquire(self, timeout: float) -> None:
+        """Take a slot, waiting at most timeout seconds; raises asyncio.TimeoutError."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            self._publish()
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._publish()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._publish()
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def record_success(self, seconds: float) -> None:
+        self._observe_latency(seconds)
+        if seconds > self.latency_threshold:
+            self._decrease()
+        elif self.in_flight >= int(self.limit):
+            # Only grow while the limit is actually the bottleneck
+            self.limit = min(self.limit + 1 / self.limit, float(self.max_limit))
+            self._wake()
+
+    def record_overload(self) -> None:
+        self._decrease()
+
+    def _decrease(self) -> None:
+        self.limit = max(self.limit * self.backoff_ratio, float(self.min_limit))
+        self._publish()
+
+    def _observe_latency(self, seconds: float) -> None:
+        if self.latency_ewma is None:
+            self.latency_ewma = seconds
+        else:
+            self.latency_ewma += LLM_LATENCY_EWMA_WEIGHT * (seconds - self.latency_ewma)
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+        self._publish()
+
+    def _publish(self) -> None:
+        LLM_CONCURRENCY_LIMIT.set(self.limit)
+        LLM_IN_FLIGHT.set(self.in_flight)
+        LLM_QUEUED.set(self.queued)
+
+
+class GuardedProvider(LLMProvider):
+    def __init__(
+        self,
+        provider: LLMProvider,
+        breaker: CircuitBreaker,
+        limiter: AdaptiveConcurrencyLimiter,
+        deadline_seconds: float = 150.0
+    ):
+        self.provider = provider
+        self.breaker = breaker
+        self.limiter = limiter
+        self.deadline_seconds = deadline_seconds
+
+    async def generate_completion(
+        self,
+        messages: List[ChatMessage],
+        temperature: float = 0.7,
+        response_format: Optional[dict[str, Any]] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        deadline = time.monotonic() + self.deadline_seconds
+        await self._admit(deadline)
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(
+                self.provider.generate_completion(
+                    messages=messages,
+                    temperature=temperature,
+                    response_format=response_format,
+                    max_tokens=max_tokens
+                ),
+                timeout=max(deadline - started, 0.0)
+            )
+        except asyncio.TimeoutError:
+            error = LLMTimeoutError(f"LLM call exceeded its {self.deadline_seconds}s deadline budget")
+            self._record_failure(error)
+            raise error
+        except FAILURE_ERRORS as e:
+            self._record_failure(e)
+            raise
+        except BaseException:
+            self.breaker.record_ignored()
+            raise
+        else:
+            self.breaker.record_success()
+            self.limiter.record_success(time.monotonic() - started)
+            return result
+        finally:
+            self.limiter.release()
+
+    async def stream_completion(
+        self,
+        messages: List[ChatMessage],
+        temperature: float = 0.7,
+        response_format: Optional[dict[str, Any]] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """Admission and circuit breaking as for generate_completion; the deadline only bounds the wait for a slot."""
+        await self._admit(time.monotonic() + self.deadline_seconds)
+        started = time.monotonic()
+        try:
+            async for chunk in self.provider.stream_completion(
+                messages=messages,
+                temperature=temperature,
+                response_format=response_format,
+                max_tokens=max_tokens
+            ):
+                yield chunk
+        except FAILURE_ERRORS as e:
+            self._record_failure(e)
+            raise
+        except BaseException:
+            self.breaker.record_ignored()
+            raise
+        else:
+            self.breaker.record_success()
+            self.limiter.record_success(time.monotonic() - started)
+        finally:
+            self.limiter.release()
+
+    async def _admit(self, deadline: float) -> None:
+        """Pass the circuit breaker, then wait for a concurrency slot within the deadline budget."""
+        if not self.breaker.allow():
+            LLM_REJECTED.labels(reason="circuit_open").inc()
+            raise LLMServiceUnavailableError(
+                f"LLM circuit breaker is open after repeated failures; "
+                f"retrying in {self.breaker.retry_after():.0f}s"
+            )
+
+        budget = deadline - time.monotonic()
+        # Fail now rather than queue for a slot that would arrive too late to be useful
+        if self.limiter.estimated_wait() >= budget:
+            self.breaker.record_ignored()
+            LLM_REJECTED.labels(reason="deadline").inc()
+            raise LLMServiceUnavailableError(
+                f"LLM is overloaded: {self.limiter.queued} calls already queued "
+                f"for {int(self.limiter.limit)} slots"
+            )
+
+        queued_at = time.monotonic()
+        try:
+            await self.limiter.acquire(timeout=budget)
+        except asyncio.TimeoutError:
+            self.breaker.record_ignored()
+            LLM_REJECTED.labels(reason="deadline").inc()
+            raise LLMServiceUnavailableError(
+                f"LLM is overloaded: no slot became free within the {self.deadline_seconds}s deadline"
+            )
+        except BaseException:
+            self.breaker.record_ignored()
+            raise
+        finally:
+            LLM_QUEUE_WAIT_SECONDS.observe(time.monotonic() - queued_at)
+
+    def _record_failure(self, error: Exception) -> None:
+        self.breaker.record_failure()
+        if isinstance(error, OVERLOAD_ERRORS):
+            self.limiter.record_overload()
+
+    def get_provider_name(self) -> str:
+        return self.provider.get_provider_name()
+
+    async def health_check(self) -> bool:
+        return await self.provider.health_check()
+
+    async def warm_up(self, messages: List[ChatMessage]) -> None:
+        # Not a user request: no slot, no deadline and no effect on the circuit
+        await self.provider.warm_up(messages)
+
+    async def model_loaded(self) -> Optional[bool]:
+        return await self.provider.model_loaded()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            **self.provider.status(),
+            "circuit": {
+                "state": self.breaker.state.value,
+                "consecutive_failures": self.breaker.consecutive_failures,
+                "retry_after_seconds": round(self.breaker.retry_after(), 1)
+            },
+            "concurrency": {
+                "limit": round(self.limiter.limit, 2),
+                "in_flight": self.limiter.in_flight,
+                "queued": self.limiter.queued
+            }
+        }
+
+    async def aclose(self) -> None:
+        await self.provider.aclose()
@@ -0,0 +1,59 @@
+"""
+How long Ollama keeps the model in memory after a request (its keep_alive).
+
+During business hours every request asks Ollama to keep the model loaded until
+closing time, so no user pays the model load time; outside them the model is
+unloaded after a short idle period to free the GPU.
+"""
+from datetime import datetime, time, timedelta
+from typing import FrozenSet, Optional
+from zoneinfo import ZoneInfo
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+class BusinessHours:
+    def __init__(self, opens: time, closes: time, days: FrozenSet[int], timezone: ZoneInfo):
+        if closes <= opens:
+            raise ValueError(f"Business hours must close after they open, got {opens}-{closes}")
+        self.opens = opens
+        self.closes = closes
+        # datetime.weekday() numbers, Monday is 0
+        self.days = days
+        self.timezone = timezone
+
+    @classmethod
+    def parse(cls, hours: str, days: str, timezone: str) -> "BusinessHours":
+        """Parse settings such as hours="07:00-19:00", days="mon,tue,wed,thu,fri", timezone="Europe/Berlin"."""
+        opens, closes = (time.fromisoformat(part.strip()) for part in hours.split("-"))
+        try:
+            weekdays = frozenset(WEEKDAYS.index(day.strip().lower()[:3]) for day in days.split(",") if day.strip())
+        except ValueError:
+            raise ValueError(f"Invalid business days {days!r}, expected e.g. 'mon,tue,wed,thu,fri'")
+        return cls(opens, closes, weekdays, ZoneInfo(timezone))
+
+    def seconds_until_close(self, now: Optional[datetime] = None) -> float:
+        """Seconds left in the current business day; 0 outside business hours."""
+        local = (now or datetime.now(self.timezone)).astimezone(self.timezone)
+        if local.weekday() not in self.days or not self.opens <= local.time() < self.closes:
+            return 0.0
+        closing = datetime.combine(local.date(), self.closes, tzinfo=self.timezone)
+        return (closing - local) / timedelta(seconds=1)
+
+    def is_open(self, now: Optional[datetime] = None) -> bool:
+        return self.seconds_until_close(now) > 0
+
+
+class KeepAlivePolicy:
+    def __init__(self, idle_seconds: int = 300, business_hours: Optional[BusinessHours] = None):
+        self.idle_seconds = idle_seconds
+        self.business_hours = business_hours
+
+    def keep_alive(self, now: Optional[datetime] = None) -> int:
+        """keep_alive in seconds for a request sent now."""
+        if self.business_hours is None:
+            return self.idle_seconds
+        return max(int(self.business_hours.seconds_until_close(now)), self.idle_seconds)
+
+    def in_business_hours(self, now: Optional[datetime] = None) -> bool:
+        return self.business_hours is not None and self.business_hours.is_open(now)
@@ -1,22 +1,30 @@
+import importlib.util
+import json
+import time
 import httpx
-from typing import Optional, Any, List
+from typing import Optional, Any, List, AsyncIterator
 from tenacity import (
+    RetryCallState,
     retry,
-    stop_after_attempt,
     wait_exponential,
     retry_if_exception_type,
     before_sleep_log
 )
 import logging
 from app.infrastructure.llm.base import LLMProvider
+from app.infrastructure.llm.keep_alive import KeepAlivePolicy
 from app.infrastructure.llm.types import ChatMessage
+from app.infrastructure.metrics import LLM_RETRIES, record_llm_error, record_ollama_stats
 from app.domain.exceptions import (
+    LLMProviderError,
     LLMConnectionError,
     LLMTimeoutError,
-    LLMServiceUnavailableError
+    LLMServiceUnavailableError,
+    LLMRequestError
 )
 from app.constants import (
     LLM_TIMEOUT_SECONDS,
+    LLM_HEALTH_CHECK_TIMEOUT_SECONDS,
     LLM_RETRY_ATTEMPTS,
     LLM_RETRY_MIN_WAIT,
     LLM_RETRY_MAX_WAIT
@@ -24,25 +32,70 @@ from app.constants import (
 
 logger = logging.getLogger(__name__)
 
+_log_retry = before_sleep_log(logger, logging.WARNING)
+
+
+def _before_retry_sleep(retry_state: RetryCallState) -> None:
+    _log_retry(retry_state)
+    provider = retry_state.args[0]
+    error = retry_state.outcome.exception()
+    LLM_RETRIES.labels(provider=provider.get_provider_name(), error=type(error).__name__).inc()
+
+
+def _stop_after_configured_attempts(retry_state: RetryCallState) -> bool:
+    return retry_state.attempt_number >= retry_state.args[0].retry_attempts
+
+
+def _http2_available() -> bool:
+    """HTTP/2 support in httpx requires the optional 'h2' package."""
+    return importlib.util.find_spec("h2") is not None
+
 
 class OllamaProvider(LLMProvider):
     def __init__(
         self,
         base_url: str = "http://localhost:11434",
         model: str = "llama3.2",
-        timeout: int = LLM_TIMEOUT_SECONDS
+        timeout: int = LLM_TIMEOUT_SECONDS,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        retry_attempts: int = LLM_RETRY_ATTEMPTS,
+        keep_alive: Optional[KeepAlivePolicy] = None
     ):
         self.base_url = base_url.rstrip('/')
         self.model = model
         self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and _http2_available()
+        # 1 disables retries, e.g. when a RoutingProvider fails over to another node instead
+        self.retry_attempts = retry_attempts
+        # None leaves keep_alive to Ollama (OLLAMA_KEEP_ALIVE on the server, 5 minutes by default)
+        self.keep_alive = keep_alive
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client, created lazily on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
 
-    @retry(
-        retry=retry_if_exception_type((httpx.TimeoutException, httpx.NetworkError)),
-        stop=stop_after_attempt(LLM_RETRY_ATTEMPTS),
-        wait=wait_exponential(multiplier=1, min=LLM_RETRY_MIN_WAIT, max=LLM_RETRY_MAX_WAIT),
-        before_sleep=before_sleep_log(logger, logging.WARNING),
-        reraise=True
-    )
     async def generate_completion(
         self,
         messages: List[ChatMessage],
@@ -63,9 +116,83 @@ class OllamaProvider(LLMProvider):
         Returns:
             Generated completion string
         """
+        payload = self._build_payload(messages, temperature, response_format, max_tokens, stream=False)
+
+        try:
+            started = time.perf_counter()
+            result = await self._post_chat(payload)
+            record_ollama_stats(self.model, result, time.perf_counter() - started)
+            # /api/chat returns message in result["message"]["content"]
+            return result.get("message", {}).get("content", "")
+        except Exception as e:
+            error = self._to_llm_error(e)
+            record_llm_error(error)
+            raise error
+
+    # Retries see raw httpx errors; they are translated to LLM errors only after the last attempt
+    @retry(
+        retry=retry_if_exception_type((httpx.TimeoutException, httpx.NetworkError)),
+        stop=_stop_after_configured_attempts,
+        wait=wait_exponential(multiplier=1, min=LLM_RETRY_MIN_WAIT, max=LLM_RETRY_MAX_WAIT),
+        before_sleep=_before_retry_sleep,
+        reraise=True
+    )
+    async def _post_chat(self, payload: dict[str, Any]) -> dict[str, Any]:
         # Ollama supports /api/chat endpoint which natively accepts messages array
+        response = await self.client.post(f"{self.base_url}/api/chat", json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    async def stream_completion(
+        self,
+        messages: List[ChatMessage],
+        temperature: float = 0.7,
+        response_format: Optional[dict[str, Any]] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream completion chunks from chat messages using Ollama's NDJSON stream mode.
+
+        Not retried: a retry after chunks were yielded would duplicate output.
+        """
         url = f"{self.base_url}/api/chat"
-        
+        payload = self._build_payload(messages, temperature, response_format, max_tokens, stream=True)
+
+        try:
+            started = time.perf_counter()
+            async with self.client.stream("POST", url, json=payload) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        raise LLMServiceUnavailableError(f"Ollama stream error: {chunk['error']}")
+                    content = chunk.get("message", {}).get("content", "")
+                    if content:
+                        yield content
+                    if chunk.get("done"):
+                        # The final chunk carries the timings for the whole generation
+                        record_ollama_stats(self.model, chunk, time.perf_counter() - started)
+                        break
+        except LLMProviderError as e:
+            record_llm_error(e)
+            raise
+        except Exception as e:
+            error = self._to_llm_error(e)
+            record_llm_error(error)
+            raise error
+
+    def _build_payload(
+        self,
+        messages: List[ChatMessage],
+        temperature: float,
+        response_format: Optional[dict[str, Any]],
+        max_tokens: Optional[int],
+        stream: bool
+    ) -> dict[str, Any]:
         # Convert ChatMessage objects to dict format for Ollama
         messages_dict = [
             {"role": msg.role, "content": msg.content}
@@ -75,7 +202,7 @@ class OllamaProvider(LLMProvider):
         payload = {
             "model": self.model,
             "messages": messages_dict,
-            "stream": False,
+            "stream": stream,
             "options": {
                 "temperature": temperature,
             }
@@ -88,51 +215,81 @@ class OllamaProvider(LLMProvider):
         if max_tokens:
             payload["options"]["num_predict"] = max_tokens
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                result = response.json()
-                # /api/chat returns message in result["message"]["content"]
-                return result.get("message", {}).get("content", "")
-            except httpx.TimeoutException:
-                # Will be retried by tenacity, but if all retries fail, raise custom error
-                raise LLMTimeoutError(
-                    f"Ollama request timed out after {self.timeout} seconds. "
-                    f"Model '{self.model}' may be too slow or overloaded."
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive.keep_alive()
+
+        return payload
+
+    def _to_llm_error(self, error: Exception) -> LLMProviderError:
+        """Translate httpx errors into domain LLM errors."""
+        if isinstance(error, httpx.TimeoutException):
+            return LLMTimeoutError(
+                f"Ollama request timed out after {self.timeout} seconds. "
+                f"Model '{self.model}' may be too slow or overloaded."
+            )
+        if isinstance(error, httpx.TransportError):
+            return LLMConnectionError(
+                f"Failed to connect to Ollama at {self.base_url}. "
+                f"Please ensure Ollama is running. Error: {str(error)}"
+            )
+        if isinstance(error, httpx.HTTPStatusError):
+            if error.response.status_code == 404:
+                return LLMServiceUnavailableError(
+                    f"Model '{self.model}' not found. Please run: ollama pull {self.model}"
                 )
-            except httpx.NetworkError as e:
-                # Will be retried by tenacity, but if all retries fail, raise custom error
-                raise LLMConnectionError(
-                    f"Failed to connect to Ollama at {self.base_url}. "
-                    f"Please ensure Ollama is running. Error: {str(e)}"
+            elif error.response.status_code >= 500:
+                return LLMServiceUnavailableError(
+                    f"Ollama service error (status {error.response.status_code}): {error.response.text}"
                 )
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 404:
-                    raise LLMServiceUnavailableError(
-                        f"Model '{self.model}' not found. Please run: ollama pull {self.model}"
-                    )
-                elif e.response.status_code >= 500:
-                    raise LLMServiceUnavailableError(
-                        f"Ollama service error (status {e.response.status_code}): {e.response.text}"
-                    )
-                else:
-                    raise LLMConnectionError(
-                        f"Ollama API error (status {e.response.status_code}): {e.response.text}"
-                    )
-            except httpx.HTTPError as e:
-                raise LLMConnectionError(f"Ollama HTTP error: {str(e)}")
-            except Exception as e:
-                raise LLMConnectionError(f"Unexpected Ollama error: {str(e)}")
+            else:
+                return LLMRequestError(
+                    f"Ollama rejected the request (status {error.response.status_code}): {error.response.text}"
+                )
+        # Not a transport or server failure, so not a reason to consider Ollama unhealthy
+        if isinstance(error, httpx.HTTPError):
+            return LLMProviderError(f"Ollama HTTP error: {str(error)}")
+        return LLMProviderError(f"Unexpected Ollama error: {str(error)}")
 
     def get_provider_name(self) -> str:
         return f"ollama-{self.model}"
 
     async def health_check(self) -> bool:
-        url = f"{self.base_url}/api/tags"
-        async with httpx.AsyncClient(timeout=5) as client:
-            try:
-                response = await client.get(url)
-                return response.status_code == 200
-            except Exception:
-                return False
+        """Ollama is reachable and the configured model has been pulled."""
+        return self.model_tag in await self._list_models("/api/tags")
+
+    async def warm_up(self, messages: List[ChatMessage]) -> None:
+        """
+        Load the model and prime Ollama's prompt cache with the given prefix.
+
+        Generates a single token; requests that start with the same messages then
+        reuse the evaluated prefix instead of processing it again.
+        """
+        payload = self._build_payload(messages, temperature=0.0, response_format=None, max_tokens=1, stream=False)
+        started = time.perf_counter()
+        try:
+            result = await self._post_chat(payload)
+        except Exception as e:
+            raise self._to_llm_error(e)
+        logger.info(
+            f"Warmed up {self.model} on {self.base_url} in {time.perf_counter() - started:.1f}s "
+            f"(load {result.get('load_duration', 0) / 1e9:.1f}s, "
+            f"{result.get('prompt_eval_count', 0)} prompt tokens evaluated)"
+        )
+
+    async def model_loaded(self) -> bool:
+        """The configured model is in memory (listed by /api/ps), so no load time is paid."""
+        return self.model_tag in await self._list_models("/api/ps")
+
+    @property
+    def model_tag(self) -> str:
+        # Ollama reports untagged names with the implicit ":latest" tag
+        return self.model if ":" in self.model else f"{self.model}:latest"
+
+    async def _list_models(self, path: str) -> List[str]:
+        try:
+            response = await self.client.get(f"{self.base_url}{path}", timeout=LLM_HEALTH_CHECK_TIMEOUT_SECONDS)
+            if response.status_code != 200:
+                return []
+            return [model.get("name") for model in response.json().get("models", [])]
+        except Exception:
+            return []
@@ -0,0 +1,328 @@
+"""
+LLMProvider that spreads calls over a pool of providers, typically one
+OllamaProvider per GPU node.
+
+Each call goes to the healthy node with the fewest outstanding requests. Nodes
+that fail repeatedly are ejected and put back once their health_check passes
+again. A call still running after the hedge delay (a high percentile of recent
+latencies) is duplicated on another node and whichever copy finishes first wins.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Set
+from app.infrastructure.llm.base import LLMProvider
+from app.infrastructure.llm.types import ChatMessage
+from app.infrastructure.metrics import (
+    LLM_NODE_OUTSTANDING,
+    LLM_NODE_HEALTHY,
+    LLM_NODE_EJECTIONS,
+    LLM_FAILOVERS,
+    LLM_HEDGED_REQUESTS
+)
+from app.domain.exceptions import (
+    LLMProviderError,
+    LLMConnectionError,
+    LLMTimeoutError,
+    LLMServiceUnavailableError
+)
+from app.constants import (
+    LLM_ROUTING_MAX_ATTEMPTS,
+    LLM_ROUTING_HEDGE_PERCENTILE,
+    LLM_ROUTING_HEDGE_MIN_DELAY_SECONDS,
+    LLM_ROUTING_HEDGE_MIN_SAMPLES,
+    LLM_ROUTING_LATENCY_WINDOW
+)
+
+logger = logging.getLogger(__name__)
+
+# Errors that say something about the node rather than the request, so another node may succeed
+NODE_ERRORS = (LLMConnectionError, LLMTimeoutError, LLMServiceUnavailableError)
+
+
+class RoutingNode:
+    """One provider in the pool plus the state the router keeps for it."""
+
+    def __init__(self, name: str, provider: LLMProvider):
+        self.name = name
+        self.provider = provider
+        self.outstanding = 0
+        self.dispatched = 0
+        self.consecutive_failures = 0
+        self.healthy = True
+        LLM_NODE_OUTSTANDING.labels(node=name).set(0)
+        LLM_NODE_HEALTHY.labels(node=name).set(1)
+
+    def set_healthy(self, healthy: bool) -> None:
+        self.healthy = healthy
+        LLM_NODE_HEALTHY.labels(node=self.name).set(1 if healthy else 0)
+
+
+class RoutingProvider(LLMProvider):
+    def __init__(
+        self,
+        providers: Dict[str, LLMProvider],
+        eject_after_failures: int = 3,
+        health_check_interval: float = 10.0,
+        hedge: bool = True,
+        hedge_min_delay: float = LLM_ROUTING_HEDGE_MIN_DELAY_SECONDS,
+        max_attempts: int = LLM_ROUTING_MAX_ATTEMPTS
+    ):
+        if not providers:
+            raise ValueError("RoutingProvider needs at least one provider")
+        self.nodes = [RoutingNode(name, provider) for name, provider in providers.items()]
+        self.eject_after_failures = eject_after_failures
+        self.health_check_interval = health_check_interval
+        self.hedge = hedge and len(self.nodes) > 1
+        self.hedge_min_delay = hedge_min_delay
+        self.max_attempts = max_attempts
+        # Recent successful call durations, used to derive the hedge delay
+        self._latencies: Deque[float] = deque(maxlen=LLM_ROUTING_LATENCY_WINDOW)
+        self._health_task: Optional[asyncio.Task] = None
+
+    async def generate_completion(
+        self,
+        messages: List[ChatMessage],
+        temperature: float = 0.7,
+        response_format: Optional[dict[str, Any]] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Generate on the least loaded node, failing over to another node on node errors."""
+        self._ensure_health_monitor()
+
+        async def call(provider: LLMProvider) -> str:
+            return await provider.generate_completion(
+                messages=messages,
+                temperature=temperature,
+                response_format=response_format,
+                max_tokens=max_tokens
+            )
+
+        tried: Set[RoutingNode] = set()
+        last_error: Optional[LLMProviderError] = None
+        for _ in range(self.max_attempts):
+            node = self._pick(exclude=tried)
+            if node is None:
+                break
+            tried.add(node)
+            try:
+                return await self._call_hedged(node, call, tried)
+            except NODE_ERRORS as e:
+                last_error = e
+                LLM_FAILOVERS.labels(node=node.name).inc()
+                logger.warning(f"LLM node {node.name} failed, trying another node: {str(e)}")
+        raise last_error or LLMServiceUnavailableError("No LLM node available")
+
+    async def stream_completion(
+        self,
+        messages: List[ChatMessage],
+        temperature: float = 0.7,
+        response_format: Optional[dict[str, Any]] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream from the least loaded node.
+
+        Fails over only until the first chunk has been yielded, and is never
+        hedged: two streams cannot be merged without duplicating output.
+        """
+        self._ensure_health_monitor()
+        tried: Set[RoutingNode] = set()
+        last_error: Optional[LLMProviderError] = None
+        for _ in range(self.max_attempts):
+            node = self._pick(exclude=tried)
+            if node is None:
+                break
+            tried.add(node)
+            streamed = False
+            self._acquire(node)
+            started = time.perf_counter()
+            try:
+                async for chunk in node.provider.stream_completion(
+                    messages=messages,
+                    temperature=temperature,
+                    response_format=response_format,
+                    max_tokens=max_tokens
+                ):
+                    streamed = True
+                    yield chunk
+                self._record_success(node, time.perf_counter() - started)
+                return
+            except NODE_ERRORS as e:
+                self._record_failure(node, e)
+                if streamed:
+                    raise
+                last_error = e
+                LLM_FAILOVERS.labels(node=node.name).inc()
+                logger.warning(f"LLM node {node.name} failed before streaming, trying another node: {str(e)}")
+            finally:
+                self._release(node)
+        raise last_error or LLMServiceUnavailableError("No LLM node available")
+
+    async def _call_hedged(
+        self,
+        node: RoutingNode,
+        call: Callable[[LLMProvider], Awaitable[str]],
+        tried: Set[RoutingNode]
+    ) -> str:
+        primary = asyncio.ensure_future(self._call_node(node, call))
+        pending = {primary}
+        try:
+            delay = self._hedge_delay()
+            if delay is None:
+                return await primary
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            # The percentile-based delay keeps hedges to the slowest few percent of calls, bounding the extra load
+            hedge_node = self._pick(exclude=tried)
+            if hedge_node is None or not hedge_node.healthy:
+                return await primary
+            tried.add(hedge_node)
+            logger.info(f"LLM call on {node.name} exceeded {delay:.1f}s, hedging on {hedge_node.name}")
+            hedge = asyncio.ensure_future(self._call_node(hedge_node, call))
+            pending = {primary, hedge}
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        LLM_HEDGED_REQUESTS.labels(winner="primary" if task is primary else "hedge").inc()
+                        return task.result()
+                    error = task.exception()
+            LLM_HEDGED_REQUESTS.labels(winner="none").inc()
+            raise error
+        finally:
+            # Also reached when the caller is cancelled: never leave a copy generating for nobody
+            for task in pending:
+                task.cancel()
+
+    async def _call_node(self, node: RoutingNode, call: Callable[[LLMProvider], Awaitable[str]]) -> str:
+        self._acquire(node)
+        started = time.perf_counter()
+        try:
+            result = await call(node.provider)
+            self._record_success(node, time.perf_counter() - started)
+            return result
+        except NODE_ERRORS as e:
+            self._record_failure(node, e)
+            raise
+        finally:
+            self._release(node)
+
+    def _pick(self, exclude: Set[RoutingNode]) -> Optional[RoutingNode]:
+        """Least outstanding requests first; ties go to the node that has been sent the fewest calls."""
+        candidates = [node for node in self.nodes if node not in exclude]
+        healthy = [node for node in candidates if node.healthy]
+        # With every node ejected, keep trying them rather than failing every request until the next probe
+        candidates = healthy or candidates
+        if not candidates:
+            return None
+        return min(candidates, key=lambda node: (node.outstanding, node.dispatched))
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.hedge or len(self._latencies) < LLM_ROUTING_HEDGE_MIN_SAMPLES:
+            return None
+        latencies = sorted(self._latencies)
+        index = min(int(len(latencies) * LLM_ROUTING_HEDGE_PERCENTILE / 100), len(latencies) - 1)
+        return max(latencies[index], self.hedge_min_delay)
+
+    def _acquire(self, node: RoutingNode) -> None:
+        node.outstanding += 1
+        node.dispatched += 1
+        LLM_NODE_OUTSTANDING.labels(node=node.name).set(node.outstanding)
+
+    def _release(self, node: RoutingNode) -> None:
+        node.outstanding -= 1
+        LLM_NODE_OUTSTANDING.labels(node=node.name).set(node.outstanding)
+
+    def _record_success(self, node: RoutingNode, seconds: float) -> None:
+        node.consecutive_failures = 0
+        self._latencies.append(seconds)
+
+    def _record_failure(self, node: RoutingNode, error: Exception) -> None:
+        node.consecutive_failures += 1
+        if node.healthy and node.consecutive_failures >= self.eject_after_failures:
+            self._eject(node, f"{node.consecutive_failures} consecutive failures ({type(error).__name__})")
+
+    def _eject(self, node: RoutingNode, reason: str) -> None:
+        node.set_healthy(False)
+        LLM_NODE_EJECTIONS.labels(node=node.name).inc()
+        logger.warning(f"Ejecting LLM node {node.name}: {reason}")
+
+    def _ensure_health_monitor(self) -> None:
+        """Start probing nodes in the background once there is a running event loop."""
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._monitor_health())
+
+    async def _monitor_health(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self._probe_nodes()
+            except Exception as e:
+                logger.error(f"LLM node health probe failed: {str(e)}", exc_info=True)
+
+    async def _probe_nodes(self) -> List[bool]:
+        results = await asyncio.gather(*(node.provider.health_check() for node in self.nodes))
+        for node, healthy in zip(self.nodes, results):
+            if healthy and not node.healthy:
+                node.consecutive_failures = 0
+                node.set_healthy(True)
+                logger.info(f"Reinstating LLM node {node.name}: health check passed")
+            elif not healthy and node.healthy:
+                self._eject(node, "health check failed")
+        return results
+
+    def get_provider_name(self) -> str:
+        # Nodes normally serve the same model, which collapses this to a single name
+        return "+".join(sorted({node.provider.get_provider_name() for node in self.nodes}))
+
+    async def health_check(self) -> bool:
+        """Healthy while at least one node is."""
+        return any(await self._probe_nodes())
+
+    async def warm_up(self, messages: List[ChatMessage]) -> None:
+        """Warm up every node; fails only if no node could be warmed up."""
+        results = await asyncio.gather(
+            *(node.provider.warm_up(messages) for node in self.nodes),
+            return_exceptions=True
+        )
+        errors = [(node, result) for node, result in zip(self.nodes, results) if isinstance(result, BaseException)]
+        for node, error in errors:
+            logger.warning(f"Warm-up of LLM node {node.name} failed: {str(error)}")
+        if len(errors) == len(self.nodes):
+            raise errors[0][1]
+
+    async def model_loaded(self) -> bool:
+        """Loaded on at least one healthy node."""
+        healthy = [node for node in self.nodes if node.healthy]
+        return any(await asyncio.gather(*(node.provider.model_loaded() for node in healthy)))
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            **super().status(),
+            "nodes": [
+                {
+                    "name": node.name,
+                    "healthy": node.healthy,
+                    "outstanding": node.outstanding,
+                    "consecutive_failures": node.consecutive_failures
+                }
+                for node in self.nodes
+            ]
+        }
+
+    async def aclose(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for node in self.nodes:
+            await node.provider.aclose()
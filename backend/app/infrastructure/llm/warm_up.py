@@ -0,0 +1,104 @@
+"""
+Background model warm-up.
+
+Loads the model and primes the static prompt prefix at startup, retrying until
+it succeeds, so the first advice request does not pay the model load time.
+Readiness waits for the first successful warm-up. During business hours the
+model is also reloaded whenever it is found unloaded (e.g. Ollama restarted).
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from app.infrastructure.llm.base import LLMProvider
+from app.infrastructure.llm.keep_alive import KeepAlivePolicy
+from app.infrastructure.llm.types import ChatMessage
+from app.constants import LLM_WARMUP_RETRY_MIN_WAIT, LLM_WARMUP_RETRY_MAX_WAIT
+
+logger = logging.getLogger(__name__)
+
+
+class WarmUpState(str, Enum):
+    PENDING = "pending"
+    WARMING = "warming"
+    HOT = "hot"
+    FAILED = "failed"
+
+
+class ModelWarmer:
+    def __init__(
+        self,
+        provider: LLMProvider,
+        messages: List[ChatMessage],
+        keep_alive: KeepAlivePolicy,
+        check_interval: float = 60.0
+    ):
+        self.provider = provider
+        self.messages = messages
+        self.keep_alive = keep_alive
+        self.check_interval = check_interval
+        self.state = WarmUpState.PENDING
+        self.warmed_at: Optional[datetime] = None
+        self.duration_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def is_warm(self) -> bool:
+        """Readiness probe: the model has been warmed up since startup."""
+        return self.warmed_at is not None
+
+    async def warm_up(self) -> bool:
+        self.state = WarmUpState.WARMING
+        started = time.perf_counter()
+        try:
+            await self.provider.warm_up(self.messages)
+        except Exception as e:
+            self.state = WarmUpState.FAILED
+            self.last_error = str(e) or type(e).__name__
+            logger.warning(f"Model warm-up failed: {self.last_error}")
+            return False
+        self.state = WarmUpState.HOT
+        self.warmed_at = datetime.utcnow()
+        self.duration_seconds = round(time.perf_counter() - started, 2)
+        self.last_error = None
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "warmed_at": self.warmed_at.isoformat() if self.warmed_at else None,
+            "duration_seconds": self.duration_seconds,
+            "keep_alive_seconds": self.keep_alive.keep_alive(),
+            **({"error": self.last_error} if self.last_error else {})
+        }
+
+    async def _run(self) -> None:
+        wait = LLM_WARMUP_RETRY_MIN_WAIT
+        while not await self.warm_up():
+            await asyncio.sleep(wait)
+            wait = min(wait * 2, LLM_WARMUP_RETRY_MAX_WAIT)
+
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                # False only when the provider knows the model is not in memory; None means it cannot tell
+                if self.keep_alive.in_business_hours() and await self.provider.model_loaded() is False:
+                    logger.info("Model is not loaded during business hours, warming it up again")
+                    await self.warm_up()
+            except Exception as e:
+                logger.error(f"Model keep-warm check failed: {str(e)}", exc_info=True)
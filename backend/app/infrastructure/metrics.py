@@ -0,0 +1,164 @@
+"""Prometheus metrics for the advice pipeline (exposed at /metrics)."""
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+from prometheus_client import Counter, Gauge, Histogram
+
+# Sub-millisecond DB/prompt work up to multi-minute local LLM generations
+STAGE_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0, 180.0
+)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 1536, 2048, 3072, 4096, 8192)
+
+NANOSECONDS = 1e9
+
+ADVICE_STAGE_SECONDS = Histogram(
+    "advice_stage_duration_seconds",
+    "Time spent in each stage of advice generation",
+    ["stage"],
+    buckets=STAGE_BUCKETS
+)
+ADVICE_REQUESTS = Counter(
+    "advice_requests_total",
+    "Advice requests by how they were served",
+    ["source"]
+)
+
+LLM_RETRIES = Counter(
+    "llm_retries_total",
+    "LLM calls retried after a transient error",
+    ["provider", "error"]
+)
+LLM_ERRORS = Counter(
+    "llm_errors_total",
+    "LLM errors surfaced to the advice pipeline, by exception type",
+    ["error"]
+)
+LLM_OUTPUT_SALVAGE = Counter(
+    "llm_output_salvage_total",
+    "LLM responses that were not valid JSON as returned, by outcome: repaired (syntax fixed), "
+    "continued (cut off, completed by a follow-up call), partial (cut off, served as salvaged) or failed",
+    ["outcome"]
+)
+
+LLM_NODE_OUTSTANDING = Gauge(
+    "llm_node_outstanding_requests",
+    "Requests currently in flight on each routed LLM node",
+    ["node"]
+)
+LLM_NODE_HEALTHY = Gauge(
+    "llm_node_healthy",
+    "1 while a routed LLM node receives traffic, 0 while it is ejected",
+    ["node"]
+)
+LLM_NODE_EJECTIONS = Counter(
+    "llm_node_ejections_total",
+    "Times a routed LLM node was taken out of rotation",
+    ["node"]
+)
+LLM_FAILOVERS = Counter(
+    "llm_failovers_total",
+    "Routed LLM calls retried on another node after the given node failed",
+    ["node"]
+)
+LLM_HEDGED_REQUESTS = Counter(
+    "llm_hedged_requests_total",
+    "Routed LLM calls duplicated on a second node, by which copy finished first",
+    ["winner"]
+)
+
+LLM_CIRCUIT_STATE = Gauge(
+    "llm_circuit_state",
+    "LLM circuit breaker state: 0 closed, 1 half-open, 2 open"
+)
+LLM_CONCURRENCY_LIMIT = Gauge(
+    "llm_concurrency_limit",
+    "Current adaptive limit on concurrent LLM calls"
+)
+LLM_IN_FLIGHT = Gauge(
+    "llm_in_flight_requests",
+    "LLM calls currently holding a concurrency slot"
+)
+LLM_QUEUED = Gauge(
+    "llm_queued_requests",
+    "LLM calls waiting for a concurrency slot"
+)
+LLM_QUEUE_WAIT_SECONDS = Histogram(
+    "llm_queue_wait_seconds",
+    "Time LLM calls waited for a concurrency slot",
+    buckets=STAGE_BUCKETS
+)
+LLM_REJECTED = Counter(
+    "llm_rejected_total",
+    "LLM calls rejected without reaching the provider",
+    ["reason"]
+)
+
+OLLAMA_QUEUE_SECONDS = Histogram(
+    "ollama_queue_duration_seconds",
+    "Wall-clock request time not accounted for by Ollama (queueing and transfer)",
+    ["model"],
+    buckets=STAGE_BUCKETS
+)
+OLLAMA_LOAD_SECONDS = Histogram(
+    "ollama_load_duration_seconds",
+    "Ollama load_duration: time spent loading the model",
+    ["model"],
+    buckets=STAGE_BUCKETS
+)
+OLLAMA_PROMPT_EVAL_SECONDS = Histogram(
+    "ollama_prompt_eval_duration_seconds",
+    "Ollama prompt_eval_duration: time spent evaluating the prompt",
+    ["model"],
+    buckets=STAGE_BUCKETS
+)
+OLLAMA_PROMPT_EVAL_TOKENS = Histogram(
+    "ollama_prompt_eval_tokens",
+    "Ollama prompt_eval_count: prompt tokens evaluated (excludes KV-cache hits)",
+    ["model"],
+    buckets=TOKEN_BUCKETS
+)
+OLLAMA_EVAL_SECONDS = Histogram(
+    "ollama_eval_duration_seconds",
+    "Ollama eval_duration: time spent generating the response",
+    ["model"],
+    buckets=STAGE_BUCKETS
+)
+OLLAMA_EVAL_TOKENS = Histogram(
+    "ollama_eval_tokens",
+    "Ollama eval_count: tokens generated",
+    ["model"],
+    buckets=TOKEN_BUCKETS
+)
+
+
+@contextmanager
+def observe_stage(stage: str) -> Iterator[None]:
+    """Record the duration of the enclosed block, including when it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        ADVICE_STAGE_SECONDS.labels(stage=stage).observe(time.perf_counter() - started)
+
+
+def record_llm_error(error: Exception) -> None:
+    LLM_ERRORS.labels(error=type(error).__name__).inc()
+
+
+def record_ollama_stats(model: str, result: Dict[str, Any], wall_seconds: float) -> None:
+    """Export the timings Ollama reports on a finished (final-chunk) /api/chat response."""
+    total_ns = result.get("total_duration")
+    if total_ns is not None:
+        OLLAMA_QUEUE_SECONDS.labels(model=model).observe(max(wall_seconds - total_ns / NANOSECONDS, 0.0))
+    if result.get("load_duration") is not None:
+        OLLAMA_LOAD_SECONDS.labels(model=model).observe(result["load_duration"] / NANOSECONDS)
+    if result.get("prompt_eval_duration") is not None:
+        OLLAMA_PROMPT_EVAL_SECONDS.labels(model=model).observe(result["prompt_eval_duration"] / NANOSECONDS)
+    if result.get("prompt_eval_count") is not None:
+        OLLAMA_PROMPT_EVAL_TOKENS.labels(model=model).observe(result["prompt_eval_count"])
+    if result.get("eval_duration") is not None:
+        OLLAMA_EVAL_SECONDS.labels(model=model).observe(result["eval_duration"] / NANOSECONDS)
+    if result.get("eval_count") is not None:
+        OLLAMA_EVAL_TOKENS.labels(model=model).observe(result["eval_count"])
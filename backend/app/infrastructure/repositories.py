@@ -1,10 +1,18 @@
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from sqlalchemy import case, delete, func, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from app.domain.entities import HomeProfile
-from app.domain.repositories import HomeRepository
-from app.domain.exceptions import DomainError
-from app.infrastructure.database import HomeModel
+from app.domain.entities import HomeProfile, HomeFilter, BatchJob, BatchJobItem, BatchJobStatus, BatchItemStatus, StoredAdvice
+from app.domain.value_objects import EnergyAdvice, Recommendation
+from app.domain.repositories import HomeRepository, AdviceRepository, BatchJobRepository, FleetRepository
+from app.domain.exceptions import DomainError, HomeNotFoundError, HomeVersionConflictError
+from app.infrastructure.database import (
+    HomeModel,
+    AdviceModel,
+    RecommendationModel,
+    BatchJobModel,
+    BatchJobItemModel
+)
 import uuid
 from datetime import datetime
 import logging
@@ -13,7 +21,7 @@ logger = logging.getLogger(__name__)
 
 
 class SQLAlchemyHomeRepository(HomeRepository):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def create(self, home: HomeProfile) -> HomeProfile:
@@ -25,58 +33,140 @@ class SQLAlchemyHomeRepository(HomeRepository):
         try:
             db_home = HomeModel(**home.model_dump())
             self.db.add(db_home)
-            self.db.commit()
-            self.db.refresh(db_home)
+            await self.db.commit()
             return self._to_entity(db_home)
         except SQLAlchemyError as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Database error creating home: {str(e)}", exc_info=True)
             raise DomainError(f"Failed to create home profile") from e
 
     async def get_by_id(self, home_id: str) -> Optional[HomeProfile]:
         """Retrieve a home profile by ID."""
         try:
-            db_home = self.db.query(HomeModel).filter(HomeModel.id == home_id).first()
+            db_home = await self.db.get(HomeModel, home_id)
             return self._to_entity(db_home) if db_home else None
         except SQLAlchemyError as e:
             logger.error(f"Database error fetching home {home_id}: {str(e)}", exc_info=True)
             raise DomainError(f"Failed to retrieve home profile") from e
 
-    async def update(self, home: HomeProfile) -> HomeProfile:
-        """Update an existing home profile."""
+    async def update(self, home: HomeProfile, expected_updated_at: Optional[datetime] = None) -> HomeProfile:
+        """Update the fields set on home; the version check and the write are one UPDATE statement."""
         home.updated_at = datetime.utcnow()
-        
+        values = home.model_dump(exclude_unset=True, exclude={"id", "created_at"})
+        values["updated_at"] = home.updated_at
+        statement = update(HomeModel).where(HomeModel.id == home.id).values(**values)
+        if expected_updated_at is not None:
+            statement = statement.where(HomeModel.updated_at == expected_updated_at)
+
         try:
-            db_home = self.db.query(HomeModel).filter(HomeModel.id == home.id).first()
-            
-            if not db_home:
-                raise DomainError(f"Home with id {home.id} not found")
-            
-            for key, value in home.model_dump(exclude_unset=True).items():
-                setattr(db_home, key, value)
-            
-            self.db.commit()
-            self.db.refresh(db_home)
+            result = await self.db.execute(statement)
+            if result.rowcount == 0:
+                await self.db.rollback()
+                raise await self._version_error(home.id)
+            await self.db.commit()
+            db_home = await self.db.get(HomeModel, home.id, populate_existing=True)
             return self._to_entity(db_home)
         except SQLAlchemyError as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Database error updating home {home.id}: {str(e)}", exc_info=True)
             raise DomainError(f"Failed to update home profile") from e
 
-    async def delete(self, home_id: str) -> bool:
-        """Delete a home profile by ID."""
+    async def delete(self, home_id: str, expected_updated_at: Optional[datetime] = None) -> bool:
+        """Delete a home profile by ID; its advice is removed by ON DELETE CASCADE."""
+        statement = delete(HomeModel).where(HomeModel.id == home_id)
+        if expected_updated_at is not None:
+            statement = statement.where(HomeModel.updated_at == expected_updated_at)
+
         try:
-            db_home = self.db.query(HomeModel).filter(HomeModel.id == home_id).first()
-            if db_home:
-                self.db.delete(db_home)
-                self.db.commit()
-                return True
-            return False
+            result = await self.db.execute(statement)
+            if result.rowcount == 0:
+                await self.db.rollback()
+                if expected_updated_at is None:
+                    return False
+                error = await self._version_error(home_id)
+                if isinstance(error, HomeNotFoundError):
+                    return False
+                raise error
+            await self.db.commit()
+            return True
         except SQLAlchemyError as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Database error deleting home {home_id}: {str(e)}", exc_info=True)
             raise DomainError(f"Failed to delete home profile") from e
 
+    async def _version_error(self, home_id: str) -> DomainError:
+        """Why a conditional write matched no row: the home is gone, or it changed in the meantime."""
+        current = await self.db.scalar(select(HomeModel.updated_at).where(HomeModel.id == home_id))
+        if current is None:
+            return HomeNotFoundError(home_id)
+        return HomeVersionConflictError(home_id, current)
+
+    async def create_many(self, homes: List[HomeProfile]) -> int:
+        """Insert many home profiles with one executemany statement in a single transaction."""
+        now = datetime.utcnow()
+        rows = []
+        for home in homes:
+            home.id = str(uuid.uuid4())
+            home.created_at = now
+            home.updated_at = now
+            rows.append(home.model_dump())
+
+        try:
+            await self.db.execute(insert(HomeModel), rows)
+            await self.db.commit()
+            return len(rows)
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.error(f"Database error bulk creating {len(rows)} homes: {str(e)}", exc_info=True)
+            raise DomainError("Failed to create home profiles") from e
+
+    async def stream_all(self, batch_size: int = 1000) -> AsyncIterator[HomeProfile]:
+        """Yield every home profile, fetching batch_size rows at a time."""
+        try:
+            result = await self.db.stream_scalars(
+                select(HomeModel)
+                .order_by(HomeModel.created_at, HomeModel.id)
+                .execution_options(yield_per=batch_size)
+            )
+            async for db_home in result:
+                yield self._to_entity(db_home)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error streaming homes: {str(e)}", exc_info=True)
+            raise DomainError("Failed to retrieve home profiles") from e
+
+    async def list_page(
+        self,
+        filters: HomeFilter,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: int = 50
+    ) -> List[HomeProfile]:
+        """Keyset page over (created_at, id); cost depends on the page size, not the offset."""
+        query = select(HomeModel)
+        for column in ("heating_type", "insulation_type", "climate_zone", "country", "budget_range"):
+            value = getattr(filters, column)
+            if value is not None:
+                query = query.where(getattr(HomeModel, column) == value)
+        if filters.min_size_sqft is not None:
+            query = query.where(HomeModel.size_sqft >= filters.min_size_sqft)
+        if filters.max_size_sqft is not None:
+            query = query.where(HomeModel.size_sqft <= filters.max_size_sqft)
+        if filters.min_age_years is not None:
+            query = query.where(HomeModel.age_years >= filters.min_age_years)
+        if filters.max_age_years is not None:
+            query = query.where(HomeModel.age_years <= filters.max_age_years)
+        if after is not None:
+            # Row-value comparison lets the (…, created_at, id) indexes seek straight to the key
+            query = query.where(tuple_(HomeModel.created_at, HomeModel.id) > tuple_(*after))
+
+        try:
+            result = await self.db.scalars(
+                query.order_by(HomeModel.created_at, HomeModel.id).limit(limit)
+            )
+            return [self._to_entity(db_home) for db_home in result]
+        except SQLAlchemyError as e:
+            logger.error(f"Database error listing homes: {str(e)}", exc_info=True)
+            raise DomainError("Failed to retrieve home profiles") from e
+
     def _to_entity(self, db_home: HomeModel) -> HomeProfile:
         return HomeProfile(
             id=db_home.id,
@@ -109,3 +199,366 @@ class SQLAlchemyHomeRepository(HomeRepository):
             created_at=db_home.created_at,
             updated_at=db_home.updated_at
         )
+
+
+class SQLAlchemyAdviceRepository(AdviceRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, advice: EnergyAdvice, home: HomeProfile, cache_key: Optional[str] = None) -> EnergyAdvice:
+        """Store generated advice together with the profile it was generated for."""
+        db_advice = AdviceModel(
+            id=str(uuid.uuid4()),
+            home_id=advice.home_id,
+            summary=advice.summary,
+            estimated_total_annual_savings=advice.estimated_total_annual_savings,
+            llm_provider=advice.llm_provider,
+            generated_at=advice.generated_at,
+            stored_at=datetime.utcnow(),
+            profile_snapshot=home.model_dump_json(exclude={"id", "created_at", "updated_at"}),
+            cache_key=cache_key,
+            recommendations=[
+                RecommendationModel(position=position, **rec.model_dump(mode="json"))
+                for position, rec in enumerate(advice.recommendations)
+            ]
+        )
+
+        try:
+            self.db.add(db_advice)
+            await self.db.commit()
+            return advice
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.error(f"Database error saving advice for home {advice.home_id}: {str(e)}", exc_info=True)
+            raise DomainError("Failed to save energy advice") from e
+
+    async def get_latest(self, home_id: str) -> Optional[EnergyAdvice]:
+        """Most recently stored advice for a home."""
+        advice = await self.list_by_home(home_id, offset=0, limit=1)
+        return advice[0] if advice else None
+
+    async def get_latest_stored(self, home_id: str) -> Optional[StoredAdvice]:
+        """Most recently stored advice for a home, with the profile snapshot stored with it."""
+        db_advice = await self._list_models(home_id, offset=0, limit=1)
+        if not db_advice:
+            return None
+        return StoredAdvice(
+            id=db_advice[0].id,
+            advice=self._to_entity(db_advice[0]),
+            profile=HomeProfile.model_validate_json(db_advice[0].profile_snapshot),
+            cache_key=db_advice[0].cache_key,
+            stored_at=db_advice[0].stored_at
+        )
+
+    async def list_by_home(self, home_id: str, offset: int = 0, limit: int = 20) -> List[EnergyAdvice]:
+        """Advice history for a home, newest first."""
+        return [self._to_entity(db_advice) for db_advice in await self._list_models(home_id, offset, limit)]
+
+    async def _list_models(self, home_id: str, offset: int, limit: int) -> List[AdviceModel]:
+        try:
+            # Served by ix_advice_home_stored_at; recommendations load in one extra IN query
+            result = await self.db.execute(
+                select(AdviceModel)
+                .where(AdviceModel.home_id == home_id)
+                .order_by(AdviceModel.stored_at.desc())
+                .offset(offset)
+                .limit(limit)
+            )
+            return list(result.scalars())
+        except SQLAlchemyError as e:
+            logger.error(f"Database error fetching advice for home {home_id}: {str(e)}", exc_info=True)
+            raise DomainError("Failed to retrieve energy advice") from e
+
+    async def count_by_home(self, home_id: str) -> int:
+        try:
+            return await self.db.scalar(
+                select(func.count()).select_from(AdviceModel).where(AdviceModel.home_id == home_id)
+            )
+        except SQLAlchemyError as e:
+            logger.error(f"Database error counting advice for home {home_id}: {str(e)}", exc_info=True)
+            raise DomainError("Failed to retrieve energy advice") from e
+
+    def _to_entity(self, db_advice: AdviceModel) -> EnergyAdvice:
+        return EnergyAdvice(
+            home_id=db_advice.home_id,
+            recommendations=[
+                Recommendation(
+                    title=db_rec.title,
+                    description=db_rec.description,
+                    priority=db_rec.priority,
+                    category=db_rec.category,
+                    estimated_savings_annual=db_rec.estimated_savings_annual,
+                    estimated_cost=db_rec.estimated_cost,
+                    payback_period_years=db_rec.payback_period_years,
+                    implementation_difficulty=db_rec.implementation_difficulty
+                )
+                for db_rec in db_advice.recommendations
+            ],
+            summary=db_advice.summary,
+            estimated_total_annual_savings=db_advice.estimated_total_annual_savings,
+            generated_at=db_advice.generated_at,
+            llm_provider=db_advice.llm_provider
+        )
+
+
+class SQLAlchemyBatchJobRepository(BatchJobRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, home_ids: List[str]) -> BatchJob:
+        """Create a batch job and one pending item per home in a single transaction."""
+        now = datetime.utcnow()
+        db_job = BatchJobModel(
+            id=str(uuid.uuid4()),
+            status=BatchJobStatus.PENDING.value,
+            total_items=len(home_ids),
+            completed_items=0,
+            failed_items=0,
+            created_at=now,
+            updated_at=now
+        )
+
+        try:
+            self.db.add(db_job)
+            await self.db.flush()
+            await self.db.execute(
+                insert(BatchJobItemModel),
+                [
+                    {
+                        "job_id": db_job.id,
+                        "position": position,
+                        "home_id": home_id,
+                        "status": BatchItemStatus.PENDING.value
+                    }
+                    for position, home_id in enumerate(home_ids)
+                ]
+            )
+            await self.db.commit()
+            return self._to_job_entity(db_job)
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.error(f"Database error creating batch job: {str(e)}", exc_info=True)
+            raise DomainError("Failed to create batch job") from e
+
+    async def get_by_id(self, job_id: str) -> Optional[BatchJob]:
+        """Retrieve a batch job with its progress counters."""
+        try:
+            db_job = await self.db.get(BatchJobModel, job_id, populate_existing=True)
+            return self._to_job_entity(db_job) if db_job else None
+        except SQLAlchemyError as e:
+            logger.error(f"Database error fetching batch job {job_id}: {str(e)}", exc_info=True)
+            raise DomainError("Failed to retrieve batch job") from e
+
+    async def list_unfinished(self) -> List[BatchJob]:
+        """Jobs that still have pending items, oldest first."""
+        try:
+            result = await self.db.execute(
+                select(BatchJobModel)
+                .where(BatchJobModel.status != BatchJobStatus.COMPLETED.value)
+                .order_by(BatchJobModel.created_at)
+            )
+            return [self._to_job_entity(db_job) for db_job in result.scalars()]
+        except SQLAlchemyError as e:
+            logger.error(f"Database error listing unfinished batch jobs: {str(e)}", exc_info=True)
+            raise DomainError("Failed to list batch jobs") from e
+
+    async def get_items(
+        self,
+        job_id: str,
+        offset: int = 0,
+        limit: int = 100,
+        finished_only: bool = False
+    ) -> List[BatchJobItem]:
+        """Retrieve a page of items in submission order."""
+        query = select(BatchJobItemModel).where(BatchJobItemModel.job_id == job_id)
+        if finished_only:
+            query = query.where(BatchJobItemModel.status != BatchItemStatus.PENDING.value)
+
+        try:
+            result = await self.db.execute(
+                query.order_by(BatchJobItemModel.position).offset(offset).limit(limit)
+            )
+            return [self._to_item_entity(db_item) for db_item in result.scalars()]
+        except SQLAlchemyError as e:
+            logger.error(f"Database error fetching items of batch job {job_id}: {str(e)}", exc_info=True)
+            raise DomainError("Failed to retrieve batch job items") from e
+
+    async def get_pending_items(self, job_id: str) -> List[BatchJobItem]:
+        """Items not yet completed or failed, in submission order."""
+        try:
+            result = await self.db.execute(
+                select(BatchJobItemModel)
+                .where(
+                    BatchJobItemModel.job_id == job_id,
+                    BatchJobItemModel.status == BatchItemStatus.PENDING.value
+                )
+                .order_by(BatchJobItemModel.position)
+            )
+            return [self._to_item_entity(db_item) for db_item in result.scalars()]
+        except SQLAlchemyError as e:
+            logger.error(f"Database error fetching pending items of batch job {job_id}: {str(e)}", exc_info=True)
+            raise DomainError("Failed to retrieve batch job items") from e
+
+    async def complete_item(self, job_id: str, position: int, advice: EnergyAdvice) -> BatchJobItem:
+        """Store the generated advice for an item and advance the job's progress."""
+        return await self._finish_item(
+            job_id,
+            position,
+            BatchItemStatus.COMPLETED,
+            result=advice.model_dump_json(),
+            counter=BatchJobModel.completed_items
+        )
+
+    async def fail_item(self, job_id: str, position: int, error: str) -> BatchJobItem:
+        """Record why an item failed and advance the job's progress."""
+        return await self._finish_item(
+            job_id,
+            position,
+            BatchItemStatus.FAILED,
+            error=error,
+            counter=BatchJobModel.failed_items
+        )
+
+    async def _finish_item(
+        self,
+        job_id: str,
+        position: int,
+        status: BatchItemStatus,
+        counter,
+        result: Optional[str] = None,
+        error: Optional[str] = None
+    ) -> BatchJobItem:
+        now = datetime.utcnow()
+        try:
+            # Only a pending item can finish, so a resumed job never double counts
+            item_update = await self.db.execute(
+                update(BatchJobItemModel)
+                .where(
+                    BatchJobItemModel.job_id == job_id,
+                    BatchJobItemModel.position == position,
+                    BatchJobItemModel.status == BatchItemStatus.PENDING.value
+                )
+                .values(status=status.value, result=result, error=error, completed_at=now)
+            )
+            if item_update.rowcount:
+                # Counters are incremented in SQL so concurrent workers never lose an update
+                finished = BatchJobModel.completed_items + BatchJobModel.failed_items + 1
+                await self.db.execute(
+                    update(BatchJobModel)
+                    .where(BatchJobModel.id == job_id)
+                    .values(
+                        {
+                            counter: counter + 1,
+                            BatchJobModel.status: case(
+                                (finished >= BatchJobModel.total_items, BatchJobStatus.COMPLETED.value),
+                                else_=BatchJobStatus.RUNNING.value
+                            ),
+                            BatchJobModel.updated_at: now
+                        }
+                    )
+                )
+            await self.db.commit()
+
+            db_item = await self.db.get(BatchJobItemModel, (job_id, position), populate_existing=True)
+            return self._to_item_entity(db_item)
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.error(f"Database error finishing item {position} of batch job {job_id}: {str(e)}", exc_info=True)
+            raise DomainError("Failed to update batch job item") from e
+
+    def _to_job_entity(self, db_job: BatchJobModel) -> BatchJob:
+        return BatchJob(
+            id=db_job.id,
+            status=db_job.status,
+            total_items=db_job.total_items,
+            completed_items=db_job.completed_items,
+            failed_items=db_job.failed_items,
+            created_at=db_job.created_at,
+            updated_at=db_job.updated_at
+        )
+
+    def _to_item_entity(self, db_item: BatchJobItemModel) -> BatchJobItem:
+        return BatchJobItem(
+            job_id=db_item.job_id,
+            position=db_item.position,
+            home_id=db_item.home_id,
+            status=db_item.status,
+            advice=EnergyAdvice.model_validate_json(db_item.result) if db_item.result else None,
+            error=db_item.error,
+            completed_at=db_item.completed_at
+        )
+
+
+class SQLAlchemyFleetRepository(FleetRepository):
+    # HomeModel columns exported to fleet analytics
+    HOME_COLUMNS = (
+        "size_sqft",
+        "age_years",
+        "heating_type",
+        "insulation_type",
+        "climate_zone",
+        "country",
+        "budget_range",
+        "avg_monthly_energy_cost",
+    )
+
+    def __init__(self, db: AsyncSession, batch_size: int = 10_000):
+        self.db = db
+        self.batch_size = batch_size
+
+    async def get_data_version(self) -> str:
+        try:
+            row = (await self.db.execute(select(
+                select(func.count()).select_from(HomeModel).scalar_subquery(),
+                select(func.max(HomeModel.updated_at)).scalar_subquery(),
+                select(func.count()).select_from(AdviceModel).scalar_subquery(),
+                select(func.max(AdviceModel.stored_at)).scalar_subquery()
+            ))).one()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error reading fleet data version: {str(e)}", exc_info=True)
+            raise DomainError("Failed to read fleet data version") from e
+        return ":".join("" if value is None else str(value) for value in row)
+
+    async def load_columns(self) -> Dict[str, List[Any]]:
+        latest = (
+            select(AdviceModel.home_id, func.max(AdviceModel.stored_at).label("stored_at"))
+            .group_by(AdviceModel.home_id)
+            .subquery()
+        )
+        totals = (
+            select(
+                RecommendationModel.advice_id,
+                func.sum(RecommendationModel.estimated_cost).label("investment"),
+                func.sum(RecommendationModel.estimated_savings_annual).label("savings")
+            )
+            .group_by(RecommendationModel.advice_id)
+            .subquery()
+        )
+        query = (
+            select(
+                *(getattr(HomeModel, column) for column in self.HOME_COLUMNS),
+                func.coalesce(AdviceModel.estimated_total_annual_savings, totals.c.savings).label("annual_savings"),
+                totals.c.investment.label("investment")
+            )
+            .outerjoin(latest, latest.c.home_id == HomeModel.id)
+            .outerjoin(
+                AdviceModel,
+                (AdviceModel.home_id == latest.c.home_id) & (AdviceModel.stored_at == latest.c.stored_at)
+            )
+            .outerjoin(totals, totals.c.advice_id == AdviceModel.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+
+        names = [*self.HOME_COLUMNS, "annual_savings", "investment"]
+        columns: Dict[str, List[Any]] = {name: [] for name in names}
+        appenders = [columns[name].append for name in names]
+        try:
+            result = await self.db.stream(query)
+            async for partition in result.partitions():
+                for row in partition:
+                    for append, value in zip(appenders, row):
+                        append(value)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error loading fleet data: {str(e)}", exc_info=True)
+            raise DomainError("Failed to load fleet data") from e
+        return columns
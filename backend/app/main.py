@@ -3,20 +3,36 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 import logging
-import sys
 from app.config import settings
-from app.infrastructure.database import init_db
+from app.infrastructure.logging_config import configure_logging, stop_logging
+from app.infrastructure.database import init_db, close_db
+from app.infrastructure.llm.guarded_provider import CircuitState
 from app.api.home_routes import router as homes_router
 from app.api.advice_routes import router as advice_router
+from app.api.batch_routes import router as batch_router
+from app.api.metrics_routes import router as metrics_router
+from app.api.health_routes import router as health_router
+from app.api.analytics_routes import router as analytics_router
+from app.api.advice_dependencies import (
+    get_llm_provider,
+    close_llm_provider,
+    close_advice_cache,
+    get_model_warmer,
+    start_model_warmer,
+    stop_model_warmer
+)
+from app.api.batch_dependencies import start_batch_scheduler, stop_batch_scheduler
+from app.api.health_dependencies import start_health_monitor, stop_health_monitor
+from app.api.middleware import CorrelationIdMiddleware, CORRELATION_ID_HEADER
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('app.log')
-    ]
+configure_logging(
+    level=settings.LOG_LEVEL,
+    json_format=settings.LOG_FORMAT.lower() == "json",
+    log_file=settings.LOG_FILE or None,
+    max_bytes=settings.LOG_FILE_MAX_BYTES,
+    backup_count=settings.LOG_FILE_BACKUP_COUNT,
+    queue_size=settings.LOG_QUEUE_SIZE
 )
 
 logger = logging.getLogger(__name__)
@@ -34,6 +50,14 @@ app = FastAPI(
             "name": "energy-advice",
             "description": "AI-powered energy efficiency recommendations"
         },
+        {
+            "name": "batch-advice",
+            "description": "Bulk energy advice generation for many homes"
+        },
+        {
+            "name": "fleet-analytics",
+            "description": "Aggregate savings analytics across all stored homes"
+        },
         {
             "name": "health",
             "description": "API health and status endpoints"
@@ -47,7 +71,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CORRELATION_ID_HEADER],
 )
+app.add_middleware(CorrelationIdMiddleware)
 
 
 @app.exception_handler(RequestValidationError)
@@ -70,10 +96,26 @@ async def validation_exception_handler(request, exc):
 
 
 @app.on_event("startup")
-def on_startup():
+async def on_startup():
     logger.info("Starting Home Energy Advisor API...")
-    init_db()
+    await init_db()
     logger.info("Database initialized successfully")
+    await start_batch_scheduler()
+    # In the background: readiness stays false until the model is loaded
+    await start_model_warmer()
+    await start_health_monitor()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    logger.info("Shutting down Home Energy Advisor API...")
+    await stop_health_monitor()
+    await stop_model_warmer()
+    await stop_batch_scheduler()
+    await close_llm_provider()
+    await close_advice_cache()
+    await close_db()
+    stop_logging()
 
 
 @app.get("/", tags=["health"])
@@ -87,8 +129,18 @@ async def root():
 
 @app.get("/health", tags=["health"])
 async def health_check():
-    return {"status": "healthy"}
+    llm = get_llm_provider().status()
+    # Still up while the circuit is open: advice falls back to rule-based results
+    degraded = llm.get("circuit", {}).get("state") == CircuitState.OPEN.value
+    status = {"status": "degraded" if degraded else "healthy", "llm": llm}
+    if settings.LLM_WARMUP_ENABLED:
+        status["warm_up"] = get_model_warmer().status()
+    return status
 
 
 app.include_router(homes_router, prefix=settings.API_V1_PREFIX)
 app.include_router(advice_router, prefix=settings.API_V1_PREFIX)
+app.include_router(batch_router, prefix=settings.API_V1_PREFIX)
+app.include_router(analytics_router, prefix=settings.API_V1_PREFIX)
+app.include_router(metrics_router)
+app.include_router(health_router)
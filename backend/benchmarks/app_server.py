@@ -0,0 +1,63 @@
+"""Run app.main:app with uvicorn in a child process for end-to-end benchmarks."""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+class AppServer:
+    """
+    Starts the API against a throwaway SQLite database.
+
+    Extra environment variables override Settings, e.g. {"OLLAMA_BASE_URL": stub.base_url}.
+    """
+
+    def __init__(self, env: Optional[Dict[str, str]] = None, host: str = "127.0.0.1", port: int = 8100):
+        self.host = host
+        self.port = port
+        self._workdir = tempfile.TemporaryDirectory(prefix="hea-bench-")
+        self._env = {
+            **os.environ,
+            "PYTHONPATH": str(BACKEND_DIR),
+            "DATABASE_URL": f"sqlite:///{self._workdir.name}/bench.db",
+            "ADVICE_CACHE_SQLITE_PATH": f"{self._workdir.name}/advice_cache.db",
+            **(env or {})
+        }
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def __enter__(self) -> "AppServer":
+        self._process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "app.main:app",
+                "--host", self.host, "--port", str(self.port), "--log-level", "warning"
+            ],
+            cwd=self._workdir.name,
+            env=self._env,
+            stdout=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + 20
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection((self.host, self.port), timeout=0.1):
+                    return self
+            except OSError:
+                time.sleep(0.1)
+        self.__exit__()
+        raise RuntimeError(f"API server did not start on {self.base_url}")
+
+    def __exit__(self, *exc) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+            self._process = None
+        self._workdir.cleanup()
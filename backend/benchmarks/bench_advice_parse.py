@@ -0,0 +1,138 @@
+"""
+CPU cost of turning LLM output into an advice response, and of serving a
+cached advice: the previous path (json.loads, dict fix-ups, Recommendation(**),
+copy into DTOs, FastAPI re-validating and encoding the DTO) vs. the single
+model_validate_json pass with direct model_dump_json serialization.
+
+Usage (from backend/):
+    python -m benchmarks.bench_advice_parse --iterations 5000
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Callable
+from fastapi.encoders import jsonable_encoder
+from app.application.advice_dtos import EnergyAdviceResponse, RecommendationResponse
+from app.application.advice_parsing import LLMAdviceOutput
+from app.domain.value_objects import EnergyAdvice, Recommendation
+from benchmarks.stub_ollama import STUB_ADVICE
+
+HOME_ID = "365eb1e5-4ffb-442e-9847-7477c8b73b37"
+FINANCIAL_FIELDS = ["estimated_savings_annual", "estimated_cost", "payback_period_years"]
+
+
+def llm_output(recommendations: int) -> str:
+    stub_recs = STUB_ADVICE["recommendations"]
+    recs = [dict(stub_recs[i % len(stub_recs)], title=f"Recommendation {i}") for i in range(recommendations)]
+    # LLMs write 0 for unknown figures; this one exercises the zero-to-None and savings derivation rules
+    recs[0] = {**recs[0], "estimated_savings_annual": 0}
+    return json.dumps({**STUB_ADVICE, "recommendations": recs, "estimated_total_annual_savings": None})
+
+
+def legacy_parse(raw: str) -> EnergyAdvice:
+    data = json.loads(raw.strip())
+    recommendations = []
+    for rec_data in data.get("recommendations", []):
+        for field in FINANCIAL_FIELDS:
+            if rec_data.get(field) is not None and rec_data.get(field) <= 0:
+                rec_data[field] = None
+        if rec_data.get("estimated_savings_annual") is None:
+            cost, payback = rec_data.get("estimated_cost"), rec_data.get("payback_period_years")
+            if cost is not None and payback is not None and payback > 0:
+                rec_data["estimated_savings_annual"] = cost / payback
+        recommendations.append(Recommendation(**rec_data))
+    total = data.get("estimated_total_annual_savings")
+    if total is None or total <= 0:
+        total = sum(r.estimated_savings_annual for r in recommendations if r.estimated_savings_annual is not None)
+    return EnergyAdvice(
+        home_id=HOME_ID,
+        recommendations=recommendations,
+        summary=data.get("summary", ""),
+        estimated_total_annual_savings=total or None,
+        generated_at=datetime.utcnow(),
+        llm_provider="ollama-llama3.2"
+    )
+
+
+def legacy_serialize(advice: EnergyAdvice) -> bytes:
+    dto = EnergyAdviceResponse(
+        home_id=advice.home_id,
+        recommendations=[
+            RecommendationResponse(
+                title=rec.title,
+                description=rec.description,
+                priority=rec.priority,
+                category=rec.category,
+                estimated_savings_annual=rec.estimated_savings_annual,
+                estimated_cost=rec.estimated_cost,
+                payback_period_years=rec.payback_period_years,
+                implementation_difficulty=rec.implementation_difficulty
+            )
+            for rec in advice.recommendations
+        ],
+        summary=advice.summary,
+        estimated_total_annual_savings=advice.estimated_total_annual_savings,
+        generated_at=advice.generated_at,
+        llm_provider=advice.llm_provider
+    )
+    # What FastAPI's serialize_response does with a returned model and a response_model
+    validated = EnergyAdviceResponse.model_validate(dto.model_dump())
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def single_pass_parse(raw: str) -> EnergyAdvice:
+    output = LLMAdviceOutput.model_validate_json(raw)
+    return EnergyAdvice.model_construct(
+        home_id=HOME_ID,
+        recommendations=output.recommendations,
+        summary=output.summary,
+        estimated_total_annual_savings=output.estimated_total_annual_savings,
+        generated_at=datetime.utcnow(),
+        llm_provider="ollama-llama3.2"
+    )
+
+
+def direct_serialize(advice: EnergyAdvice) -> bytes:
+    return advice.model_dump_json().encode()
+
+
+def measure(label: str, work: Callable[[], object], iterations: int) -> float:
+    work()  # Warm up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        work()
+    per_call_us = (time.perf_counter() - started) / iterations * 1e6
+    print(f"{label:<28} {per_call_us:8.1f} µs/response")
+    return per_call_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--recommendations", type=int, default=8)
+    args = parser.parse_args()
+
+    raw = llm_output(args.recommendations)
+    single_pass_advice = single_pass_parse(raw)
+    legacy_body = json.loads(legacy_serialize(legacy_parse(raw)))
+    single_pass_body = json.loads(direct_serialize(single_pass_advice))
+    for body in (legacy_body, single_pass_body):
+        del body["generated_at"]
+    assert legacy_body == single_pass_body, "Single-pass parse produces a different response body"
+    # A cache hit deserializes the stored advice and serializes the response
+    cached = single_pass_advice.model_dump_json()
+
+    print("LLM response -> HTTP body")
+    legacy = measure("  legacy", lambda: legacy_serialize(legacy_parse(raw)), args.iterations)
+    single = measure("  single pass", lambda: direct_serialize(single_pass_parse(raw)), args.iterations)
+    print(f"  speedup {legacy / single:21.1f}x")
+
+    print("cache hit -> HTTP body")
+    legacy = measure("  legacy", lambda: legacy_serialize(EnergyAdvice.model_validate_json(cached)), args.iterations)
+    single = measure("  direct", lambda: direct_serialize(EnergyAdvice.model_validate_json(cached)), args.iterations)
+    print(f"  speedup {legacy / single:21.1f}x")
+
+
+if __name__ == "__main__":
+    main()
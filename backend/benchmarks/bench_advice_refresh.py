@@ -0,0 +1,84 @@
+"""
+Cost of updating a home's advice after one profile field changed: a full
+generation (POST /advice) vs. regenerating only the affected categories
+(POST /advice/refresh).
+
+Each home gets advice, then its window_type is changed with PATCH /homes/{id}
+(twice, so both requests are for a profile that was never generated before):
+POST /advice after the first change, POST /advice/refresh after the second.
+The stub Ollama returns only the recommendations of the categories the request
+allows, and takes generation time in proportion to what it returns.
+
+Usage (from backend/):
+    python -m benchmarks.bench_advice_refresh --homes 10 --generation-seconds 2
+"""
+import argparse
+import statistics
+import time
+from typing import Dict, List
+import httpx
+from benchmarks.app_server import AppServer
+from benchmarks.stub_ollama import StubOllamaServer
+
+HOME = {
+    "size_sqft": 2000,
+    "age_years": 15,
+    "heating_type": "gas",
+    "insulation_type": "moderate",
+    "window_type": "single_pane",
+    "num_floors": 2,
+    "num_occupants": 4
+}
+WINDOW_CHANGES = ("double_pane", "triple_pane")
+
+
+def eval_tokens(client: httpx.Client) -> float:
+    for line in client.get("/metrics").text.splitlines():
+        if line.startswith("ollama_eval_tokens_sum"):
+            return float(line.split()[-1])
+    return 0.0
+
+
+def timed_post(client: httpx.Client, path: str) -> Dict[str, float]:
+    tokens = eval_tokens(client)
+    started = time.perf_counter()
+    response = client.post(path)
+    elapsed = time.perf_counter() - started
+    response.raise_for_status()
+    return {"seconds": elapsed, "tokens": eval_tokens(client) - tokens, "recommendations": len(response.json()["recommendations"])}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--homes", type=int, default=10)
+    parser.add_argument("--generation-seconds", type=float, default=2.0)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--stub-port", type=int, default=11500)
+    args = parser.parse_args()
+
+    results: Dict[str, List[Dict[str, float]]] = {"full": [], "refresh": []}
+    stub = StubOllamaServer(latency_seconds=args.generation_seconds, port=args.stub_port)
+    env = {"OLLAMA_BASE_URL": stub.base_url, "LOG_FILE": ""}
+    with stub, AppServer(env=env, port=args.port) as app, httpx.Client(base_url=app.base_url, timeout=120) as client:
+        for i in range(args.homes):
+            # Distinct profiles, so no request is served from the advice cache
+            home_id = client.post("/api/v1/homes", json={**HOME, "size_sqft": 1000 + i}).json()["id"]
+            client.post(f"/api/v1/homes/{home_id}/advice").raise_for_status()
+            for variant, window_type in zip(("full", "refresh"), WINDOW_CHANGES):
+                client.patch(f"/api/v1/homes/{home_id}", json={"window_type": window_type}).raise_for_status()
+                path = f"/api/v1/homes/{home_id}/advice" + ("/refresh" if variant == "refresh" else "")
+                results[variant].append(timed_post(client, path))
+
+    print(f"window_type change, {args.homes} homes")
+    for variant, rows in results.items():
+        print(
+            f"  {variant:<8} {statistics.mean(row['seconds'] for row in rows):6.2f} s/request   "
+            f"{statistics.mean(row['tokens'] for row in rows):6.0f} output tokens   "
+            f"{statistics.mean(row['recommendations'] for row in rows):4.1f} recommendations"
+        )
+    full, refresh = (statistics.mean(row["seconds"] for row in results[v]) for v in ("full", "refresh"))
+    print(f"  refresh takes {refresh / full:.0%} of a full generation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Time-to-first-recommendation: POST /advice vs. POST /advice/stream.
+
+Usage (from backend/):
+    python -m benchmarks.bench_advice_stream --generation-seconds 5
+"""
+import argparse
+import time
+import httpx
+from benchmarks.app_server import AppServer
+from benchmarks.stub_ollama import StubOllamaServer
+
+HOME = {
+    "size_sqft": 2000,
+    "age_years": 15,
+    "heating_type": "gas",
+    "insulation_type": "moderate",
+    "window_type": "double_pane",
+    "num_floors": 2,
+    "num_occupants": 4
+}
+
+
+def main(args: argparse.Namespace) -> None:
+    with StubOllamaServer(latency_seconds=args.generation_seconds, port=args.stub_port) as stub, \
+            AppServer(env={"OLLAMA_BASE_URL": stub.base_url, "ADVICE_CACHE_BACKEND": "none"}, port=args.port) as app:
+        with httpx.Client(base_url=f"{app.base_url}/api/v1", timeout=120) as client:
+            home_id = client.post("/homes", json=HOME).json()["id"]
+
+            started = time.perf_counter()
+            client.post(f"/homes/{home_id}/advice").raise_for_status()
+            blocking = time.perf_counter() - started
+            print(f"POST /advice         first recommendation after {blocking:6.2f}s")
+
+            started = time.perf_counter()
+            first = None
+            with client.stream("POST", f"/homes/{home_id}/advice/stream") as response:
+                for line in response.iter_lines():
+                    if first is None and '"recommendation"' in line:
+                        first = time.perf_counter() - started
+            total = time.perf_counter() - started
+            print(f"POST /advice/stream  first recommendation after {first:6.2f}s (complete after {total:.2f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--generation-seconds", type=float, default=5.0, help="Simulated full generation time")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--stub-port", type=int, default=11500)
+    main(parser.parse_args())
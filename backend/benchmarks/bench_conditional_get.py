@@ -0,0 +1,64 @@
+"""
+Polling a home and its advice while nothing changes: plain GETs vs. GETs
+revalidated with If-None-Match, which are answered 304 Not Modified without a body.
+
+Usage (from backend/):
+    python -m benchmarks.bench_conditional_get --polls 500
+"""
+import argparse
+import statistics
+import time
+from typing import Dict, List, Optional
+import httpx
+from benchmarks.app_server import AppServer
+from benchmarks.stub_ollama import StubOllamaServer
+
+HOME = {
+    "size_sqft": 2000,
+    "age_years": 15,
+    "heating_type": "gas",
+    "insulation_type": "moderate",
+    "window_type": "double_pane",
+    "num_floors": 2,
+    "num_occupants": 4
+}
+
+
+def poll(client: httpx.Client, paths: List[str], polls: int, conditional: bool) -> Dict[str, float]:
+    etags: Dict[str, Optional[str]] = {path: None for path in paths}
+    latencies: List[float] = []
+    body_bytes = 0
+    for _ in range(polls):
+        for path in paths:
+            headers = {"If-None-Match": etags[path]} if conditional and etags[path] else {}
+            started = time.perf_counter()
+            response = client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code == 200:
+                etags[path] = response.headers.get("etag")
+            body_bytes += len(response.content)
+    return {"ms": statistics.mean(latencies) * 1000, "bytes": body_bytes / len(latencies)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--polls", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--stub-port", type=int, default=11500)
+    args = parser.parse_args()
+
+    stub = StubOllamaServer(port=args.stub_port)
+    with stub, AppServer(env={"OLLAMA_BASE_URL": stub.base_url, "LOG_FILE": ""}, port=args.port) as app, \
+            httpx.Client(base_url=app.base_url, timeout=60) as client:
+        home_id = client.post("/api/v1/homes", json=HOME).json()["id"]
+        client.post(f"/api/v1/homes/{home_id}/advice").raise_for_status()
+        paths = [f"/api/v1/homes/{home_id}", f"/api/v1/homes/{home_id}/advice"]
+
+        print(f"GET home + GET advice, {args.polls} polls each")
+        for label, conditional in (("plain", False), ("etag", True)):
+            result = poll(client, paths, args.polls, conditional)
+            print(f"  {label:<6} {result['ms']:6.2f} ms/request   {result['bytes']:7.0f} body bytes/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Event-loop lag while creating homes: blocking Session (previous repository
+behaviour) vs. the AsyncSession-based SQLAlchemyHomeRepository.
+
+A monitor task sleeps in short intervals and records how late it wakes up;
+every millisecond of lag is a millisecond in which no other request (e.g. one
+waiting on Ollama) could make progress.
+
+Usage (from backend/):
+    python -m benchmarks.bench_event_loop_lag --requests 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.domain.entities import HomeProfile
+from app.infrastructure.database import Base, HomeModel, to_async_url
+from app.infrastructure.repositories import SQLAlchemyHomeRepository
+
+MONITOR_INTERVAL_SECONDS = 0.005
+
+HOME = dict(
+    size_sqft=2000,
+    age_years=15,
+    heating_type="gas",
+    insulation_type="moderate",
+    window_type="double_pane",
+    num_floors=2,
+    num_occupants=4
+)
+
+
+async def monitor_lag(samples: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(MONITOR_INTERVAL_SECONDS)
+        samples.append(loop.time() - started - MONITOR_INTERVAL_SECONDS)
+
+
+async def measure(label: str, create_home, total: int, concurrency: int) -> None:
+    samples: list[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_lag(samples, stop))
+    await asyncio.sleep(0)  # Let the monitor start its first interval
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            await create_home()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+
+    print(
+        f"{label:<14} {total / elapsed:7.1f} creates/s  loop lag "
+        f"p50={percentile(samples, 50) * 1000:8.2f}ms  p99={percentile(samples, 99) * 1000:8.2f}ms  "
+        f"max={max(samples) * 1000:8.2f}ms  ({len(samples)} monitor wake-ups)"
+    )
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        sync_engine = create_engine(f"sqlite:///{workdir}/sync.db")
+        Base.metadata.create_all(sync_engine)
+        SyncSession = sessionmaker(bind=sync_engine)
+
+        async def create_blocking() -> None:
+            # What the repository used to do: a sync commit directly on the event loop
+            db = SyncSession()
+            try:
+                db.add(HomeModel(id=str(uuid.uuid4()), created_at=datetime.utcnow(), updated_at=datetime.utcnow(), **HOME))
+                db.commit()
+            finally:
+                db.close()
+
+        async_engine = create_async_engine(to_async_url(f"sqlite:///{workdir}/async.db"))
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        async def create_async() -> None:
+            async with AsyncSession() as db:
+                await SQLAlchemyHomeRepository(db).create(HomeProfile(**HOME))
+
+        await measure("sync Session", create_blocking, args.requests, args.concurrency)
+        await measure("AsyncSession", create_async, args.requests, args.concurrency)
+
+        sync_engine.dispose()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,105 @@
+"""
+Size of the JSON schema the LLM generates advice against: the full
+EnergyAdvice.model_json_schema() (descriptions, titles, $defs, home_id,
+generated_at, llm_provider) vs. the compact generation schema.
+
+The schema is both Ollama's format (the grammar for constrained decoding) and
+part of the static system prompt. Without --ollama-url only sizes are compared,
+with tokens estimated at 4 characters each. With --ollama-url the same homes are
+generated against a local model with each schema, and prompt/eval token counts
+and durations are read from the metrics the provider records for every call.
+
+Usage (from backend/):
+    python -m benchmarks.bench_generation_schema
+    python -m benchmarks.bench_generation_schema --ollama-url http://localhost:11434 --model llama3.2 --requests 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+from prometheus_client import REGISTRY
+from app.application.advice_parsing import generation_schema, parse_advice_output
+from app.application.prompt_templates import (
+    SYSTEM_MESSAGE,
+    OUTPUT_FORMAT_INSTRUCTIONS,
+    CompiledPromptTemplate
+)
+from app.domain.value_objects import EnergyAdvice
+from app.infrastructure.llm.ollama_provider import OllamaProvider
+from benchmarks.bench_prompt_prefix import make_home
+
+CHARS_PER_TOKEN = 4
+METRICS = ("ollama_prompt_eval_tokens", "ollama_prompt_eval_duration_seconds", "ollama_eval_tokens", "ollama_eval_duration_seconds")
+
+
+def template(schema: Dict[str, Any]) -> CompiledPromptTemplate:
+    return CompiledPromptTemplate(SYSTEM_MESSAGE, OUTPUT_FORMAT_INSTRUCTIONS, schema, prompt_version="bench")
+
+
+def compare_sizes(variants: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'':<8} {'schema chars':>12} {'~tokens':>8} {'system prompt chars':>20} {'~tokens':>8}")
+    for label, schema in variants.items():
+        text = json.dumps(schema, sort_keys=True)
+        prompt = template(schema).system_message.content
+        print(
+            f"{label:<8} {len(text):12d} {len(text) // CHARS_PER_TOKEN:8d} "
+            f"{len(prompt):20d} {len(prompt) // CHARS_PER_TOKEN:8d}"
+        )
+
+
+def metric_totals(model: str) -> Tuple[float, ...]:
+    labels = {"model": model}
+    return tuple(REGISTRY.get_sample_value(f"{name}_sum", labels) or 0.0 for name in METRICS)
+
+
+async def generate(label: str, schema: Dict[str, Any], args: argparse.Namespace) -> None:
+    compiled = template(schema)
+    provider = OllamaProvider(base_url=args.ollama_url, model=args.model, timeout=600)
+    rows: List[Tuple[float, ...]] = []
+    invalid = 0
+    try:
+        for i in range(args.requests):
+            before = metric_totals(args.model)
+            started = time.perf_counter()
+            text = await provider.generate_completion(
+                compiled.render(make_home(i)),
+                temperature=args.temperature,
+                response_format=compiled.response_schema
+            )
+            wall = time.perf_counter() - started
+            rows.append((wall, *(after - b for after, b in zip(metric_totals(args.model), before))))
+            try:
+                parse_advice_output(text)
+            except ValueError:
+                invalid += 1
+    finally:
+        await provider.aclose()
+
+    wall, prompt_tokens, prompt_seconds, eval_tokens, eval_seconds = (statistics.mean(column) for column in zip(*rows))
+    print(
+        f"{label:<8} prompt {rows[0][1]:6.0f} tokens (first) {prompt_seconds * 1000:7.0f} ms (mean)   "
+        f"output {eval_tokens:6.0f} tokens {eval_tokens / eval_seconds:6.1f} tokens/s   "
+        f"request {wall:6.2f} s   invalid {invalid}/{len(rows)}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ollama-url", default=None, help="Local Ollama to measure generation against")
+    parser.add_argument("--model", default="llama3.2")
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--temperature", type=float, default=0.0)
+    args = parser.parse_args()
+
+    variants = {"full": EnergyAdvice.model_json_schema(), "compact": generation_schema()}
+    compare_sizes(variants)
+    if args.ollama_url:
+        print(f"generation with {args.model} ({args.requests} homes each)")
+        for label, schema in variants.items():
+            await generate(label, schema, args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
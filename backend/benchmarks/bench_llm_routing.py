@@ -0,0 +1,130 @@
+"""
+Route LLM calls over several stub Ollama nodes with RoutingProvider.
+
+Each stub serves OLLAMA_NUM_PARALLEL-style limited slots, so a single node
+queues once its slots are full. Scenarios:
+  balance   one node vs. all nodes behind least-outstanding routing
+  slow      one node is several times slower and receives less traffic
+  tail      a few calls on every node straggle; hedging off vs. on
+  failover  one node is down; calls fail over and the node is ejected
+
+Usage (from backend/):
+    python -m benchmarks.bench_llm_routing --nodes 3 --parallel 4 --requests 300
+"""
+import argparse
+import asyncio
+import contextlib
+import statistics
+import time
+from typing import Dict, List
+from app.infrastructure.llm.ollama_provider import OllamaProvider
+from app.infrastructure.llm.routing_provider import RoutingProvider
+from app.infrastructure.llm.types import ChatMessage
+from benchmarks.stub_ollama import StubOllamaServer
+
+MESSAGES = [
+    ChatMessage(role="system", content="You are an energy advisor."),
+    ChatMessage(role="user", content="Home Profile: ...")
+]
+# Nothing listens here; used as the dead node in the failover scenario
+DEAD_NODE_URL = "http://127.0.0.1:9"
+
+
+def make_router(urls: List[str], **kwargs) -> RoutingProvider:
+    providers: Dict[str, OllamaProvider] = {
+        url: OllamaProvider(base_url=url, retry_attempts=1) for url in urls
+    }
+    return RoutingProvider(providers, **kwargs)
+
+
+async def run(label: str, provider, total: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one() -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await provider.generate_completion(MESSAGES)
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:<24} rps={total / elapsed:7.1f}  p50={quantiles[49] * 1000:7.1f}ms  "
+        f"p99={quantiles[98] * 1000:7.1f}ms  errors={errors}"
+    )
+    if isinstance(provider, RoutingProvider):
+        print(" " * 24 + " dispatched: " + ", ".join(
+            f"{node.name.rsplit(':', 1)[-1]}={node.dispatched}{'' if node.healthy else ' (ejected)'}"
+            for node in provider.nodes
+        ))
+
+
+async def main(args: argparse.Namespace) -> None:
+    latency = args.latency_ms / 1000
+    ports = [args.port + i for i in range(args.nodes)]
+    concurrency = args.parallel * args.nodes * 2
+
+    with contextlib.ExitStack() as stack:
+        print("== balance ==")
+        servers = [
+            stack.enter_context(StubOllamaServer(latency_seconds=latency, port=port, parallel=args.parallel))
+            for port in ports
+        ]
+        urls = [server.base_url for server in servers]
+        single = OllamaProvider(base_url=urls[0])
+        await run("single node", single, args.requests, concurrency)
+        await single.aclose()
+        router = make_router(urls, hedge=False)
+        await run(f"{args.nodes} nodes, routed", router, args.requests, concurrency)
+        await router.aclose()
+
+        print("== slow ==")
+        slow = stack.enter_context(StubOllamaServer(
+            latency_seconds=latency * args.slow_factor, port=args.port + args.nodes, parallel=args.parallel
+        ))
+        router = make_router(urls[:-1] + [slow.base_url], hedge=False)
+        await run("one slow node", router, args.requests, concurrency)
+        await router.aclose()
+
+        print("== tail ==")
+        tail_urls = [
+            stack.enter_context(StubOllamaServer(
+                latency_seconds=latency,
+                port=args.port + args.nodes + 1 + i,
+                parallel=args.parallel,
+                straggler_rate=args.straggler_rate,
+                straggler_factor=args.slow_factor
+            )).base_url
+            for i in range(args.nodes)
+        ]
+        for hedge in (False, True):
+            router = make_router(tail_urls, hedge=hedge, hedge_min_delay=latency * 1.2)
+            # Leave spare slots for the hedged copies
+            await run(f"hedging {'on' if hedge else 'off'}", router, args.requests, args.nodes * args.parallel // 2)
+            await router.aclose()
+
+        print("== failover ==")
+        router = make_router(urls[:-1] + [DEAD_NODE_URL], hedge=False)
+        await run("one node down", router, args.requests, concurrency)
+        await router.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--parallel", type=int, default=4, help="Concurrent generations per stub node")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Simulated generation time")
+    parser.add_argument("--slow-factor", type=float, default=5.0, help="How much slower slow calls are")
+    parser.add_argument("--straggler-rate", type=float, default=0.03, help="Share of straggling calls (tail)")
+    parser.add_argument("--port", type=int, default=11510)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,330 @@
+"""
+End-to-end load scenarios against app.main:app (uvicorn) and a stub Ollama server.
+
+Scenarios:
+  create-storm   concurrent POST /homes
+  advice-fanout  many distinct homes, each asking for advice several times at once
+  mixed          weighted mix of reads, writes and (mostly cached) advice requests
+
+Reports RPS, p50/p95/p99 latency and error rate per operation and writes them,
+with the git commit and configuration, to benchmarks/results/ as JSON. Pass
+--baseline with an earlier results file to print the change per operation.
+
+Usage (from backend/):
+    python -m benchmarks.bench_load --scenario mixed --duration 20 --concurrency 32
+    python -m benchmarks.bench_load --scenario advice-fanout --malformed-rate 0.05 \\
+        --baseline benchmarks/results/advice-fanout-<commit>-<time>.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import httpx
+from benchmarks.app_server import AppServer, BACKEND_DIR
+from benchmarks.stub_ollama import StubOllamaServer
+
+RESULTS_DIR = BACKEND_DIR / "benchmarks" / "results"
+
+HEATING_TYPES = ("gas", "electric", "oil", "heat_pump")
+INSULATION_TYPES = ("none", "basic", "moderate", "good", "excellent")
+CLIMATE_ZONES = ("cold", "marine", "mixed_humid", "hot_dry")
+
+# Operation -> weight for the mixed scenario
+MIXED_WEIGHTS = {
+    "get_home": 40,
+    "list_homes": 15,
+    "get_advice": 15,
+    "create_home": 10,
+    "generate_advice": 15,
+    "advice_history": 5,
+}
+
+
+def random_home(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "size_sqft": rng.randint(600, 4000),
+        "age_years": rng.randint(0, 120),
+        "heating_type": rng.choice(HEATING_TYPES),
+        "insulation_type": rng.choice(INSULATION_TYPES),
+        "window_type": "double_pane",
+        "num_floors": rng.randint(1, 3),
+        "num_occupants": rng.randint(1, 6),
+        "climate_zone": rng.choice(CLIMATE_ZONES),
+        "avg_monthly_energy_cost": round(rng.uniform(60, 400), 2),
+    }
+
+
+class Recorder:
+    """Latency and outcome per operation; non-2xx responses and exceptions count as errors."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def call(self, operation: str, request: Awaitable[httpx.Response]) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError as e:
+            self.latencies[operation].append(time.perf_counter() - started)
+            self.errors[operation] += 1
+            self.statuses[operation][type(e).__name__] += 1
+            return None
+        self.latencies[operation].append(time.perf_counter() - started)
+        self.statuses[operation][str(response.status_code)] += 1
+        if not response.is_success:
+            self.errors[operation] += 1
+        return response
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        operations = {
+            operation: _summarize(latencies, self.errors[operation], elapsed, self.statuses[operation])
+            for operation, latencies in sorted(self.latencies.items())
+        }
+        all_latencies = [latency for latencies in self.latencies.values() for latency in latencies]
+        total = _summarize(all_latencies, sum(self.errors.values()), elapsed, {})
+        return {"elapsed_seconds": round(elapsed, 2), "total": total, "operations": operations}
+
+
+def _summarize(latencies: List[float], errors: int, elapsed: float, statuses: Dict[str, int]) -> Dict[str, Any]:
+    if len(latencies) >= 2:
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = quantiles[49], quantiles[94], quantiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    summary = {
+        "requests": len(latencies),
+        "errors": errors,
+        "error_rate": round(errors / len(latencies), 4) if latencies else 0.0,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(p50 * 1000, 2),
+        "p95_ms": round(p95 * 1000, 2),
+        "p99_ms": round(p99 * 1000, 2),
+    }
+    if statuses:
+        summary["statuses"] = dict(statuses)
+    return summary
+
+
+async def run_closed_loop(
+    concurrency: int,
+    duration: Optional[float],
+    total: Optional[int],
+    step: Callable[[int], Awaitable[None]]
+) -> float:
+    """concurrency workers call step(i) back to back until duration elapses or total steps ran."""
+    counter = 0
+    stop_at = time.perf_counter() + duration if duration else None
+
+    async def worker() -> None:
+        nonlocal counter
+        while (total is None or counter < total) and (stop_at is None or time.perf_counter() < stop_at):
+            counter += 1
+            await step(counter)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started
+
+
+async def seed_homes(client: httpx.AsyncClient, rng: random.Random, count: int, concurrency: int) -> List[str]:
+    home_ids: List[str] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create() -> None:
+        async with semaphore:
+            response = await client.post("/homes", json=random_home(rng))
+            response.raise_for_status()
+            home_ids.append(response.json()["id"])
+
+    await asyncio.gather(*(create() for _ in range(count)))
+    return home_ids
+
+
+async def scenario_create_storm(client: httpx.AsyncClient, args: argparse.Namespace, recorder: Recorder) -> float:
+    rng = random.Random(args.seed)
+
+    async def step(_: int) -> None:
+        await recorder.call("create_home", client.post("/homes", json=random_home(rng)))
+
+    return await run_closed_loop(args.concurrency, args.duration, args.requests, step)
+
+
+async def scenario_advice_fanout(client: httpx.AsyncClient, args: argparse.Namespace, recorder: Recorder) -> float:
+    rng = random.Random(args.seed)
+    home_ids = await seed_homes(client, rng, args.homes, args.concurrency)
+    # Each home is asked for fanout times in a row, so concurrent duplicates hit single-flight and the cache
+    targets = [home_id for home_id in home_ids for _ in range(args.fanout)]
+    rng.shuffle(targets)
+
+    async def step(i: int) -> None:
+        await recorder.call("generate_advice", client.post(f"/homes/{targets[(i - 1) % len(targets)]}/advice"))
+
+    return await run_closed_loop(args.concurrency, args.duration, args.requests or len(targets), step)
+
+
+async def scenario_mixed(client: httpx.AsyncClient, args: argparse.Namespace, recorder: Recorder) -> float:
+    rng = random.Random(args.seed)
+    home_ids = await seed_homes(client, rng, args.homes, args.concurrency)
+    advised: List[str] = []
+    operations, weights = zip(*MIXED_WEIGHTS.items())
+
+    async def step(_: int) -> None:
+        operation = rng.choices(operations, weights)[0]
+        home_id = rng.choice(home_ids)
+        if operation == "get_home":
+            await recorder.call(operation, client.get(f"/homes/{home_id}"))
+        elif operation == "list_homes":
+            await recorder.call(operation, client.get("/homes", params={"limit": 50}))
+        elif operation == "get_advice":
+            # Only homes that already have advice, so 404s are real errors
+            if advised:
+                await recorder.call(operation, client.get(f"/homes/{rng.choice(advised)}/advice"))
+        elif operation == "create_home":
+            response = await recorder.call(operation, client.post("/homes", json=random_home(rng)))
+            if response is not None and response.is_success:
+                home_ids.append(response.json()["id"])
+        elif operation == "generate_advice":
+            # Mostly homes advised before (cache hits), sometimes a new one (LLM call)
+            target = rng.choice(advised) if advised and rng.random() < args.advice_hit_ratio else home_id
+            response = await recorder.call(operation, client.post(f"/homes/{target}/advice"))
+            if response is not None and response.is_success:
+                advised.append(target)
+        elif operation == "advice_history":
+            await recorder.call(operation, client.get(f"/homes/{home_id}/advice/history"))
+
+    return await run_closed_loop(args.concurrency, args.duration, args.requests, step)
+
+
+SCENARIOS: Dict[str, Callable[[httpx.AsyncClient, argparse.Namespace, Recorder], Awaitable[float]]] = {
+    "create-storm": scenario_create_storm,
+    "advice-fanout": scenario_advice_fanout,
+    "mixed": scenario_mixed,
+}
+
+
+def git_revision() -> Tuple[str, bool]:
+    """Current commit and whether the working tree has uncommitted changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+
+def save_results(results: Dict[str, Any], output: Optional[str]) -> Path:
+    if output:
+        path = Path(output)
+    else:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = RESULTS_DIR / f"{results['scenario']}-{results['git_commit']}-{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+    return path
+
+
+def print_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print(f"{'operation':<16} {'requests':>8} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    rows = list(results["operations"].items()) + [("TOTAL", results["total"])]
+    for operation, stats in rows:
+        print(
+            f"{operation:<16} {stats['requests']:>8} {stats['rps']:>8.1f} {stats['p50_ms']:>9.1f} "
+            f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['error_rate']:>7.1%}"
+        )
+        if baseline is None:
+            continue
+        before = baseline["total"] if operation == "TOTAL" else baseline["operations"].get(operation)
+        if before:
+            print(
+                f"{'  vs baseline':<16} {'':>8} {_delta(stats['rps'], before['rps']):>8} "
+                f"{_delta(stats['p50_ms'], before['p50_ms']):>9} {_delta(stats['p95_ms'], before['p95_ms']):>9} "
+                f"{_delta(stats['p99_ms'], before['p99_ms']):>9} "
+                f"{(stats['error_rate'] - before['error_rate']) * 100:>+6.1f}p"
+            )
+
+
+def _delta(current: float, before: float) -> str:
+    return f"{(current - before) / before:+.0%}" if before else "n/a"
+
+
+async def run_scenario(args: argparse.Namespace, api_url: str) -> Dict[str, Any]:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=f"{api_url}/api/v1", timeout=args.timeout, limits=limits) as client:
+        elapsed = await SCENARIOS[args.scenario](client, args, recorder)
+    return recorder.summary(elapsed)
+
+
+def main(args: argparse.Namespace) -> None:
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+    stub_options = {
+        "parallel": args.stub_parallel,
+        "latency_distribution": args.latency_distribution,
+        "latency_jitter": args.latency_jitter,
+        "straggler_rate": args.straggler_rate,
+        "straggler_factor": args.straggler_factor,
+        "malformed_rate": args.malformed_rate,
+    }
+    app_env = {"ADVICE_CACHE_BACKEND": args.cache_backend, "LOG_FILE": ""}
+    with StubOllamaServer(latency_seconds=args.llm_latency_ms / 1000, port=args.stub_port, **stub_options) as stub, \
+            AppServer(env={"OLLAMA_BASE_URL": stub.base_url, **app_env}, port=args.port) as app:
+        results = asyncio.run(run_scenario(args, app.base_url))
+
+    commit, dirty = git_revision()
+    results = {
+        "scenario": args.scenario,
+        "git_commit": commit,
+        "git_dirty": dirty,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            key: value for key, value in vars(args).items() if key not in ("baseline", "output", "port", "stub_port")
+        },
+        **results,
+    }
+    path = save_results(results, args.output)
+    print_results(results, baseline)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=None, help="Seconds to run (default: until --requests)")
+    parser.add_argument("--requests", type=int, default=None, help="Requests to send (default: 2000 without --duration)")
+    parser.add_argument("--homes", type=int, default=200, help="Homes created before fan-out and mixed runs")
+    parser.add_argument("--fanout", type=int, default=4, help="Advice requests per home in advice-fanout")
+    parser.add_argument("--advice-hit-ratio", type=float, default=0.8, help="Share of mixed advice requests for advised homes")
+    parser.add_argument("--cache-backend", default="memory", help="ADVICE_CACHE_BACKEND for the API under test")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=1)
+    stub = parser.add_argument_group("stub Ollama")
+    stub.add_argument("--llm-latency-ms", type=float, default=200.0, help="Median generation time")
+    stub.add_argument("--latency-distribution", choices=("fixed", "uniform", "lognormal"), default="lognormal")
+    stub.add_argument("--latency-jitter", type=float, default=0.3, help="Uniform spread or lognormal sigma")
+    stub.add_argument("--straggler-rate", type=float, default=0.0)
+    stub.add_argument("--straggler-factor", type=float, default=5.0)
+    stub.add_argument("--malformed-rate", type=float, default=0.0, help="Share of LLM responses that are not valid JSON")
+    stub.add_argument("--stub-parallel", type=int, default=None, help="Concurrent generations (OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--output", help="Results path (default: benchmarks/results/<scenario>-<commit>-<time>.json)")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--stub-port", type=int, default=11500)
+    parsed = parser.parse_args()
+    if parsed.duration is None and parsed.requests is None and parsed.scenario != "advice-fanout":
+        parsed.requests = 2000
+    main(parsed)
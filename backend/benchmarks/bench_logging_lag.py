@@ -0,0 +1,127 @@
+"""
+Event-loop lag during an error storm (Ollama down: every request logs two
+errors with tracebacks), with the previous synchronous StreamHandler +
+FileHandler setup vs. the queue-based pipeline from app.infrastructure.logging_config.
+
+Console output goes to a file so the benchmark does not flood the terminal;
+--sink-latency-ms adds a per-record delay to emulate a slow disk or a blocked
+stdout pipe (e.g. a log collector that is falling behind).
+
+Usage (from backend/):
+    python -m benchmarks.bench_logging_lag --requests 2000 --concurrency 50 --sink-latency-ms 1
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from typing import Callable, List
+from app.domain.exceptions import LLMConnectionError
+from app.infrastructure.logging_config import TEXT_FORMAT, start_queue_logging, stop_logging
+from benchmarks.bench_event_loop_lag import monitor_lag, percentile
+
+logger = logging.getLogger("benchmarks.error_storm")
+
+
+class SlowFileHandler(logging.FileHandler):
+    def __init__(self, filename: str, latency_seconds: float):
+        super().__init__(filename)
+        self.latency_seconds = latency_seconds
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        super().emit(record)
+
+
+def _call_ollama() -> None:
+    raise LLMConnectionError("Failed to connect to Ollama at http://localhost:11434. Please ensure Ollama is running.")
+
+
+def _generate_advice(home_id: str) -> None:
+    try:
+        _call_ollama()
+    except Exception as e:
+        # Same shape as EnergyAdviceService._generate_and_cache
+        logger.error(f"Unexpected error generating advice for home {home_id}: {str(e)}", exc_info=True)
+        raise
+
+
+async def failing_request(index: int) -> None:
+    await asyncio.sleep(0)  # The request handler yields at least once (DB read)
+    try:
+        _generate_advice(f"home-{index}")
+    except LLMConnectionError as e:
+        # Same shape as advice_routes._to_http_exception
+        logger.error(f"LLM connection error for home home-{index}: {str(e)}", exc_info=e)
+
+
+async def measure(label: str, total: int, concurrency: int, flush: Callable[[], None]) -> None:
+    samples: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_lag(samples, stop))
+    await asyncio.sleep(0)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            await failing_request(index)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+    flush()
+
+    print(
+        f"{label:<12} {total / elapsed:9.1f} failed requests/s  loop lag "
+        f"p50={percentile(samples, 50) * 1000:8.2f}ms  p99={percentile(samples, 99) * 1000:8.2f}ms  "
+        f"max={max(samples) * 1000:8.2f}ms"
+    )
+
+
+def configure_sync(workdir: str, latency_seconds: float) -> List[logging.Handler]:
+    """What main.py used to do with logging.basicConfig."""
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    handlers: List[logging.Handler] = [
+        SlowFileHandler(os.path.join(workdir, "console-sync.log"), latency_seconds),
+        SlowFileHandler(os.path.join(workdir, "app-sync.log"), latency_seconds),
+    ]
+    root = logging.getLogger()
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    return handlers
+
+
+async def main(args: argparse.Namespace) -> None:
+    latency_seconds = args.sink_latency_ms / 1000
+    with tempfile.TemporaryDirectory() as workdir:
+        handlers = configure_sync(workdir, latency_seconds)
+        await measure("sync", args.requests, args.concurrency, lambda: None)
+        for handler in handlers:
+            logging.getLogger().removeHandler(handler)
+            handler.close()
+
+        # Same sinks as the sync run, written by the listener thread
+        handlers = [
+            SlowFileHandler(os.path.join(workdir, name), latency_seconds)
+            for name in ("console-queue.log", "app-queue.log")
+        ]
+        for handler in handlers:
+            handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        queue_handler = start_queue_logging(handlers, queue_size=args.queue_size)
+        await measure("queue", args.requests, args.concurrency, stop_logging)
+        print(f"{'':<12} {queue_handler.dropped} records dropped (queue size {args.queue_size})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--sink-latency-ms", type=float, default=0.0)
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,77 @@
+"""
+Compare a client-per-call Ollama request against the pooled OllamaProvider.
+
+Usage (from backend/):
+    python -m benchmarks.bench_ollama_client --concurrency 64 --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+from app.infrastructure.llm.ollama_provider import OllamaProvider
+from app.infrastructure.llm.types import ChatMessage
+from benchmarks.stub_ollama import StubOllamaServer
+
+MESSAGES = [
+    ChatMessage(role="system", content="You are an energy advisor."),
+    ChatMessage(role="user", content="Home Profile: ...")
+]
+
+
+async def per_call_client(base_url: str) -> None:
+    """Previous behaviour: a fresh AsyncClient (and TCP connection) per request."""
+    async with httpx.AsyncClient(timeout=30) as client:
+        response = await client.post(
+            f"{base_url}/api/chat",
+            json={"model": "llama3.2", "messages": [m.model_dump() for m in MESSAGES], "stream": False}
+        )
+        response.raise_for_status()
+
+
+async def run(label: str, call, total: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:<12} rps={total / elapsed:8.1f}  "
+        f"p50={quantiles[49] * 1000:7.2f}ms  p99={quantiles[98] * 1000:7.2f}ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    with StubOllamaServer(latency_seconds=args.latency_ms / 1000, port=args.port) as server:
+        await run("per-call", lambda: per_call_client(server.base_url), args.requests, args.concurrency)
+
+        provider = OllamaProvider(base_url=server.base_url, max_keepalive_connections=args.concurrency)
+        try:
+            # Open the pool's connections before measuring steady state
+            await asyncio.gather(*(provider.generate_completion(MESSAGES) for _ in range(args.concurrency)))
+            await run(
+                "pooled",
+                lambda: provider.generate_completion(MESSAGES),
+                args.requests,
+                args.concurrency
+            )
+        finally:
+            await provider.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated Ollama latency")
+    parser.add_argument("--port", type=int, default=11500)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,121 @@
+"""
+Per-request prompt-building cost: the previous path (fresh builder, `+=` home
+details, EnergyAdvice.model_json_schema() per call) vs. the compiled template.
+The legacy path keeps the old message layout (home details before the instructions).
+
+Usage (from backend/):
+    python -m benchmarks.bench_prompt_build --iterations 20000
+"""
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Tuple
+from app.application.prompt_templates import (
+    SYSTEM_MESSAGE,
+    OUTPUT_FORMAT_INSTRUCTIONS,
+    get_energy_advice_prompt_template
+)
+from app.domain.entities import HomeProfile
+from app.domain.value_objects import EnergyAdvice
+from app.infrastructure.llm.types import ChatMessage
+
+HOME = HomeProfile(
+    size_sqft=2000,
+    age_years=15,
+    heating_type="gas",
+    insulation_type="moderate",
+    window_type="double_pane",
+    num_floors=2,
+    num_occupants=4,
+    has_attic=True,
+    country="Germany",
+    zip_code="10115",
+    climate_zone="cold",
+    primary_energy_source="natural_gas",
+    avg_monthly_energy_cost=250.5,
+    avg_monthly_kwh=900.0,
+    hvac_age_years=8,
+    roof_type="asphalt_shingle",
+    roof_age_years=10,
+    budget_range="medium",
+    planning_to_sell_years=5
+)
+
+
+def legacy_home_details(home: HomeProfile) -> str:
+    """HomeProfile.__str__ as it was before the field table."""
+    details = f"""Home Profile:
+- Size: {home.size_sqft} square feet
+- Age: {home.age_years} years old
+- Heating Type: {home.heating_type}
+- Insulation: {home.insulation_type}
+- Windows: {home.window_type}
+- Floors: {home.num_floors}
+- Occupants: {home.num_occupants}
+- Basement: {"Yes" if home.has_basement else "No"}
+- Attic: {"Yes" if home.has_attic else "No"}
+- Solar Panels: {"Yes" if home.has_solar_panels else "No"}
+- Smart Thermostat: {"Yes" if home.has_smart_thermostat else "No"}"""
+    if home.country:
+        details += f"\n- Country: {home.country}"
+    if home.zip_code:
+        details += f"\n- Zip Code: {home.zip_code}"
+    if home.climate_zone:
+        details += f"\n- Climate Zone: {home.climate_zone}"
+    if home.primary_energy_source:
+        details += f"\n- Primary Energy Source: {home.primary_energy_source}"
+    if home.avg_monthly_energy_cost:
+        details += f"\n- Average Monthly Energy Cost: €{home.avg_monthly_energy_cost:.2f}"
+    if home.avg_monthly_kwh:
+        details += f"\n- Average Monthly Electricity Usage: {home.avg_monthly_kwh:.1f} kWh"
+    if home.hvac_age_years is not None:
+        details += f"\n- HVAC System Age: {home.hvac_age_years} years"
+    if home.roof_type:
+        details += f"\n- Roof Type: {home.roof_type}"
+    if home.roof_age_years is not None:
+        details += f"\n- Roof Age: {home.roof_age_years} years"
+    if home.budget_range:
+        details += f"\n- Budget Range: {home.budget_range}"
+    if home.planning_to_sell_years is not None:
+        details += f"\n- Planning to Sell Within: {home.planning_to_sell_years} years"
+    return details
+
+
+def legacy_build(home: HomeProfile) -> Tuple[List[ChatMessage], Dict[str, Any]]:
+    # Builder state, message list and schema were all recreated for every request
+    user_parts = [legacy_home_details(home), str(OUTPUT_FORMAT_INSTRUCTIONS)]
+    messages = [
+        ChatMessage(role="system", content=str(SYSTEM_MESSAGE)),
+        ChatMessage(role="user", content="\n".join(user_parts))
+    ]
+    return messages, EnergyAdvice.model_json_schema()
+
+
+def compiled_build(home: HomeProfile) -> Tuple[List[ChatMessage], Dict[str, Any]]:
+    template = get_energy_advice_prompt_template()
+    return template.render(home), template.response_schema
+
+
+def measure(label: str, build: Callable[[HomeProfile], Any], iterations: int) -> float:
+    build(HOME)  # Warm up (and compile the template once)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build(HOME)
+    per_call_us = (time.perf_counter() - started) / iterations * 1e6
+    print(f"{label:<10} {per_call_us:8.1f} µs/request")
+    return per_call_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    assert legacy_home_details(HOME) == compiled_build(HOME)[0][-1].content, "Compiled home details differ"
+
+    legacy = measure("legacy", legacy_build, args.iterations)
+    compiled = measure("compiled", compiled_build, args.iterations)
+    print(f"speedup    {legacy / compiled:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
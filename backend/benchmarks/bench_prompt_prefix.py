@@ -0,0 +1,106 @@
+"""
+Prompt evaluation across consecutive requests for different homes: the previous
+message layout (home details first, static instructions after them in the user
+message) vs. the static system prefix with the home details last.
+
+The stub Ollama simulates its per-slot prompt cache: a request only evaluates
+the part of its prompt after the prefix it shares with the slot's last prompt.
+prompt_eval_count / prompt_eval_duration are read from the metrics the provider
+records for every call, as they would be for a real Ollama.
+
+Usage (from backend/):
+    python -m benchmarks.bench_prompt_prefix --requests 20 --prompt-eval-tokens-per-second 500
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Callable, List, Tuple
+from prometheus_client import REGISTRY
+from app.application.prompt_templates import (
+    SYSTEM_MESSAGE,
+    OUTPUT_FORMAT_INSTRUCTIONS,
+    get_energy_advice_prompt_template
+)
+from app.domain.entities import HomeProfile
+from app.infrastructure.llm.ollama_provider import OllamaProvider
+from app.infrastructure.llm.types import ChatMessage
+from benchmarks.stub_ollama import StubOllamaServer
+
+MODEL = "llama3.2"
+
+
+def make_home(i: int) -> HomeProfile:
+    return HomeProfile(
+        size_sqft=1200 + 37 * i,
+        age_years=5 + i % 40,
+        heating_type=("gas", "electric", "heat_pump", "oil")[i % 4],
+        insulation_type=("basic", "moderate", "good")[i % 3],
+        window_type=("single_pane", "double_pane", "triple_pane")[i % 3],
+        num_floors=1 + i % 3,
+        num_occupants=1 + i % 5
+    )
+
+
+def legacy_render(home: HomeProfile) -> List[ChatMessage]:
+    """The layout before the static prefix: prompts for different homes share only the system message."""
+    return [
+        ChatMessage(role="system", content=SYSTEM_MESSAGE),
+        ChatMessage(role="user", content=f"{home}\n{OUTPUT_FORMAT_INSTRUCTIONS}")
+    ]
+
+
+def prompt_eval_totals() -> Tuple[float, float]:
+    labels = {"model": MODEL}
+    return (
+        REGISTRY.get_sample_value("ollama_prompt_eval_tokens_sum", labels) or 0.0,
+        REGISTRY.get_sample_value("ollama_prompt_eval_duration_seconds_sum", labels) or 0.0
+    )
+
+
+async def run(label: str, render: Callable[[HomeProfile], List[ChatMessage]], args: argparse.Namespace) -> None:
+    stub = StubOllamaServer(
+        latency_seconds=args.generation_seconds,
+        port=args.port,
+        prompt_eval_tokens_per_second=args.prompt_eval_tokens_per_second
+    )
+    provider = OllamaProvider(base_url=stub.base_url, model=MODEL)
+    tokens: List[float] = []
+    seconds: List[float] = []
+    walls: List[float] = []
+    with stub:
+        try:
+            for i in range(args.requests):
+                before_tokens, before_seconds = prompt_eval_totals()
+                started = time.perf_counter()
+                await provider.generate_completion(render(make_home(i)), max_tokens=args.max_tokens)
+                walls.append(time.perf_counter() - started)
+                after_tokens, after_seconds = prompt_eval_totals()
+                tokens.append(after_tokens - before_tokens)
+                seconds.append(after_seconds - before_seconds)
+        finally:
+            await provider.aclose()
+
+    print(
+        f"{label:<8} first request {tokens[0]:6.0f} tokens {seconds[0] * 1000:7.1f} ms   "
+        f"later requests {statistics.mean(tokens[1:]):6.0f} tokens {statistics.mean(seconds[1:]) * 1000:7.1f} ms   "
+        f"mean request {statistics.mean(walls) * 1000:7.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--prompt-eval-tokens-per-second", type=float, default=500.0)
+    parser.add_argument("--generation-seconds", type=float, default=0.05)
+    parser.add_argument("--max-tokens", type=int, default=None)
+    parser.add_argument("--port", type=int, default=11500)
+    args = parser.parse_args()
+
+    print("prompt_eval per request (prompt_eval_count, prompt_eval_duration)")
+    await run("legacy", legacy_render, args)
+    await run("prefix", get_energy_advice_prompt_template().render, args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
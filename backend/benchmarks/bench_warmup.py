@@ -0,0 +1,79 @@
+"""
+First-request latency after a deploy, without and with the startup model warm-up.
+
+Each run starts a fresh stub Ollama with the model unloaded (loading it takes
+--load-seconds) and the API on uvicorn, waits until /health/ready passes, then
+times the first advice requests. Without warm-up the first user pays the load.
+
+Usage (from backend/):
+    python -m benchmarks.bench_warmup --load-seconds 3 --generation-seconds 0.5
+"""
+import argparse
+import time
+from typing import List
+import httpx
+from benchmarks.app_server import AppServer
+from benchmarks.stub_ollama import StubOllamaServer
+
+HOME = {
+    "size_sqft": 2000,
+    "age_years": 15,
+    "heating_type": "gas",
+    "insulation_type": "moderate",
+    "window_type": "double_pane",
+    "num_floors": 2,
+    "num_occupants": 4
+}
+
+
+def wait_until_ready(client: httpx.Client, timeout: float = 60.0) -> float:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if client.get("/health/ready").status_code == 200:
+            return time.perf_counter() - started
+        time.sleep(0.1)
+    raise RuntimeError("API did not become ready")
+
+
+def first_requests(client: httpx.Client, count: int) -> List[float]:
+    latencies = []
+    for i in range(count):
+        # Distinct profiles, so every request goes to the LLM instead of the advice cache
+        home_id = client.post("/api/v1/homes", json={**HOME, "size_sqft": 1000 + i}).json()["id"]
+        started = time.perf_counter()
+        client.post(f"/api/v1/homes/{home_id}/advice").raise_for_status()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def run(warm_up: bool, args: argparse.Namespace) -> None:
+    stub = StubOllamaServer(latency_seconds=args.generation_seconds, port=args.stub_port, load_seconds=args.load_seconds)
+    env = {
+        "OLLAMA_BASE_URL": stub.base_url,
+        "LLM_WARMUP_ENABLED": str(warm_up),
+        "HEALTH_PROBE_INTERVAL_SECONDS": "0.5",
+        "LOG_FILE": ""
+    }
+    with stub, AppServer(env=env, port=args.port) as app, httpx.Client(base_url=app.base_url, timeout=120) as client:
+        ready = wait_until_ready(client)
+        latencies = first_requests(client, args.requests)
+    label = "on" if warm_up else "off"
+    requests = "  ".join(f"{latency:5.2f}s" for latency in latencies)
+    print(f"warm-up {label:<4} ready after {ready:5.2f}s   first requests: {requests}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--load-seconds", type=float, default=3.0)
+    parser.add_argument("--generation-seconds", type=float, default=0.5)
+    parser.add_argument("--requests", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--stub-port", type=int, default=11500)
+    args = parser.parse_args()
+
+    run(False, args)
+    run(True, args)
+
+
+if __name__ == "__main__":
+    main()
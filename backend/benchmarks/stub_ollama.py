@@ -0,0 +1,330 @@
+"""Minimal stand-in for the Ollama HTTP API used by the benchmarks."""
+import asyncio
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import random
+import socket
+import time
+from typing import List, NamedTuple, Optional
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+STUB_ADVICE = {
+    "summary": "Stub advice for benchmarking.",
+    "recommendations": [
+        {
+            "title": "Upgrade Attic Insulation",
+            "description": "Add insulation to reach R-49.",
+            "priority": "high",
+            "category": "insulation",
+            "estimated_savings_annual": 400.0,
+            "estimated_cost": 2000.0,
+            "payback_period_years": 5.0,
+            "implementation_difficulty": "moderate"
+        },
+        {
+            "title": "Install a Smart Thermostat",
+            "description": "Schedule heating around occupancy.",
+            "priority": "medium",
+            "category": "heating_cooling",
+            "estimated_savings_annual": 150.0,
+            "estimated_cost": 250.0,
+            "payback_period_years": 1.7,
+            "implementation_difficulty": "easy"
+        },
+        {
+            "title": "Seal Air Leaks",
+            "description": "Weatherstrip doors and windows.",
+            "priority": "high",
+            "category": "insulation",
+            "estimated_savings_annual": 120.0,
+            "estimated_cost": 300.0,
+            "payback_period_years": 2.5,
+            "implementation_difficulty": "easy"
+        },
+        {
+            "title": "Replace Single-Pane Windows",
+            "description": "Fit double-pane low-e glazing.",
+            "priority": "medium",
+            "category": "windows",
+            "estimated_savings_annual": 300.0,
+            "estimated_cost": 6000.0,
+            "payback_period_years": 20.0,
+            "implementation_difficulty": "difficult"
+        }
+    ],
+    "estimated_total_annual_savings": 970.0
+}
+
+# Roughly one LLM token per streamed chunk
+STREAM_TOKEN_CHARS = 4
+
+# Ollama's keep_alive when a request does not send one
+DEFAULT_KEEP_ALIVE_SECONDS = 300
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def _keep_alive_seconds(value) -> float:
+    """Ollama keep_alive: seconds as a number, or a duration such as "5m"; negative keeps the model forever."""
+    if value is None:
+        return DEFAULT_KEEP_ALIVE_SECONDS
+    if isinstance(value, str):
+        for unit in sorted(DURATION_UNITS, key=len, reverse=True):
+            if value.endswith(unit):
+                value = float(value[:-len(unit)]) * DURATION_UNITS[unit]
+                break
+    value = float(value)
+    return math.inf if value < 0 else value
+
+
+class PromptEval(NamedTuple):
+    tokens: int
+    seconds: float
+
+
+def _timings(
+    latency_seconds: float,
+    eval_count: int,
+    load_seconds: float = 0.0,
+    prompt_eval: Optional[PromptEval] = None
+) -> dict:
+    """Final-chunk statistics in Ollama's format (durations in nanoseconds)."""
+    latency_ns = int(latency_seconds * 1e9)
+    load_ns = int(load_seconds * 1e9)
+    if prompt_eval is None:
+        # Prompt evaluation not simulated: report a tenth of the latency as prompt evaluation
+        prompt_tokens, prompt_ns, eval_ns = 256, latency_ns // 10, latency_ns - latency_ns // 10
+    else:
+        prompt_tokens, prompt_ns, eval_ns = prompt_eval.tokens, int(prompt_eval.seconds * 1e9), latency_ns
+    return {
+        "total_duration": load_ns + prompt_ns + eval_ns,
+        "load_duration": load_ns,
+        "prompt_eval_count": prompt_tokens,
+        "prompt_eval_duration": prompt_ns,
+        "eval_count": eval_count,
+        "eval_duration": eval_ns
+    }
+
+
+# How injected malformed responses are broken: cut off mid-object, wrapped in chat prose, or invalid JSON syntax
+MALFORMED_KINDS = ("truncated", "prose", "invalid")
+
+
+def _requested_advice(body: dict) -> dict:
+    """STUB_ADVICE limited to the recommendation categories the request's format allows."""
+    try:
+        categories = body["format"]["properties"]["recommendations"]["items"]["properties"]["category"]["enum"]
+    except (KeyError, TypeError):
+        return STUB_ADVICE
+    recommendations = [rec for rec in STUB_ADVICE["recommendations"] if rec["category"] in categories]
+    return {
+        **STUB_ADVICE,
+        "recommendations": recommendations,
+        "estimated_total_annual_savings": sum(rec["estimated_savings_annual"] for rec in recommendations)
+    }
+
+
+def _malform(content: str) -> str:
+    kind = random.choice(MALFORMED_KINDS)
+    if kind == "truncated":
+        return content[:len(content) // 2]
+    if kind == "prose":
+        return f"Sure! Here is the energy advice you asked for:\n```json\n{content}\n```"
+    # Trailing comma before the closing brace
+    return content[:content.rindex("}")] + ",}"
+
+
+def create_stub_app(
+    latency_seconds: float = 0.02,
+    model: str = "llama3.2",
+    parallel: Optional[int] = None,
+    straggler_rate: float = 0.0,
+    straggler_factor: float = 1.0,
+    latency_distribution: str = "fixed",
+    latency_jitter: float = 0.0,
+    malformed_rate: float = 0.0,
+    load_seconds: float = 0.0,
+    prompt_eval_tokens_per_second: float = 0.0
+) -> FastAPI:
+    """
+    parallel caps concurrent generations like OLLAMA_NUM_PARALLEL; further requests queue.
+
+    Generation time is latency_seconds, or drawn per request when latency_distribution is
+    "uniform" (latency_seconds * (1 +/- latency_jitter)) or "lognormal" (median latency_seconds,
+    sigma latency_jitter). A straggler_rate share of requests takes straggler_factor times longer,
+    and a malformed_rate share returns content that is not valid JSON. Content is cut off at
+    options.num_predict tokens, with generation time scaled down accordingly. When the request's
+    format only allows some recommendation categories, only those stub recommendations are
+    returned, and latency_seconds is scaled down to the share of the full advice they make up.
+
+    With load_seconds, the model starts unloaded: a request that finds it unloaded pays
+    load_seconds first, and it is unloaded again once the request's keep_alive runs out.
+
+    With prompt_eval_tokens_per_second, prompt evaluation takes time like in Ollama: each of
+    the `parallel` slots remembers the last prompt it evaluated, and a request only pays for
+    the part of its prompt after the longest prefix it shares with one of them.
+    """
+    app = FastAPI()
+    slots = asyncio.Semaphore(parallel) if parallel else contextlib.nullcontext()
+    load_lock = asyncio.Lock()
+    # Monotonic time at which the model is unloaded; loaded forever without load simulation
+    unload_at = [0.0 if load_seconds else math.inf]
+    # Last prompt evaluated by each slot, standing in for Ollama's per-slot KV cache
+    slot_prompts: List[str] = [""] * (parallel or 1)
+
+    def model_loaded() -> bool:
+        return time.monotonic() < unload_at[0]
+
+    async def load_model(keep_alive) -> float:
+        """Load the model if needed and extend its keep_alive; returns the load time paid."""
+        paid = 0.0
+        async with load_lock:
+            if not model_loaded():
+                await asyncio.sleep(load_seconds)
+                paid = load_seconds
+                slot_prompts[:] = [""] * len(slot_prompts)
+            if load_seconds:
+                unload_at[0] = time.monotonic() + _keep_alive_seconds(keep_alive)
+        return paid
+
+    def sample_latency() -> float:
+        if latency_distribution == "uniform":
+            latency = latency_seconds * random.uniform(1 - latency_jitter, 1 + latency_jitter)
+        elif latency_distribution == "lognormal":
+            latency = random.lognormvariate(math.log(latency_seconds), latency_jitter)
+        else:
+            latency = latency_seconds
+        if random.random() < straggler_rate:
+            latency *= straggler_factor
+        return max(latency, 0.0)
+
+    def sample_content(advice: dict, indent: Optional[int] = None) -> str:
+        content = json.dumps(advice, indent=indent)
+        return _malform(content) if random.random() < malformed_rate else content
+
+    def generate(body: dict, indent: Optional[int] = None) -> tuple[str, float]:
+        """Content and generation time for a request, honouring options.num_predict."""
+        advice = _requested_advice(body)
+        content = sample_content(advice, indent)
+        # Generation time is proportional to the output; latency_seconds is for the full advice
+        latency = sample_latency() * len(json.dumps(advice)) / len(json.dumps(STUB_ADVICE))
+        num_predict = (body.get("options") or {}).get("num_predict")
+        tokens = max(len(content) // STREAM_TOKEN_CHARS, 1)
+        if num_predict and num_predict < tokens:
+            content = content[:num_predict * STREAM_TOKEN_CHARS]
+            latency *= num_predict / tokens
+        return content, latency
+
+    def evaluate_prompt(body: dict) -> Optional[PromptEval]:
+        """Prompt tokens a request has to evaluate, after reusing the best-matching slot's cached prefix."""
+        if not prompt_eval_tokens_per_second:
+            return None
+        # Roughly what a chat template renders
+        prompt = "".join(f"<|{message['role']}|>{message['content']}" for message in body["messages"])
+        shared = [len(os.path.commonprefix([prompt, cached])) for cached in slot_prompts]
+        slot = max(range(len(slot_prompts)), key=shared.__getitem__)
+        slot_prompts[slot] = prompt
+        tokens = math.ceil((len(prompt) - shared[slot]) / STREAM_TOKEN_CHARS)
+        return PromptEval(tokens, tokens / prompt_eval_tokens_per_second)
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        body = await request.json()
+        load = await load_model(body.get("keep_alive"))
+        if not body.get("messages"):
+            # Ollama's way to only load the model
+            return {"model": model, "message": {"role": "assistant", "content": ""}, "done": True, "done_reason": "load"}
+        if body.get("stream", True):
+            return StreamingResponse(stream_chat(body, load), media_type="application/x-ndjson")
+
+        content, latency = generate(body)
+        async with slots:
+            prompt_eval = evaluate_prompt(body)
+            await asyncio.sleep(latency + (prompt_eval.seconds if prompt_eval else 0.0))
+        return {
+            "model": model,
+            "message": {"role": "assistant", "content": content},
+            "done": True,
+            **_timings(latency, len(content) // STREAM_TOKEN_CHARS, load, prompt_eval)
+        }
+
+    async def stream_chat(body: dict, load: float):
+        content, latency = generate(body, indent=2)
+        tokens = [content[i:i + STREAM_TOKEN_CHARS] for i in range(0, len(content), STREAM_TOKEN_CHARS)]
+        async with slots:
+            prompt_eval = evaluate_prompt(body)
+            if prompt_eval:
+                await asyncio.sleep(prompt_eval.seconds)
+            for token in tokens:
+                await asyncio.sleep(latency / len(tokens))
+                yield json.dumps({"model": model, "message": {"role": "assistant", "content": token}, "done": False}) + "\n"
+        final = {"model": model, "message": {"role": "assistant", "content": ""}, "done": True}
+        yield json.dumps({**final, **_timings(latency, len(tokens), load, prompt_eval)}) + "\n"
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": f"{model}:latest", "model": f"{model}:latest"}]}
+
+    @app.get("/api/ps")
+    async def ps():
+        if not model_loaded():
+            return {"models": []}
+        return {"models": [{"name": f"{model}:latest", "model": f"{model}:latest"}]}
+
+    return app
+
+
+def _serve(latency_seconds: float, model: str, host: str, port: int, stub_options: dict) -> None:
+    uvicorn.run(
+        create_stub_app(latency_seconds, model, **stub_options),
+        host=host,
+        port=port,
+        log_level="warning",
+        backlog=4096
+    )
+
+
+class StubOllamaServer:
+    """Runs the stub app with uvicorn in a child process so it does not share our GIL."""
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.02,
+        model: str = "llama3.2",
+        host: str = "127.0.0.1",
+        port: int = 11500,
+        **stub_options
+    ):
+        """
+        stub_options are passed to create_stub_app (parallel, latency distribution, stragglers,
+        malformed_rate, load_seconds, prompt_eval_tokens_per_second).
+        """
+        self.host = host
+        self.port = port
+        self._process = multiprocessing.Process(
+            target=_serve, args=(latency_seconds, model, host, port, stub_options), daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def __enter__(self) -> "StubOllamaServer":
+        self._process.start()
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection((self.host, self.port), timeout=0.1):
+                    return self
+            except OSError:
+                time.sleep(0.05)
+        self._process.terminate()
+        raise RuntimeError(f"Stub Ollama server did not start on {self.base_url}")
+
+    def __exit__(self, *exc) -> None:
+        self._process.terminate()
+        self._process.join()